@@ -15,6 +15,29 @@ class Settings(BaseSettings):
     # Application
     debug: bool = False
     
+    # Caching
+    count_cache_ttl_seconds: int = 30
+    packaging_catalog_check_seconds: int = 30
+    rollup_cache_ttl_seconds: int = 30
+    costing_response_cache_size: int = 4096
+    costing_response_cache_ttl_seconds: int = 600
+    
+    # Generated quotation workbooks (content-addressed, on local disk)
+    export_cache_dir: str | None = None  # default: <system temp>/quotation-exports
+    export_cache_max_mb: int = 512
+    export_cache_max_age_seconds: int = 7 * 24 * 3600
+    
+    # Background jobs
+    lead_counter_reconcile_seconds: int = 600
+    
+    # Costing history: full snapshot every N revisions
+    costing_revision_checkpoint_every: int = 10
+    
+    # CPU-bound work (price simulations)
+    cpu_pool_workers: int = 2
+    simulation_max_costings: int = 5000
+    simulation_pool_threshold: int = 5_000_000  # costings x trials above which the process pool is used
+    
     # Optional fields (for deployment)
     frontend_url: str | None = None
     port: int | None = None
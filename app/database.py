@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import event
+from sqlalchemy import event, text, inspect, select, update, delete, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateColumn
 import time
 import logging
 from app.config import get_settings
@@ -14,21 +16,40 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter("⏱️  %(message)s"))
 query_logger.addHandler(handler)
 
+
+def _engine_options(database_url: str) -> dict:
+    """Pool and driver options for the URL's backend."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        # Local fallback / tests (sqlite+aiosqlite://...): default pool, no SSL
+        return {}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": 10,           # Number of connections to keep open
+        "max_overflow": 20,        # Additional connections allowed beyond pool_size
+        "pool_recycle": 300,       # Recycle connections after 5 minutes (prevents stale connections)
+        "pool_timeout": 30,        # Timeout waiting for a connection from pool
+        "connect_args": {
+            "ssl": True,  # This is how asyncpg handles SSL
+        },
+    }
+
+
 # Async engine for application with SSL support for Neon
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,           # Number of connections to keep open
-    max_overflow=20,        # Additional connections allowed beyond pool_size
-    pool_recycle=300,       # Recycle connections after 5 minutes (prevents stale connections)
-    pool_timeout=30,        # Timeout waiting for a connection from pool
-    connect_args={
-        "ssl": True,  # This is how asyncpg handles SSL
-    }
+    **_engine_options(settings.database_url),
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        # Off by default per connection; ON DELETE CASCADE relies on it
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # ============================================
 # QUERY TIMING EVENTS (for debugging)
 # ============================================
@@ -56,6 +77,19 @@ async_session_maker = async_sessionmaker(
 Base = declarative_base()
 
 
+def dialect_insert(session, model):
+    """
+    INSERT construct for the session's dialect, so ON CONFLICT upserts
+    (`on_conflict_do_update` / `on_conflict_do_nothing`) work on
+    PostgreSQL in production and SQLite in tests.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 # Dependency for FastAPI routes
 async def get_db():
     session = async_session_maker()
@@ -74,15 +108,109 @@ async def create_db_and_tables():
     async with engine.begin() as conn:
         # Import all models to register them with Base
         from app.models import (
-            User, SalesLead, PackagingOption, 
-            Costing, CostingPackaging, Quotation, QuotationLine
+            User, SalesLead, SalesLeadCounter, PackagingOption, 
+            Costing, CostingPackaging, CostingRevision, Quotation, QuotationLine, CacheVersion
         )
         
+        # Trigram indexes for lead search need pg_trgm
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        
+        # create_all skips tables that already exist, so add columns and
+        # indexes declared on existing tables after their first deploy
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_merge_duplicate_packaging_items)
+        await conn.run_sync(_create_missing_indexes)
         print("✅ Database tables created successfully!")
 
 
+def _add_missing_columns(sync_conn):
+    """ALTER TABLE ... ADD COLUMN for model columns missing from existing tables."""
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=sync_conn.dialect)
+                table_name = sync_conn.dialect.identifier_preparer.format_table(table)
+                sync_conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+                print(f"➕ Added column {table.name}.{column.name}")
+
+
+def _merge_duplicate_packaging_items(sync_conn):
+    """
+    Before uq_costing_packaging_item exists: fold repeated (costing_id,
+    packaging_id) rows into the lowest id, adding up their quantities
+    (prices are unchanged), so the unique index can be created.
+    """
+    from app.models.costing import CostingPackaging
+    
+    table = CostingPackaging.__table__
+    inspector = inspect(sync_conn)
+    if not inspector.has_table(table.name):
+        return
+    if any(ix["name"] == "uq_costing_packaging_item" for ix in inspector.get_indexes(table.name)):
+        return
+    
+    other = table.alias("other")
+    keep = (
+        select(func.min(table.c.id))
+        .group_by(table.c.costing_id, table.c.packaging_id)
+        .having(func.count() > 1)
+    )
+    total = (
+        select(func.sum(other.c.quantity))
+        .where(other.c.costing_id == table.c.costing_id, other.c.packaging_id == table.c.packaging_id)
+        .scalar_subquery()
+    )
+    sync_conn.execute(update(table).where(table.c.id.in_(keep)).values(quantity=total))
+    merged = sync_conn.execute(
+        delete(table).where(
+            table.c.id.not_in(select(func.min(table.c.id)).group_by(table.c.costing_id, table.c.packaging_id))
+        )
+    ).rowcount
+    if merged:
+        print(f"🔧 Merged {merged} duplicate costing packaging rows")
+
+
+def _existing_index_names(sync_conn) -> set[str]:
+    # By name from the catalog: the inspector (and so checkfirst) does not
+    # see expression indexes such as lower(email) on SQLite
+    dialect = sync_conn.dialect.name
+    if dialect == "postgresql":
+        return set(sync_conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        ).scalars())
+    if dialect == "sqlite":
+        return set(sync_conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    inspector = inspect(sync_conn)
+    return {
+        index["name"]
+        for table in Base.metadata.sorted_tables
+        if inspector.has_table(table.name)
+        for index in inspector.get_indexes(table.name)
+    }
+
+
+def _create_missing_indexes(sync_conn):
+    """CREATE INDEX for declared indexes missing by name; a failing one does not stop the rest."""
+    existing = _existing_index_names(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                with sync_conn.begin_nested():
+                    index.create(sync_conn)
+            except Exception as e:
+                print(f"⚠️ Could not create index {index.name}: {e}")
+
+
 # Function to drop all tables (use with caution!)
 async def drop_db_and_tables():
     """
@@ -108,3 +108,12 @@ async def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_superuser(
+    current_user: CachedUser = Depends(get_current_active_user)
+) -> CachedUser:
+    """Ensure user is a superuser (admin-only endpoints)"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
@@ -145,12 +145,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import time
 
-from app.routes import auth_router, sales_router, costing_router, quotation_router
+from app.routes import auth_router, sales_router, costing_router, quotation_router, projects_router
 from app.config import get_settings
 from app.database import create_db_and_tables, engine
+from app.services.pricing import backfill_stored_prices
+from app.services.workers import shutdown_pool
+from app.services.packaging_catalog import refresh_catalog, listen_for_invalidations
+from app.services.lead_counters import reconcile_periodically
 
 settings = get_settings()
 
@@ -164,13 +169,28 @@ async def lifespan(app: FastAPI):
 
     try:
         await create_db_and_tables()
+        await backfill_stored_prices()
         print("✅ Database tables ready")
     except Exception as e:
         print(f"⚠️ DB init warning: {e}")
 
+    # Packaging catalog snapshot before the first request (live previews
+    # only ever read it from memory)
+    await refresh_catalog()
+
+    # Lead stats counters: reconcile now, then periodically to repair drift
+    reconcile_task = asyncio.create_task(
+        reconcile_periodically(settings.lead_counter_reconcile_seconds)
+    )
+    # Packaging catalog: drop the in-memory copy when another worker changes it
+    catalog_listener = asyncio.create_task(listen_for_invalidations())
+
     print(f"🌐 Environment: {'Development' if settings.debug else 'Production'}")
     yield
     print("👋 Shutting down FastAPI application...")
+    reconcile_task.cancel()
+    catalog_listener.cancel()
+    shutdown_pool()
     await engine.dispose()
 
 
@@ -279,6 +299,7 @@ app.include_router(auth_router)
 app.include_router(sales_router)
 app.include_router(costing_router)
 app.include_router(quotation_router)
+app.include_router(projects_router)
 
 # ─────────────────────────────────────────────
 # Root
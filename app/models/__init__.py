@@ -1,16 +1,20 @@
 from app.database import Base
 from app.models.user import User
-from app.models.sales import SalesLead
-from app.models.costing import PackagingOption, Costing, CostingPackaging
+from app.models.sales import SalesLead, SalesLeadCounter
+from app.models.costing import PackagingOption, Costing, CostingPackaging, CostingRevision
 from app.models.quotation import Quotation, QuotationLine
+from app.models.cache import CacheVersion
 
 __all__ = [
     "Base",
     "User",
     "SalesLead",
+    "SalesLeadCounter",
     "PackagingOption",
     "Costing",
     "CostingPackaging",
+    "CostingRevision",
     "Quotation",
     "QuotationLine",
+    "CacheVersion",
 ]
@@ -0,0 +1,22 @@
+"""
+Cache version model
+File: app/models/cache.py
+
+One row per process-wide cache (e.g. the packaging catalog). Writers bump
+the version in the same transaction as the data change; every worker
+compares it with the version its in-memory copy was built from.
+"""
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_version"
+    
+    name = Column(String(40), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
@@ -4,7 +4,7 @@ File: app/models/costing.py
 
 Added indexes for performance optimization.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, Text, DateTime, Numeric, ForeignKey, Index, JSON, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -60,6 +60,15 @@ class Costing(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Sort by date
     notes = Column(Text, nullable=True)
     
+    # Stored results of the price calculation (app.services.pricing), kept
+    # in sync on every costing/packaging write so lists can filter and sort
+    unit_cost_before_gst = Column(Numeric(14, 2), nullable=True, index=True)
+    final_unit_price = Column(Numeric(14, 2), nullable=True, index=True)
+    moq = Column(BigInteger, nullable=True, index=True)
+    
+    # Number of the latest CostingRevision (0: created before history existed)
+    version = Column(Integer, default=0, server_default=text("0"), nullable=False)
+    
     # Relationships
     created_by = relationship("User", back_populates="costings")
     packaging = relationship("PackagingOption", secondary="costing_packaging", back_populates="costings")
@@ -91,5 +100,37 @@ class CostingPackaging(Base):
     costing = relationship("Costing", back_populates="costing_packaging")
     packaging = relationship("PackagingOption")
     
+    __table_args__ = (
+        # One row per packaging option on a costing; target of the item upsert
+        Index('uq_costing_packaging_item', 'costing_id', 'packaging_id', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<CostingPackaging {self.quantity}x>"
+
+
+class CostingRevision(Base):
+    """
+    Append-only history of a costing. Revision N is the state after the Nth
+    write: checkpoints hold the full state, other revisions only the fields
+    that changed since N-1 (`packaging` holds the whole item list when it
+    changed). A checkpoint is written every few revisions, so rebuilding any
+    revision applies a bounded number of deltas.
+    """
+    __tablename__ = "costing_revision"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    costing_id = Column(Integer, ForeignKey('costing.id', ondelete='CASCADE'), nullable=False)
+    revision = Column(Integer, nullable=False)
+    is_checkpoint = Column(Boolean, default=False, nullable=False)
+    data = Column(JSON, nullable=False)
+    created_by_id = Column(Integer, ForeignKey('user.id'), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # One row per revision; also serves "revisions of costing X" lookups
+        UniqueConstraint('costing_id', 'revision', name='uq_costing_revision'),
+    )
+    
     def __repr__(self):
-        return f"<CostingPackaging {self.quantity}x>"
\ No newline at end of file
+        return f"<CostingRevision {self.costing_id}@{self.revision}>"
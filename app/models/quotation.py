@@ -41,7 +41,7 @@
 #     def __repr__(self):
 #         return f"<QuotationLine {self.product_name}>"
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -53,7 +53,7 @@ class Quotation(Base):
     id = Column(Integer, primary_key=True, index=True)
     project_code = Column(String(16), index=True, nullable=False)
     created_by_id = Column(Integer, ForeignKey('user.id'), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Sort by date
     notes = Column(Text, nullable=True)
     exported_file = Column(String(500), nullable=True)
     
@@ -61,6 +61,11 @@ class Quotation(Base):
     created_by = relationship("User", back_populates="quotations")
     lines = relationship("QuotationLine", back_populates="quotation", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Filter by project code + sort by date
+        Index('idx_quotation_project_date', 'project_code', 'created_at'),
+    )
+    
     def __repr__(self):
         return f"<Quotation {self.project_code}>"
 
@@ -69,8 +74,8 @@ class QuotationLine(Base):
     __tablename__ = "quotation_line"
     
     id = Column(Integer, primary_key=True, index=True)
-    quotation_id = Column(Integer, ForeignKey('quotation.id', ondelete='CASCADE'), nullable=False)
-    costing_id = Column(Integer, ForeignKey('costing.id', ondelete='SET NULL'), nullable=True)
+    quotation_id = Column(Integer, ForeignKey('quotation.id', ondelete='CASCADE'), nullable=False, index=True)  # Quotation -> lines
+    costing_id = Column(Integer, ForeignKey('costing.id', ondelete='SET NULL'), nullable=True, index=True)  # Costing -> quotation lines
     
     product_name = Column(String(255), nullable=False)
     unit_price = Column(Numeric(14, 2), nullable=False)
@@ -67,7 +67,7 @@ File: app/models/sales.py
 
 Added indexes for performance with thousands of records.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -128,7 +128,45 @@ class SalesLead(Base):
         Index('idx_company_status', 'company_name', 'status'),
         # Filter by location + status
         Index('idx_location_status', 'location', 'status'),
+        # Trigram GIN indexes serving `search` (ILIKE '%term%'), PostgreSQL + pg_trgm only
+        Index('idx_lead_company_trgm', 'company_name', postgresql_using='gin',
+              postgresql_ops={'company_name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_lead_owner_trgm', 'owner', postgresql_using='gin',
+              postgresql_ops={'owner': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_lead_email_trgm', 'email', postgresql_using='gin',
+              postgresql_ops={'email': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_lead_segment_trgm', 'segment', postgresql_using='gin',
+              postgresql_ops={'segment': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_lead_notes_trgm', 'notes', postgresql_using='gin',
+              postgresql_ops={'notes': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
     )
     
     def __repr__(self):
-        return f"<SalesLead(id={self.id}, company='{self.company_name}', status='{self.status}')>"
\ No newline at end of file
+        return f"<SalesLead(id={self.id}, company='{self.company_name}', status='{self.status}')>"
+
+
+# Case-insensitive lookups used by bulk import de-duplication
+Index('idx_lead_email_lower', func.lower(SalesLead.email))
+Index('idx_lead_company_lower', func.lower(SalesLead.company_name))
+
+
+class SalesLeadCounter(Base):
+    """
+    Pre-aggregated lead counts served by /leads/stats/.
+    
+    Keys:
+        - total: all leads
+        - with_contact: leads with an email or phone
+        - status:<status>: leads per status
+    
+    Lead writes adjust these in the same transaction; a periodic reconcile
+    recomputes them from sales_lead to repair any drift.
+    """
+    __tablename__ = "sales_lead_counter"
+    
+    key = Column(String(40), primary_key=True)
+    value = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<SalesLeadCounter({self.key}={self.value})>"
@@ -430,23 +430,60 @@ File: app/routes/costing.py
 
 Optimized with better pagination and query performance.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from decimal import Decimal, InvalidOperation
+import json
 
 from app.database import get_db
-from app.models.costing import Costing, CostingPackaging, PackagingOption
+from app.models.costing import Costing, CostingPackaging, CostingRevision, PackagingOption
 from app.schemas.costing import (
     CostingCreate,
     CostingUpdate,
     CostingResponse,
     PackagingOptionCreate,
     PackagingOptionResponse,
+    ScenarioRequest,
+    ScenarioResponse,
+    PackagingCostUpdate,
+    PackagingCostImpact,
+    CostingBulkCreate,
+    CostingBulkFilter,
+    CostingBulkStatus,
+    CostingBulkResult,
+    CostingPreviewRequest,
+    CostingPreviewResponse,
+    SimulationRequest,
+    SimulationResponse,
+    SweepRequest,
+    SweepResponse,
+)
+from app.dependencies import get_current_active_user, get_current_user, CachedUser
+from app.services.cache import invalidate
+from app.services.db_writes import delete_returning
+from app.services.counts import CountMode, count_total
+from app.services.pricing import refresh_stored_prices
+from app.services.costing_cache import costing_json, costing_list_json
+from app.services.scenario import run_scenario
+from app.services.simulation import run_simulation
+from app.services.sweep import run_sweep
+from app.services.packaging_impact import change_packaging_cost
+from app.services.costing_preview import CatalogNotLoaded, preview_catalog, preview_prices
+from app.services.costing_bulk import create_costings, duplicate_costings, duplicate_names, set_status, delete_costings
+from app.services.costing_packaging import merge_packaging_items, sync_packaging_items
+from app.services.costing_history import snapshot, record_created, record_revision, rebuild_revision
+from app.services.pagination import InvalidCursor, resolve_sort, order_by_clause
+from app.services.packaging_catalog import (
+    get_catalog,
+    catalog_for,
+    bump_catalog_version,
+    invalidate_catalog,
 )
-from app.dependencies import get_current_active_user, CachedUser
 
 router = APIRouter(prefix="/api", tags=["Costing"])
 
@@ -462,13 +499,10 @@ async def packaging_list(
 ):
     """
     List all packaging options.
-    **OPTIMIZED**: Uses index on name for fast sorting.
+    **OPTIMIZED**: Served from the in-memory packaging catalog (already ordered by name).
     """
-    result = await db.execute(
-        select(PackagingOption).order_by(PackagingOption.name)
-    )
-    packaging = result.scalars().all()
-    return packaging
+    catalog = await get_catalog(db)
+    return catalog.options
 
 
 @router.post("/packaging/", response_model=PackagingOptionResponse, status_code=status.HTTP_201_CREATED)
@@ -489,15 +523,60 @@ async def packaging_create(
     
     packaging = PackagingOption(**packaging_data.model_dump())
     db.add(packaging)
+    await bump_catalog_version(db)
     await db.commit()
     await db.refresh(packaging)
+    invalidate_catalog()
     return packaging
 
 
+@router.patch("/packaging/{packaging_id}/", response_model=PackagingCostImpact)
+async def packaging_update_cost(
+    packaging_id: int,
+    update_data: PackagingCostUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Change a packaging option's cost and report the impact on costings
+    (per-costing final_unit_price deltas) and the quotations built from them.
+    
+    **OPTIMIZED**: Affected costings come from the packaging_id index on
+    costing_packaging; their stored prices are recomputed in one batch.
+    `refresh_quotations=true` also updates unit_price/line_total of the linked
+    quotation lines in a single UPDATE. `dry_run=true` reports and rolls back.
+    """
+    impact = await change_packaging_cost(
+        db, packaging_id, update_data.cost, update_data.refresh_quotations
+    )
+    
+    if update_data.dry_run:
+        await db.rollback()
+    else:
+        await bump_catalog_version(db)
+        await db.commit()
+        invalidate_catalog()
+        invalidate("costing")
+        if update_data.refresh_quotations:
+            invalidate("quotation")
+    
+    return {**impact, "dry_run": update_data.dry_run}
+
+
 # ============================================
 # COSTING ENDPOINTS - OPTIMIZED
 # ============================================
 
+# Sort keys allowed on /costings/ - each one is backed by an index on costing
+COSTING_SORT_COLUMNS = {
+    "created_at": Costing.created_at,
+    "final_unit_price": Costing.final_unit_price,
+    "unit_cost_before_gst": Costing.unit_cost_before_gst,
+    "moq": Costing.moq,
+    "id": Costing.id,
+}
+
+
 @router.get("/costings/")
 async def costing_list_api(
     skip: int = Query(0, ge=0),
@@ -505,13 +584,27 @@ async def costing_list_api(
     project_code: Optional[str] = None,
     status: Optional[str] = None,
     search: Optional[str] = Query(None, description="Search in product name or project code"),
+    min_price: Optional[Decimal] = Query(None, description="Minimum final unit price (incl. GST)"),
+    max_price: Optional[Decimal] = Query(None, description="Maximum final unit price (incl. GST)"),
+    min_unit_cost: Optional[Decimal] = Query(None, description="Minimum unit cost before GST"),
+    max_unit_cost: Optional[Decimal] = Query(None, description="Maximum unit cost before GST"),
+    min_moq: Optional[int] = Query(None, description="Minimum MOQ"),
+    max_moq: Optional[int] = Query(None, description="Maximum MOQ"),
+    sort: str = Query("-created_at", description="created_at, final_unit_price, unit_cost_before_gst, moq or id; prefix '-' for descending"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate (cached/planner) or none"),
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
     """
     List costings with pagination and filtering.
     
-    **OPTIMIZED**: Returns pagination metadata.
+    **OPTIMIZED**: Returns pagination metadata; items come from the
+    costing response cache (app.services.costing_cache), and only the
+    costings that miss it have their packaging rows loaded and their price
+    fields computed, in one vectorized batch (app.services.pricing).
+    Price/MOQ filters and sorts use the stored, indexed price columns.
+    `count=estimate` serves a cached/planner total, `count=none` skips it
+    (total is null and has_more comes from fetching limit+1 rows).
     
     Returns:
     {
@@ -519,13 +612,17 @@ async def costing_list_api(
         "total": 500,
         "skip": 0,
         "limit": 50,
-        "has_more": true
+        "has_more": true,
+        "sort": "-final_unit_price"
     }
     """
-    # Base query with optimized loading
-    query = select(Costing).options(
-        selectinload(Costing.costing_packaging).selectinload(CostingPackaging.packaging)
-    )
+    try:
+        sort_key = resolve_sort(sort, COSTING_SORT_COLUMNS)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Base query; packaging rows are loaded only for response cache misses
+    query = select(Costing)
     count_query = select(func.count(Costing.id))
     
     # Apply filters
@@ -546,23 +643,205 @@ async def costing_list_api(
         query = query.where(search_filter)
         count_query = count_query.where(search_filter)
     
-    # Apply pagination and ordering (uses index on created_at)
-    query = query.offset(skip).limit(limit).order_by(Costing.created_at.desc())
+    ranges = [
+        (Costing.final_unit_price, min_price, max_price),
+        (Costing.unit_cost_before_gst, min_unit_cost, max_unit_cost),
+        (Costing.moq, min_moq, max_moq),
+    ]
+    for column, low, high in ranges:
+        if low is not None:
+            query = query.where(column >= low)
+            count_query = count_query.where(column >= low)
+        if high is not None:
+            query = query.where(column <= high)
+            count_query = count_query.where(column <= high)
+    
+    # Apply pagination and ordering (index on the sort column, id tiebreak);
+    # one extra row tells us whether another page follows
+    query = query.order_by(*order_by_clause(sort_key, Costing.id)).offset(skip).limit(limit + 1)
     
     # Execute queries sequentially (async sessions don't support parallel ops)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    filters = (project_code, status, search, min_price, max_price, min_unit_cost, max_unit_cost, min_moq, max_moq)
+    total = await count_total(db, count_query, count, "costing", filters)
     
     data_result = await db.execute(query)
     costings = data_result.scalars().all()
+    items = await costing_list_json(db, costings[:limit])
     
-    return {
-        "items": [CostingResponse.model_validate(c) for c in costings],
+    # Items are already serialized; splice them into the page JSON
+    meta = json.dumps({
         "total": total,
         "skip": skip,
         "limit": limit,
-        "has_more": (skip + limit) < total
+        "has_more": len(costings) > limit,
+        "sort": sort_key.name,
+        "count": count,
+    }, separators=(",", ":"))
+    body = b'{"items":[' + b",".join(items) + b"]," + meta[1:].encode()
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/costings/scenario/", response_model=ScenarioResponse)
+async def costing_scenario(
+    scenario: ScenarioRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    What-if repricing: apply parameter overrides to every costing matching
+    project_code/status and compare final_unit_price. Read-only.
+    
+    **OPTIMIZED**: One load of plain columns, then vectorized repricing of
+    all rows at once (app.services.scenario).
+    
+    Returns:
+    {
+        "costings": 1200,
+        "changed": 1180,
+        "skipped": 0,
+        "aggregates": {"old_total": ..., "new_total": ..., "total_delta": ..., "avg_delta": ...},
+        "items": [{"id": 1, "old_final_unit_price": ..., "new_final_unit_price": ..., "delta": ...}]
     }
+    """
+    try:
+        return await run_scenario(db, scenario)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/costings/simulate/", response_model=SimulationResponse)
+async def costing_simulate(
+    simulation: SimulationRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Monte Carlo price risk: draw percent changes of rm_per_litre, transport
+    and packaging costs for `trials` trials and return the distribution of
+    final_unit_price per costing. Read-only; pass `seed` (returned on every
+    run) to reproduce a result.
+    
+    **OPTIMIZED**: Vectorized NumPy trials, off the event loop (a thread, or
+    the process pool for large portfolios).
+    
+    Returns:
+    {
+        "seed": 42,
+        "trials": 10000,
+        "costings": 1,
+        "items": [{"id": 1, "final_unit_price": "56.24", "mean": "56.80",
+                   "percentiles": {"p5": "54.10", "p50": "56.75", "p95": "59.60"},
+                   "margin_percentiles": {"p5": "-3.36", ...}, "prob_above_current": 0.61}]
+    }
+    """
+    try:
+        return await run_simulation(db, simulation)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ============================================
+# BULK COSTING ENDPOINTS
+# ============================================
+
+@router.post("/costings/bulk/", response_model=CostingBulkResult, status_code=status.HTTP_201_CREATED)
+async def costing_bulk_create(
+    payload: CostingBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Create up to 500 costings with their packaging items in one transaction.
+    
+    **OPTIMIZED**: Multi-row INSERTs for costings, packaging items and
+    history; prices computed for the whole batch at once.
+    
+    Returns:
+    {"count": 2, "ids": [101, 102]}
+    """
+    try:
+        ids = await create_costings(db, payload.items, current_user.id)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    invalidate("costing")
+    
+    return CostingBulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/costings/bulk/duplicate/", response_model=CostingBulkResult, status_code=status.HTTP_201_CREATED)
+async def costing_bulk_duplicate(
+    selection: CostingBulkFilter,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Duplicate the selected costings (ids / project_code / status) as drafts.
+    
+    **OPTIMIZED**: Server-side INSERT ... SELECT for costings and packaging
+    rows; nothing is copied through the app.
+    
+    Returns:
+    {"count": 2, "ids": [201, 202], "source_ids": [5, 9]}
+    """
+    try:
+        source_ids, ids = await duplicate_costings(db, selection, current_user.id)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    invalidate("costing")
+    
+    return CostingBulkResult(count=len(ids), ids=ids, source_ids=source_ids)
+
+
+@router.patch("/costings/bulk/status/", response_model=CostingBulkResult)
+async def costing_bulk_status(
+    payload: CostingBulkStatus,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Move the selected costings to `new_status` with one UPDATE. Costings
+    already in that status are left alone and not counted.
+    
+    Returns:
+    {"count": 12, "ids": [...]}
+    """
+    try:
+        ids = await set_status(db, payload, payload.new_status, current_user.id)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    invalidate("costing")
+    
+    return CostingBulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/costings/bulk/delete/", response_model=CostingBulkResult)
+async def costing_bulk_delete(
+    selection: CostingBulkFilter,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Delete up to 1000 selected costings with one DELETE (packaging rows
+    and history cascade; quotation lines keep their copy).
+    
+    Returns:
+    {"count": 3, "ids": [4, 7, 8]}
+    """
+    try:
+        ids = await delete_costings(db, selection)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    invalidate("costing")
+    
+    return CostingBulkResult(count=len(ids), ids=ids)
 
 
 def safe_decimal(value: Optional[str], default: Optional[Decimal] = None) -> Optional[Decimal]:
@@ -617,8 +896,12 @@ async def costing_new_form(
         )
         
         db.add(costing)
+        await db.flush()
+        await record_created(db, costing, [], current_user.id)
+        await refresh_stored_prices(db, Costing.id == costing.id)
         await db.commit()
         await db.refresh(costing)
+        invalidate("costing")
         
         return {
             "success": True,
@@ -639,19 +922,86 @@ async def costing_new_form(
         )
 
 
-@router.get("/costing/{costing_id}/", response_model=CostingResponse)
-async def costing_detail(
-    costing_id: int,
-    db: AsyncSession = Depends(get_db),
+@router.post("/costing/preview/", response_model=CostingPreviewResponse)
+async def costing_preview(
+    preview: CostingPreviewRequest,
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Get costing by ID with all calculations."""
+    """
+    Price unsaved costing form input (same fields and defaults as
+    /costing/new/form/, plus packaging_items). Nothing is stored.
+    
+    **OPTIMIZED**: Packaging costs come from the in-memory packaging
+    catalog, so a preview does not query the database.
+    
+    Returns:
+    {
+        "total_packaging_cost": "6.66",
+        "rm_cost_per_unit": "10.00",
+        "unit_cost_before_gst": "47.66",
+        "gst_amount_per_unit": "8.58",
+        "final_unit_price": "56.24",
+        "moq": 5000,
+        "catalog_version": 3
+    }
+    """
+    try:
+        return preview_prices(preview, preview_catalog(preview))
+    except CatalogNotLoaded as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ArithmeticError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Values are out of range")
+
+
+@router.websocket("/costing/preview/ws/")
+async def costing_preview_ws(websocket: WebSocket, token: str = Query(...)):
+    """
+    Live preview over one connection: send the form as JSON on every change,
+    receive the CostingPreviewResponse JSON (or {"error": ...}) back.
+    Authenticated with the access token as ?token=.
+    """
+    try:
+        user = await get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                preview = CostingPreviewRequest.model_validate_json(message)
+                result = preview_prices(preview, preview_catalog(preview))
+            except ValidationError as e:
+                await websocket.send_json({"error": e.errors(include_url=False, include_context=False, include_input=False)})
+                continue
+            except (ValueError, CatalogNotLoaded) as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            except ArithmeticError:
+                await websocket.send_json({"error": "Values are out of range"})
+                continue
+            await websocket.send_text(result.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+
+
+async def _costing_response(db: AsyncSession, costing_id: int) -> CostingResponse:
+    """
+    Load a costing with its packaging rows (fresh, not from the identity map)
+    and resolve the packaging options from the catalog.
+    """
     result = await db.execute(
         select(Costing)
         .where(Costing.id == costing_id)
-        .options(
-            selectinload(Costing.costing_packaging).selectinload(CostingPackaging.packaging)
-        )
+        .options(selectinload(Costing.costing_packaging))
+        .execution_options(populate_existing=True)
     )
     costing = result.scalar_one_or_none()
     
@@ -661,7 +1011,30 @@ async def costing_detail(
             detail=f"Costing with ID {costing_id} not found"
         )
     
-    return costing
+    catalog = await catalog_for(db, [costing])
+    return catalog.costing_response(costing)
+
+
+@router.get("/costing/{costing_id}/", response_model=CostingResponse)
+async def costing_detail(
+    costing_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Get costing by ID with all calculations.
+    
+    **OPTIMIZED**: Served as cached JSON keyed by (id, version, catalog
+    version) after a two-column primary-key lookup; the costing, its
+    packaging rows and the prices are only loaded on a cache miss.
+    """
+    body = await costing_json(db, costing_id)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Costing with ID {costing_id} not found"
+        )
+    return Response(content=body, media_type="application/json")
 
 
 @router.put("/costing/{costing_id}/edit/", response_model=CostingResponse)
@@ -671,11 +1044,12 @@ async def costing_edit(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Edit existing costing."""
+    """Edit existing costing. Each edit appends a revision (see /revisions/)."""
     result = await db.execute(
         select(Costing)
         .where(Costing.id == costing_id)
         .options(selectinload(Costing.costing_packaging))
+        .with_for_update(of=Costing)  # serializes edits: revision numbers come from costing.version
     )
     costing = result.scalar_one_or_none()
     
@@ -685,37 +1059,28 @@ async def costing_edit(
             detail=f"Costing with ID {costing_id} not found"
         )
     
+    before = snapshot(costing, costing.costing_packaging)
+    
     # Update fields
     update_data = costing_data.model_dump(exclude_unset=True, exclude={'packaging_items'})
     for field, value in update_data.items():
         setattr(costing, field, value)
     
-    # Update packaging if provided
+    # Update packaging if provided: write only the rows that differ
+    packaging_items = costing.costing_packaging
     if costing_data.packaging_items is not None:
-        # Bulk delete existing packaging (single query instead of loop)
-        await db.execute(
-            delete(CostingPackaging).where(CostingPackaging.costing_id == costing_id)
-        )
-        
-        for item in costing_data.packaging_items:
-            cp = CostingPackaging(
-                costing_id=costing.id,
-                packaging_id=item.packaging_id,
-                quantity=item.quantity
-            )
-            db.add(cp)
+        packaging_items = merge_packaging_items(costing_data.packaging_items)
+        await sync_packaging_items(db, costing.id, costing.costing_packaging, packaging_items)
     
+    after = snapshot(costing, packaging_items)
+    await record_revision(db, costing, before, after, current_user.id)
+    
+    await db.flush()
+    await refresh_stored_prices(db, Costing.id == costing_id)
     await db.commit()
+    invalidate("costing")
     
-    result = await db.execute(
-        select(Costing)
-        .where(Costing.id == costing_id)
-        .options(
-            selectinload(Costing.costing_packaging).selectinload(CostingPackaging.packaging)
-        )
-    )
-    costing = result.scalar_one()
-    return costing
+    return await _costing_response(db, costing_id)
 
 
 @router.post("/costing/{costing_id}/duplicate/", response_model=CostingResponse)
@@ -738,9 +1103,10 @@ async def costing_duplicate(
             detail=f"Costing with ID {costing_id} not found"
         )
     
+    project_code, product_name = duplicate_names(original.project_code, original.product_name)
     duplicate = Costing(
-        project_code=f"{original.project_code}_copy",
-        product_name=f"{original.product_name} (Copy)",
+        project_code=project_code,
+        product_name=product_name,
         sku_ml=original.sku_ml,
         rm_per_litre=original.rm_per_litre,
         packaging_other=original.packaging_other,
@@ -768,38 +1134,134 @@ async def costing_duplicate(
         )
         db.add(new_cp)
     
+    await record_created(db, duplicate, original.costing_packaging, current_user.id)
+    await db.flush()
+    await refresh_stored_prices(db, Costing.id == duplicate.id)
     await db.commit()
+    invalidate("costing")
     
-    result = await db.execute(
-        select(Costing)
-        .where(Costing.id == duplicate.id)
-        .options(
-            selectinload(Costing.costing_packaging).selectinload(CostingPackaging.packaging)
+    return await _costing_response(db, duplicate.id)
+
+
+@router.post("/costing/{costing_id}/sweep/", response_model=SweepResponse)
+async def costing_sweep(
+    costing_id: int,
+    sweep: SweepRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Sensitivity grid: moq, unit_cost_before_gst and final_unit_price of a
+    costing for every combination of up to 3 swept fields (e.g.
+    batch_size_kg x sku_ml). Read-only.
+    
+    **OPTIMIZED**: The whole grid is priced in one vectorized pass with the
+    exact CostingResponse rules.
+    
+    Returns:
+    {
+        "costing_id": 1,
+        "current": {"moq": 5000, "unit_cost_before_gst": "47.66", "final_unit_price": "56.24"},
+        "axes": ["batch_size_kg", "sku_ml"],
+        "points": [{"values": {"batch_size_kg": "250", "sku_ml": "100"}, "moq": 2500, ...}]
+    }
+    """
+    try:
+        result = await run_sweep(db, costing_id, sweep)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Costing with ID {costing_id} not found"
         )
-    )
-    duplicate = result.scalar_one()
-    return duplicate
+    return result
 
 
-@router.delete("/costing/{costing_id}/")
-async def costing_delete(
+@router.get("/costing/{costing_id}/revisions/")
+async def costing_revisions(
     costing_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Delete a costing."""
+    """
+    Revision history of a costing, newest first.
+
+    Returns:
+        {
+            "costing_id": 1,
+            "version": 3,
+            "items": [{"revision": 3, "is_checkpoint": false, "changed": ["transport"], ...}]
+        }
+    """
+    version = (await db.execute(
+        select(Costing.version).where(Costing.id == costing_id)
+    )).scalar_one_or_none()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Costing with ID {costing_id} not found"
+        )
+
     result = await db.execute(
-        select(Costing).where(Costing.id == costing_id)
+        select(CostingRevision)
+        .where(CostingRevision.costing_id == costing_id)
+        .order_by(CostingRevision.revision.desc())
+        .offset(skip)
+        .limit(limit)
     )
-    costing = result.scalar_one_or_none()
-    
-    if not costing:
+    return {
+        "costing_id": costing_id,
+        "version": version,
+        "items": [
+            {
+                "revision": r.revision,
+                "is_checkpoint": r.is_checkpoint,
+                "changed": sorted(r.data) if not r.is_checkpoint else ["checkpoint"],
+                "created_by_id": r.created_by_id,
+                "created_at": r.created_at,
+            }
+            for r in result.scalars()
+        ],
+    }
+
+
+@router.get("/costing/{costing_id}/revisions/{revision}/")
+async def costing_revision_detail(
+    costing_id: int,
+    revision: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Costing state as of `revision`, rebuilt from the nearest checkpoint.
+
+    Returns:
+        {"costing_id": 1, "revision": 3, "checkpoint": 1, "steps": 2, "state": {...}}
+    """
+    rebuilt = await rebuild_revision(db, costing_id, revision)
+    if rebuilt is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Costing with ID {costing_id} not found"
+            detail=f"Revision {revision} of costing {costing_id} not found"
         )
-    
-    await db.delete(costing)
+    return rebuilt
+
+
+@router.delete("/costing/{costing_id}/")
+async def costing_delete(
+    costing_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """Delete a costing (single DELETE ... RETURNING; packaging rows cascade)."""
+    await delete_returning(
+        db, Costing, costing_id,
+        detail=f"Costing with ID {costing_id} not found",
+    )
     await db.commit()
+    invalidate("costing")
     
-    return {"message": "Costing deleted successfully"}
\ No newline at end of file
+    return {"message": "Costing deleted successfully"}
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_db
+from app.schemas.project import ProjectRollupPage
+from app.dependencies import get_current_active_user, CachedUser
+from app.services.pagination import InvalidCursor
+from app.services.project_rollup import project_rollup_page
+
+router = APIRouter(prefix="/api", tags=["Projects"])
+
+
+@router.get("/projects/rollup/", response_model=ProjectRollupPage)
+async def project_rollup(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Per-project rollup of costings and quotations, in project_code order.
+
+    **OPTIMIZED**: Aggregated in SQL (GROUP BY project_code, status on
+    idx_costing_project_status; latest quotation via a window function) for
+    one page of projects at a time, keyset-paginated on project_code.
+    Pages are cached until a costing or quotation is written.
+
+    Returns:
+    {
+        "items": [
+            {
+                "project_code": "PRJ-001",
+                "costing_count": 12,
+                "costings_by_status": {"Draft": 9, "Approved": 3},
+                "min_final_price": "41.30",
+                "avg_final_price": "57.12",
+                "max_final_price": "88.50",
+                "quotation_count": 2,
+                "latest_quotation": {"id": 7, "created_at": "...", "total": "125000.00", "line_count": 4}
+            }
+        ],
+        "limit": 50,
+        "has_more": true,
+        "next_cursor": "eyJzIjoi..."
+    }
+    """
+    try:
+        return await project_rollup_page(db, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
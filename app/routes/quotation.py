@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
-import io
 
 from app.database import get_db
 from app.models.quotation import Quotation, QuotationLine
@@ -13,17 +13,37 @@ from app.schemas.quotation import (
     QuotationCreate,
     QuotationUpdate,
     QuotationResponse,
+    QuotationSummaryPage,
+    QuotationFromCostings,
 )
 from app.dependencies import get_current_active_user, CachedUser
-from app.services.excel_export import generate_quotation_excel
+from app.services.db_writes import delete_returning
+from app.services.cache import invalidate
+from app.services.counts import CountMode, count_total
+from app.services.pagination import (
+    InvalidCursor,
+    resolve_sort,
+    order_by_clause,
+    keyset_filter,
+    encode_cursor,
+    decode_cursor,
+)
+from app.services.excel_export import quotation_export_file
+from app.services.quotation_writes import create_quotation, update_quotation, create_from_costings
 
 router = APIRouter(prefix="/api", tags=["Quotations"])
 
+# Sortable columns for the summary list (indexed; id is the tiebreaker)
+QUOTATION_SORT_COLUMNS = {
+    "created_at": Quotation.created_at,
+    "id": Quotation.id,
+}
+
 
 @router.get("/quotations/", response_model=List[QuotationResponse])
 async def quotation_list(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
     project_code: str | None = None,
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
@@ -41,43 +61,147 @@ async def quotation_list(
     return quotations
 
 
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+@router.get("/quotations/summary/", response_model=QuotationSummaryPage)
+async def quotation_summary_list(
+    limit: int = Query(50, ge=1, le=200),
+    project_code: Optional[str] = None,
+    date_from: Optional[date] = Query(None, description="Created on or after this day (UTC)"),
+    date_to: Optional[date] = Query(None, description="Created on or before this day (UTC)"),
+    sort: str = Query("-created_at", description="created_at or id; prefix '-' for descending"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate (cached/planner) or none"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    List quotations with their line count and grand total, without lines.
+    
+    **OPTIMIZED**: One GROUP BY query over quotation + quotation_line per
+    page (no line hydration), keyset-paginated on (sort column, id).
+    project_code/date filters use idx_quotation_project_date.
+    
+    Returns:
+    {
+        "items": [
+            {"id": 7, "project_code": "PRJ-001", "created_at": "...", "line_count": 4, "total": "125000.00", ...}
+        ],
+        "total": 120,
+        "limit": 50,
+        "has_more": true,
+        "sort": "-created_at",
+        "next_cursor": "eyJzIjoi...",
+        "count": "exact"
+    }
+    """
+    try:
+        sort_key = resolve_sort(sort, QUOTATION_SORT_COLUMNS)
+        after = decode_cursor(cursor, sort_key) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    conditions = []
+    if project_code:
+        conditions.append(Quotation.project_code == project_code)
+    if date_from:
+        conditions.append(Quotation.created_at >= _day_start(date_from))
+    if date_to:
+        conditions.append(Quotation.created_at < _day_start(date_to + timedelta(days=1)))
+    
+    query = (
+        select(
+            Quotation.id,
+            Quotation.project_code,
+            Quotation.created_at,
+            Quotation.created_by_id,
+            Quotation.notes,
+            Quotation.exported_file,
+            func.count(QuotationLine.id).label("line_count"),
+            func.coalesce(func.sum(QuotationLine.line_total), 0).label("total"),
+        )
+        .outerjoin(QuotationLine, QuotationLine.quotation_id == Quotation.id)
+        .where(*conditions)
+        .group_by(Quotation.id)
+    )
+    count_query = select(func.count(Quotation.id)).where(*conditions)
+    
+    if after is not None:
+        query = query.where(keyset_filter(sort_key, Quotation.id, *after))
+    
+    # Fetch one extra row to know whether another page follows
+    query = query.order_by(*order_by_clause(sort_key, Quotation.id)).limit(limit + 1)
+    
+    total = await count_total(db, count_query, count, "quotation", (project_code, date_from, date_to))
+    
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, getattr(last, sort_key.column.key), last.id)
+    
+    return {
+        "items": [
+            {**row._mapping, "total": Decimal(row.total).quantize(Decimal("0.01"))}
+            for row in rows
+        ],
+        "total": total,
+        "limit": limit,
+        "has_more": has_more,
+        "sort": sort_key.name,
+        "next_cursor": next_cursor,
+        "count": count,
+    }
+
+
 @router.post("/quotations/", response_model=QuotationResponse, status_code=status.HTTP_201_CREATED)
 async def quotation_create(
     quotation_data: QuotationCreate,
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Create new quotation with lines."""
-    # Extract lines
-    lines_data = quotation_data.lines
-    quotation_dict = quotation_data.model_dump(exclude={'lines'})
-    
-    # Create quotation
-    quotation = Quotation(**quotation_dict, created_by_id=current_user.id)
-    db.add(quotation)
-    await db.flush()
-    
-    # Add lines
-    for line_data in lines_data:
-        line_dict = line_data.model_dump()
-        # Calculate line_total
-        line_total = Decimal(line_data.unit_price) * Decimal(line_data.qty)
-        line = QuotationLine(
-            **line_dict,
-            quotation_id=quotation.id,
-            line_total=line_total
-        )
-        db.add(line)
+    """
+    Create new quotation with lines.
     
+    **OPTIMIZED**: Header and lines are inserted with INSERT ... RETURNING
+    (lines in one multi-row statement); the response is built from the
+    returned rows, with no read-back query.
+    """
+    quotation = await create_quotation(db, quotation_data, current_user.id)
     await db.commit()
+    invalidate("quotation")
+    return quotation
+
+
+@router.post("/quotations/from-costings/", response_model=QuotationResponse, status_code=status.HTTP_201_CREATED)
+async def quotation_from_costings(
+    payload: QuotationFromCostings,
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Create a quotation whose lines are priced from costings: the listed
+    `items` (costing_id + qty), or every costing of `project_code`
+    (optionally filtered by `status`) at `qty` each.
     
-    # Refresh with relationships
-    result = await db.execute(
-        select(Quotation)
-        .where(Quotation.id == quotation.id)
-        .options(selectinload(Quotation.lines))
-    )
-    quotation = result.scalar_one()
+    **OPTIMIZED**: All costings are priced in one batch with the
+    CostingResponse rules and the lines go in with one INSERT, so the
+    number of queries does not grow with the number of lines.
+    
+    Returns: the created quotation, as from POST /quotations/.
+    """
+    try:
+        quotation = await create_from_costings(db, payload, current_user.id)
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    invalidate("quotation")
     return quotation
 
 
@@ -112,22 +236,27 @@ async def export_quotation_excel(
     """
     Export quotation to Excel.
     CONVERTED FROM: Django views.export_quotation_excel
+    
+    **OPTIMIZED**: Served as a file from the content-addressed export cache
+    (name recorded in quotation.exported_file). Only a changed quotation
+    is hashed and regenerated; the workbook is then written in constant
+    memory off the event loop (app.services.excel_export).
     """
     result = await db.execute(
-        select(Quotation)
+        select(Quotation.id, Quotation.exported_file)
         .where(Quotation.project_code == project_code)
-        .options(selectinload(Quotation.lines))
         .order_by(Quotation.created_at.desc())
+        .limit(1)
     )
-    quotation = result.scalars().first()
-    if not quotation:
+    quotation = result.one_or_none()
+    if quotation is None:
         raise HTTPException(status_code=404, detail="Quotation not found")
     
-    # Generate Excel file
-    excel_file = generate_quotation_excel(quotation)
+    path = await quotation_export_file(db, quotation.id, project_code, quotation.exported_file)
+    await db.commit()
     
-    return StreamingResponse(
-        io.BytesIO(excel_file),
+    return FileResponse(
+        path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename=quotation_{project_code}.xlsx"}
     )
@@ -139,14 +268,10 @@ async def quotation_delete(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Delete a quotation."""
-    result = await db.execute(select(Quotation).where(Quotation.id == quotation_id))
-    quotation = result.scalar_one_or_none()
-    if not quotation:
-        raise HTTPException(status_code=404, detail="Quotation not found")
-    
-    await db.delete(quotation)
+    """Delete a quotation (single DELETE ... RETURNING; lines cascade)."""
+    await delete_returning(db, Quotation, quotation_id, detail="Quotation not found")
     await db.commit()
+    invalidate("quotation")
     return None
 @router.put("/quotations/{quotation_id}/", response_model=QuotationResponse)
 async def quotation_update(
@@ -155,46 +280,16 @@ async def quotation_update(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Update an existing quotation."""
-    result = await db.execute(
-        select(Quotation)
-        .where(Quotation.id == quotation_id)
-        .options(selectinload(Quotation.lines))
-    )
-    quotation = result.scalar_one_or_none()
-    if not quotation:
-        raise HTTPException(status_code=404, detail="Quotation not found")
-    
-    # Update fields
-    update_data = quotation_data.model_dump(exclude_unset=True, exclude={'lines'})
-    for field, value in update_data.items():
-        setattr(quotation, field, value)
+    """
+    Update an existing quotation.
     
-    # Update lines if provided
-    if quotation_data.lines is not None:
-        # Bulk delete existing lines (single query instead of loop)
-        await db.execute(
-            delete(QuotationLine).where(QuotationLine.quotation_id == quotation_id)
-        )
-        
-        # Add new lines
-        for line_data in quotation_data.lines:
-            line_dict = line_data.model_dump()
-            line_total = Decimal(line_data.unit_price) * Decimal(line_data.qty)
-            line = QuotationLine(
-                **line_dict,
-                quotation_id=quotation.id,
-                line_total=line_total
-            )
-            db.add(line)
+    **OPTIMIZED**: UPDATE ... RETURNING for the header; new lines replace
+    the old ones with one DELETE and one multi-row INSERT ... RETURNING.
+    """
+    quotation = await update_quotation(db, quotation_id, quotation_data)
+    if quotation is None:
+        raise HTTPException(status_code=404, detail="Quotation not found")
     
     await db.commit()
-    
-    # Refresh with relationships
-    result = await db.execute(
-        select(Quotation)
-        .where(Quotation.id == quotation_id)
-        .options(selectinload(Quotation.lines))
-    )
-    quotation = result.scalar_one()
+    invalidate("quotation")
     return quotation
\ No newline at end of file
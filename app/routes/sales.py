@@ -260,7 +260,8 @@ Optimized with:
 - Faster queries with selectinload
 - Response includes metadata
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
@@ -274,18 +275,78 @@ from app.schemas.sales import (
     SalesLeadStatusUpdate,
     VALID_STATUSES,
 )
-from app.dependencies import get_current_active_user, CachedUser
+from app.dependencies import get_current_active_user, get_current_superuser, CachedUser
+from app.services.cache import invalidate
+from app.services.db_writes import update_returning, delete_returning
+from app.services.counts import CountMode, count_total
+from app.services.lead_counters import (
+    TOTAL,
+    WITH_CONTACT,
+    status_key,
+    lead_state,
+    lead_deltas,
+    apply_lead_deltas,
+    read_lead_counters,
+    reconcile_lead_counters,
+)
+from app.services.lead_export import ExportFormat, MEDIA_TYPES, export_query, export_stream
+from app.services.lead_import import DedupMode, ImportFormatError, import_leads
+from app.services.lead_search import LeadSearchBackend, get_search_backend
+from app.services.pagination import (
+    InvalidCursor,
+    resolve_sort,
+    order_by_clause,
+    keyset_filter,
+    encode_cursor,
+    decode_cursor,
+)
 
 router = APIRouter(prefix="/api", tags=["Sales Leads"])
 
+# Sort keys allowed on /leads/ - each one is backed by an index on sales_lead
+LEAD_SORT_COLUMNS = {
+    "created_at": SalesLead.created_at,
+    "company_name": SalesLead.company_name,
+    "id": SalesLead.id,
+}
+
+
+def _lead_filters(
+    lead_status: Optional[str],
+    location: Optional[str],
+    search: Optional[str],
+    search_backend: LeadSearchBackend,
+) -> list:
+    """Build WHERE conditions shared by the list and count queries."""
+    conditions = []
+    
+    if lead_status:
+        if lead_status not in VALID_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
+            )
+        conditions.append(SalesLead.status == lead_status)
+    
+    if location:
+        conditions.append(SalesLead.location.ilike(f"%{location}%"))
+    
+    if search:
+        conditions.append(search_backend.condition(search))
+    
+    return conditions
+
 
 @router.get("/leads/")
 async def leads_list(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored when cursor is set)"),
     limit: int = Query(50, ge=1, le=100, description="Maximum records to return (max 100)"),
     status: Optional[str] = Query(None, description="Filter by status"),
     location: Optional[str] = Query(None, description="Filter by location"),
-    search: Optional[str] = Query(None, description="Search in company name or owner"),
+    search: Optional[str] = Query(None, description="Search in company name, owner, email, segment and notes"),
+    sort: str = Query("-created_at", description="created_at, company_name, id or relevance (with search); prefix '-' for descending"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: CountMode = Query("exact", description="Total count: exact, estimate (cached/planner) or none"),
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
@@ -293,6 +354,11 @@ async def leads_list(
     List sales leads with pagination and filtering.
     
     **OPTIMIZED**: Returns pagination metadata for frontend.
+    Pass `next_cursor` back as `cursor` to page with a keyset range scan on
+    (sort column, id) instead of OFFSET. `skip` keeps working for old clients.
+    `count=estimate` serves a cached/planner total, `count=none` skips it
+    (total is null and has_more comes from fetching limit+1 rows).
+    With `search`, `sort=-relevance` orders by best match first.
     
     Returns:
     {
@@ -300,46 +366,51 @@ async def leads_list(
         "total": 1234,
         "skip": 0,
         "limit": 50,
-        "has_more": true
+        "has_more": true,
+        "sort": "-created_at",
+        "next_cursor": "eyJzIjoi..."
     }
     """
-    # Build base query
-    query = select(SalesLead)
-    count_query = select(func.count(SalesLead.id))
+    search_backend = get_search_backend(db)
+    sort_columns = LEAD_SORT_COLUMNS
+    if search:
+        sort_columns = {**LEAD_SORT_COLUMNS, "relevance": search_backend.rank(search)}
     
-    # Apply filters to both queries
-    if status:
-        if status not in VALID_STATUSES:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
-            )
-        query = query.where(SalesLead.status == status)
-        count_query = count_query.where(SalesLead.status == status)
+    try:
+        sort_key = resolve_sort(sort, sort_columns)
+        after = decode_cursor(cursor, sort_key) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if location:
-        query = query.where(SalesLead.location.ilike(f"%{location}%"))
-        count_query = count_query.where(SalesLead.location.ilike(f"%{location}%"))
+    conditions = _lead_filters(status, location, search, search_backend)
     
-    if search:
-        search_pattern = f"%{search}%"
-        search_filter = (
-            (SalesLead.company_name.ilike(search_pattern)) |
-            (SalesLead.owner.ilike(search_pattern)) |
-            (SalesLead.email.ilike(search_pattern))
-        )
-        query = query.where(search_filter)
-        count_query = count_query.where(search_filter)
+    # Build base queries (same filters on both); the sort value rides along
+    # so the next cursor can be built from the last row
+    query = select(SalesLead, sort_key.column.label("sort_value")).where(*conditions)
+    count_query = select(func.count(SalesLead.id)).where(*conditions)
+    
+    if after is not None:
+        # Keyset mode: continue right after the last row of the previous page
+        skip = 0
+        query = query.where(keyset_filter(sort_key, SalesLead.id, *after))
     
-    # Apply pagination and ordering (use index for fast sorting)
-    query = query.offset(skip).limit(limit).order_by(SalesLead.created_at.desc())
+    # Fetch one extra row to know whether another page follows
+    query = query.order_by(*order_by_clause(sort_key, SalesLead.id)).offset(skip).limit(limit + 1)
     
     # Execute queries sequentially (async sessions don't support parallel ops)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    total = await count_total(db, count_query, count, "sales_lead", (status, location, search))
     
     data_result = await db.execute(query)
-    leads = data_result.scalars().all()
+    rows = data_result.all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    leads = [row[0] for row in rows]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, last.sort_value, last[0].id)
     
     # Return with pagination metadata
     return {
@@ -347,7 +418,10 @@ async def leads_list(
         "total": total,
         "skip": skip,
         "limit": limit,
-        "has_more": (skip + limit) < total
+        "has_more": has_more,
+        "sort": sort_key.name,
+        "next_cursor": next_cursor,
+        "count": count,
     }
 
 
@@ -359,40 +433,33 @@ async def leads_stats(
     """
     Get statistics about leads.
     
-    **OPTIMIZED**: Single GROUP BY query instead of N+1 queries per status.
+    **OPTIMIZED**: Reads counters kept up to date by lead writes
+    (a few rows) instead of COUNT/GROUP BY over the whole table.
     """
-    # Run queries sequentially (async sessions don't support parallel ops)
-    total_query = select(func.count(SalesLead.id))
-    
-    # Single GROUP BY query for all status counts (replaces N separate queries)
-    status_query = select(
-        SalesLead.status,
-        func.count(SalesLead.id)
-    ).group_by(SalesLead.status)
-    
-    contacted_query = select(func.count(SalesLead.id)).where(
-        (SalesLead.email.isnot(None)) | (SalesLead.phone.isnot(None))
-    )
-    
-    # Execute queries sequentially
-    total_result = await db.execute(total_query)
-    total = total_result.scalar()
-    
-    status_result = await db.execute(status_query)
-    
-    contacted_result = await db.execute(contacted_query)
-    with_contact = contacted_result.scalar()
-    
-    # Build status_counts from GROUP BY result
-    status_counts = {status: 0 for status in VALID_STATUSES}
-    for row in status_result:
-        if row[0] in status_counts:
-            status_counts[row[0]] = row[1]
+    counters = await read_lead_counters(db)
     
     return {
-        "total": total,
-        "with_contact": with_contact,
-        "by_status": status_counts
+        "total": counters.get(TOTAL, 0),
+        "with_contact": counters.get(WITH_CONTACT, 0),
+        "by_status": {s: counters.get(status_key(s), 0) for s in VALID_STATUSES}
+    }
+
+
+@router.post("/leads/stats/reconcile/")
+async def leads_stats_reconcile(
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_superuser)
+):
+    """
+    Recompute lead counters from sales_lead, repairing any drift. Admin
+    only: full-table aggregates under the counter rows' locks (the lifespan
+    job already does this periodically).
+    """
+    counters = await reconcile_lead_counters(db)
+    return {
+        "total": counters[TOTAL],
+        "with_contact": counters[WITH_CONTACT],
+        "by_status": {s: counters.get(status_key(s), 0) for s in VALID_STATUSES}
     }
 
 
@@ -405,11 +472,77 @@ async def leads_create(
     """Create a new sales lead."""
     lead = SalesLead(**lead_data.model_dump())
     db.add(lead)
+    await apply_lead_deltas(db, lead_deltas(None, lead_state(lead)))
     await db.commit()
     await db.refresh(lead)
+    invalidate("sales_lead")
     return lead
 
 
+@router.post("/leads/import/")
+async def leads_import(
+    file: UploadFile = File(..., description="CSV or XLSX file with a header row"),
+    dedup: DedupMode = Query("none", description="Skip rows whose email or company already exists"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Bulk import leads from a CSV or XLSX upload.
+    
+    Rows are validated with the same rules as single creates (status
+    whitelist, email cleanup) and loaded in chunks with COPY.
+    
+    Returns:
+    {
+        "total_rows": 5000,
+        "imported": 4980,
+        "skipped_duplicates": 12,
+        "failed": 8,
+        "errors": [{"row": 17, "errors": ["status: Value error, ..."]}],
+        "errors_truncated": false
+    }
+    """
+    try:
+        report = await import_leads(db, file.file, file.filename, dedup)
+    except ImportFormatError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    invalidate("sales_lead")
+    return report
+
+
+@router.get("/leads/export/")
+async def leads_export(
+    export_format: ExportFormat = Query("csv", alias="format", description="csv, ndjson or xlsx"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    location: Optional[str] = Query(None, description="Filter by location"),
+    search: Optional[str] = Query(None, description="Search in company name, owner, email, segment and notes"),
+    sort: str = Query("-created_at", description="created_at, company_name or id; prefix '-' for descending"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Export every lead matching the `/leads/` filters as a download.
+    
+    Streams from a server-side cursor in fixed-size batches, so memory
+    stays flat even for a full-table export.
+    """
+    try:
+        sort_key = resolve_sort(sort, LEAD_SORT_COLUMNS)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    conditions = _lead_filters(status, location, search, get_search_backend(db))
+    query = export_query(*conditions, order_by=order_by_clause(sort_key, SalesLead.id))
+    
+    return StreamingResponse(
+        export_stream(query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=leads.{export_format}"}
+    )
+
+
 @router.get("/leads/{lead_id}/", response_model=SalesLeadResponse)
 async def lead_detail(
     lead_id: int,
@@ -438,26 +571,25 @@ async def lead_update(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Update lead information. Only provided fields will be updated."""
-    result = await db.execute(
-        select(SalesLead).where(SalesLead.id == lead_id)
-    )
-    lead = result.scalar_one_or_none()
-    
-    if not lead:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Lead with ID {lead_id} not found"
-        )
+    """
+    Update lead information. Only provided fields will be updated.
     
+    **OPTIMIZED**: One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh.
+    """
     # Update only provided fields
     update_data = lead_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(lead, field, value)
+    if not update_data:
+        return await lead_detail(lead_id, db, current_user)
     
+    lead, before = await update_returning(
+        db, SalesLead, lead_id, update_data,
+        detail=f"Lead with ID {lead_id} not found",
+        previous=(SalesLead.status, SalesLead.email, SalesLead.phone),
+    )
+    await apply_lead_deltas(db, lead_deltas(lead_state(before), lead_state(lead)))
     await db.commit()
-    await db.refresh(lead)
-    return lead
+    invalidate("sales_lead")
+    return SalesLeadResponse.model_validate(lead)
 
 
 @router.patch("/leads/{lead_id}/status/", response_model=SalesLeadResponse)
@@ -467,22 +599,16 @@ async def update_lead_status(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Update only the status of a lead."""
-    result = await db.execute(
-        select(SalesLead).where(SalesLead.id == lead_id)
+    """Update only the status of a lead (single UPDATE ... RETURNING)."""
+    lead, before = await update_returning(
+        db, SalesLead, lead_id, {"status": status_data.status},
+        detail=f"Lead with ID {lead_id} not found",
+        previous=(SalesLead.status, SalesLead.email, SalesLead.phone),
     )
-    lead = result.scalar_one_or_none()
-    
-    if not lead:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Lead with ID {lead_id} not found"
-        )
-    
-    lead.status = status_data.status
+    await apply_lead_deltas(db, lead_deltas(lead_state(before), lead_state(lead)))
     await db.commit()
-    await db.refresh(lead)
-    return lead
+    invalidate("sales_lead")
+    return SalesLeadResponse.model_validate(lead)
 
 
 @router.delete("/leads/{lead_id}/", status_code=status.HTTP_204_NO_CONTENT)
@@ -491,18 +617,13 @@ async def lead_delete(
     db: AsyncSession = Depends(get_db),
     current_user: CachedUser = Depends(get_current_active_user)
 ):
-    """Delete a lead permanently."""
-    result = await db.execute(
-        select(SalesLead).where(SalesLead.id == lead_id)
+    """Delete a lead permanently (single DELETE ... RETURNING)."""
+    deleted = await delete_returning(
+        db, SalesLead, lead_id,
+        detail=f"Lead with ID {lead_id} not found",
+        returning=(SalesLead.status, SalesLead.email, SalesLead.phone),
     )
-    lead = result.scalar_one_or_none()
-    
-    if not lead:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Lead with ID {lead_id} not found"
-        )
-    
-    await db.delete(lead)
+    await apply_lead_deltas(db, lead_deltas(lead_state(deleted), None))
     await db.commit()
-    return None
\ No newline at end of file
+    invalidate("sales_lead")
+    return None
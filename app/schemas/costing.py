@@ -1,6 +1,10 @@
-from pydantic import BaseModel, ConfigDict, computed_field
-from decimal import Decimal
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, field_validator, model_validator
+from decimal import Decimal, InvalidOperation
 from datetime import datetime
+from typing import Literal
+
+
+VALID_COSTING_STATUSES = ["draft", "final", "approved", "archived"]
 
 
 # PackagingOption Schemas
@@ -85,6 +89,9 @@ class CostingResponse(CostingBase):
     created_at: datetime
     created_by_id: int | None
     costing_packaging: list[CostingPackagingResponse] = []
+
+    # Price fields precomputed in batch by app.services.pricing (same values)
+    _prices: dict | None = PrivateAttr(default=None)
     
     # ============================================================
     # BUSINESS LOGIC FROM DJANGO MODELS - PRESERVED EXACTLY
@@ -97,6 +104,8 @@ class CostingResponse(CostingBase):
         Sum of packaging option costs * quantity + manual packaging cost (if any).
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["total_packaging_cost"]
         total = Decimal('0.00')
         for cp in self.costing_packaging:
             qty = Decimal(cp.quantity or 1)
@@ -113,6 +122,8 @@ class CostingResponse(CostingBase):
         Returns 0 if values missing.
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["rm_cost_per_unit"]
         try:
             if self.rm_per_litre is None or self.sku_ml is None:
                 return Decimal('0.00')
@@ -128,6 +139,8 @@ class CostingResponse(CostingBase):
         Sum of RM per unit + packaging + overheads (cc_pc, vaince, fda, formulation, transport)
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["unit_cost_before_gst"]
         total = Decimal('0.00')
         total += self.rm_cost_per_unit
         total += self.total_packaging_cost
@@ -145,6 +158,8 @@ class CostingResponse(CostingBase):
         GST calculation
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["gst_amount_per_unit"]
         try:
             gst = Decimal(self.gst_percent or 0) / Decimal('100')
             return (self.unit_cost_before_gst * gst).quantize(Decimal('0.01'))
@@ -158,6 +173,8 @@ class CostingResponse(CostingBase):
         Final unit price with GST
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["final_unit_price"]
         return (self.unit_cost_before_gst + self.gst_amount_per_unit).quantize(Decimal('0.01'))
     
     @computed_field
@@ -169,6 +186,8 @@ class CostingResponse(CostingBase):
         If sku_ml missing or zero => 0
         EXACT LOGIC FROM DJANGO MODEL
         """
+        if self._prices is not None:
+            return self._prices["moq"]
         try:
             if not self.sku_ml or Decimal(self.sku_ml) == 0:
                 return 0
@@ -179,3 +198,354 @@ class CostingResponse(CostingBase):
             return 0
     
     model_config = ConfigDict(from_attributes=True)
+
+
+# Scenario (what-if repricing) Schemas
+ScenarioField = Literal[
+    "rm_per_litre", "sku_ml", "packaging_cost_manual", "batch_size_kg", "gst_percent",
+    "cc_pc", "vaince", "fda", "formulation_charge", "transport", "packaging_cost",
+]
+
+
+class ScenarioOverride(BaseModel):
+    """
+    One parameter change. `absolute` replaces the value, `percent` scales it
+    (e.g. 5 = +5%). `packaging_cost` changes one packaging option's cost and
+    needs `packaging_id`. project_code/status limit it to matching costings.
+    """
+    field: ScenarioField
+    mode: Literal["absolute", "percent"] = "absolute"
+    value: Decimal
+    packaging_id: int | None = None
+    project_code: str | None = None
+    status: str | None = None
+
+    @model_validator(mode="after")
+    def check_override(self) -> "ScenarioOverride":
+        """Validate packaging_id usage and percent range"""
+        if (self.field == "packaging_cost") != (self.packaging_id is not None):
+            raise ValueError("packaging_id is required for packaging_cost and only allowed there")
+        if self.mode == "percent":
+            if not Decimal("-100") <= self.value <= Decimal("1000"):
+                raise ValueError("percent must be between -100 and 1000")
+            if self.value != self.value.quantize(Decimal("0.01")):
+                raise ValueError("percent allows at most 2 decimal places")
+        return self
+
+
+class ScenarioRequest(BaseModel):
+    overrides: list[ScenarioOverride] = Field(min_length=1, max_length=50)
+    project_code: str | None = None
+    status: str | None = None
+    top: int = Field(100, ge=0, le=1000)
+
+
+class CostingPriceChange(BaseModel):
+    """Old/new final_unit_price of one costing (scenarios, packaging cost changes)."""
+    id: int
+    project_code: str
+    product_name: str
+    status: str
+    old_final_unit_price: Decimal
+    new_final_unit_price: Decimal
+    delta: Decimal
+
+
+class ScenarioAggregates(BaseModel):
+    old_total: Decimal
+    new_total: Decimal
+    total_delta: Decimal
+    avg_old_price: Decimal
+    avg_new_price: Decimal
+    avg_delta: Decimal
+    min_delta: Decimal
+    max_delta: Decimal
+
+
+class ScenarioResponse(BaseModel):
+    costings: int
+    changed: int
+    skipped: int
+    aggregates: ScenarioAggregates
+    items: list[CostingPriceChange]
+
+
+# Packaging cost change Schemas
+class PackagingCostUpdate(BaseModel):
+    cost: Decimal = Field(ge=0)
+    refresh_quotations: bool = False
+    dry_run: bool = False
+
+
+class PackagingCostImpact(BaseModel):
+    packaging: PackagingOptionResponse
+    old_cost: Decimal
+    new_cost: Decimal
+    dry_run: bool
+    affected_costings: int
+    total_delta: Decimal
+    affected_quotations: list[int]
+    quotation_lines_updated: int | None
+    costings: list[CostingPriceChange]
+
+
+# Bulk operation Schemas
+class CostingBulkCreate(BaseModel):
+    items: list[CostingCreate] = Field(min_length=1, max_length=500)
+
+
+class CostingBulkFilter(BaseModel):
+    """Selects costings for a bulk operation; criteria are ANDed."""
+    ids: list[int] | None = Field(None, min_length=1, max_length=1000)
+    project_code: str | None = None
+    status: str | None = None
+
+    @model_validator(mode="after")
+    def _has_criteria(self):
+        if self.ids is None and self.project_code is None and self.status is None:
+            raise ValueError("give ids, project_code or status")
+        return self
+
+
+class CostingBulkStatus(CostingBulkFilter):
+    new_status: str
+
+    @field_validator('new_status')
+    @classmethod
+    def validate_new_status(cls, v: str) -> str:
+        """Validate new_status is one of the allowed values"""
+        if v not in VALID_COSTING_STATUSES:
+            raise ValueError(f"Status must be one of: {', '.join(VALID_COSTING_STATUSES)}")
+        return v
+
+
+class CostingBulkResult(BaseModel):
+    count: int
+    ids: list[int]
+    source_ids: list[int] | None = None   # duplicates: ids[i] is a copy of source_ids[i]
+
+
+# Live preview Schemas
+_PREVIEW_DEFAULTS = {
+    "batch_size_kg": Decimal("500"),
+    "gst_percent": Decimal("18"),
+    "cc_pc": Decimal("12"),
+    "vaince": Decimal("12"),
+    "fda": Decimal("1"),
+    "formulation_charge": Decimal("2"),
+    "transport": Decimal("4"),
+}
+
+# Integer digits each costing column can store (Numeric precision - scale)
+_PREVIEW_INTEGER_DIGITS = {
+    "sku_ml": 9,
+    "rm_per_litre": 8,
+    "packaging_cost_manual": 10,
+    "batch_size_kg": 10,
+    "gst_percent": 3,
+    "cc_pc": 10,
+    "vaince": 10,
+    "fda": 10,
+    "formulation_charge": 10,
+    "transport": 10,
+}
+
+
+class CostingPreviewRequest(BaseModel):
+    """
+    Price inputs of /costing/new/form/ with the same defaults, plus packaging
+    items. Other form fields may be sent along and are ignored.
+    """
+    sku_ml: Decimal | None = None
+    rm_per_litre: Decimal | None = None
+    packaging_cost_manual: Decimal | None = None
+    batch_size_kg: Decimal = _PREVIEW_DEFAULTS["batch_size_kg"]
+    gst_percent: Decimal = _PREVIEW_DEFAULTS["gst_percent"]
+    cc_pc: Decimal = _PREVIEW_DEFAULTS["cc_pc"]
+    vaince: Decimal = _PREVIEW_DEFAULTS["vaince"]
+    fda: Decimal = _PREVIEW_DEFAULTS["fda"]
+    formulation_charge: Decimal = _PREVIEW_DEFAULTS["formulation_charge"]
+    transport: Decimal = _PREVIEW_DEFAULTS["transport"]
+    packaging_items: list[CostingPackagingCreate] = Field(default_factory=list, max_length=100)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _lenient_numbers(cls, data):
+        # Like safe_decimal() in the form endpoint: a blank or half-typed
+        # number falls back to the default instead of failing
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        for field in ("sku_ml", "rm_per_litre", "packaging_cost_manual", *_PREVIEW_DEFAULTS):
+            value = data.get(field)
+            if value is None:
+                continue
+            text = str(value).strip()
+            try:
+                valid = Decimal(text).is_finite()
+            except (InvalidOperation, ValueError):
+                valid = False
+            if valid:
+                data[field] = text
+            else:
+                data.pop(field)
+        return data
+
+    @model_validator(mode="after")
+    def _fits_columns(self):
+        # Out-of-range values could never be saved (and overflow the price maths)
+        for field, digits in _PREVIEW_INTEGER_DIGITS.items():
+            value = getattr(self, field)
+            if value is not None and abs(value) >= Decimal(10) ** digits:
+                raise ValueError(f"{field} must be below {10 ** digits}")
+        return self
+
+
+class CostingPreviewResponse(BaseModel):
+    total_packaging_cost: Decimal
+    rm_cost_per_unit: Decimal
+    unit_cost_before_gst: Decimal
+    gst_amount_per_unit: Decimal
+    final_unit_price: Decimal
+    moq: int
+    catalog_version: int
+
+
+# Price simulation Schemas
+class PriceShock(BaseModel):
+    """
+    Percent change of a cost, drawn once per trial: normal(mean, std),
+    uniform(low, high) or triangular(low, mode, high). Changes below -100%
+    are clipped.
+    """
+    kind: Literal["normal", "uniform", "triangular"] = "normal"
+    mean: float = 0.0
+    std: float = Field(0.0, ge=0, le=1000)
+    low: float | None = Field(None, ge=-100, le=1000)
+    mode: float | None = Field(None, ge=-100, le=1000)
+    high: float | None = Field(None, ge=-100, le=1000)
+
+    @model_validator(mode="after")
+    def _check_parameters(self):
+        if self.kind == "normal":
+            if not -100 <= self.mean <= 1000:
+                raise ValueError("mean must be between -100 and 1000")
+            return self
+        if self.low is None or self.high is None or self.low > self.high:
+            raise ValueError(f"{self.kind} needs low <= high")
+        if self.kind == "triangular" and (self.mode is None or not self.low <= self.mode <= self.high):
+            raise ValueError("triangular needs low <= mode <= high")
+        return self
+
+
+class PackagingShock(PriceShock):
+    packaging_id: int | None = None   # None: every option without its own shock
+
+
+class SimulationRequest(BaseModel):
+    costing_ids: list[int] | None = Field(None, min_length=1, max_length=5000)
+    project_code: str | None = None
+    status: str | None = None
+    trials: int = Field(10000, ge=100, le=100000)
+    seed: int | None = Field(None, ge=0, le=2**63 - 1)
+    rm_per_litre: PriceShock | None = None
+    transport: PriceShock | None = None
+    packaging: list[PackagingShock] = Field(default_factory=list, max_length=50)
+    percentiles: list[float] = Field(default_factory=lambda: [5.0, 50.0, 95.0], min_length=1, max_length=10)
+
+    @model_validator(mode="after")
+    def _check_shocks(self):
+        ids = [shock.packaging_id for shock in self.packaging]
+        if len(ids) != len(set(ids)):
+            raise ValueError("one packaging shock per packaging_id (and at most one without)")
+        if any(not 0 <= p <= 100 for p in self.percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        return self
+
+
+class SimulatedCosting(BaseModel):
+    id: int
+    project_code: str
+    product_name: str
+    final_unit_price: Decimal                 # today's price
+    mean: Decimal                             # of simulated final_unit_price
+    percentiles: dict[str, Decimal]           # "p5" -> simulated final_unit_price
+    margin_percentiles: dict[str, Decimal]    # "p5" -> today's price minus simulated price
+    prob_above_current: float                 # share of trials priced above today's price
+
+
+class SimulationResponse(BaseModel):
+    seed: int
+    trials: int
+    costings: int
+    skipped: int
+    items: list[SimulatedCosting]
+
+
+# Sensitivity sweep Schemas
+SweepField = Literal[
+    "batch_size_kg", "sku_ml", "rm_per_litre", "packaging_cost_manual", "gst_percent",
+    "cc_pc", "vaince", "fda", "formulation_charge", "transport",
+]
+
+MAX_SWEEP_POINTS = 10000
+
+
+class SweepAxis(BaseModel):
+    """Values for one field: a list, or the inclusive range start..stop by step."""
+    field: SweepField
+    values: list[Decimal] | None = Field(None, min_length=1, max_length=1000)
+    start: Decimal | None = None
+    stop: Decimal | None = None
+    step: Decimal | None = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def _check_values(self):
+        has_range = (self.start, self.stop, self.step) != (None, None, None)
+        if (self.values is None) == (not has_range):
+            raise ValueError("give either values or start, stop and step")
+        if has_range:
+            if None in (self.start, self.stop, self.step) or self.stop < self.start:
+                raise ValueError("a range needs start <= stop and step > 0")
+            if (self.stop - self.start) / self.step >= 1000:
+                raise ValueError("a range may have at most 1000 values")
+        return self
+
+    def points(self) -> list[Decimal]:
+        if self.values is not None:
+            return self.values
+        count = int((self.stop - self.start) // self.step) + 1
+        return [self.start + k * self.step for k in range(count)]
+
+
+class SweepRequest(BaseModel):
+    axes: list[SweepAxis] = Field(min_length=1, max_length=3)
+
+    @model_validator(mode="after")
+    def _check_axes(self):
+        fields = [axis.field for axis in self.axes]
+        if len(fields) != len(set(fields)):
+            raise ValueError("each field may be swept once")
+        size = 1
+        for axis in self.axes:
+            size *= len(axis.points())
+        if size > MAX_SWEEP_POINTS:
+            raise ValueError(f"the grid may have at most {MAX_SWEEP_POINTS} points")
+        return self
+
+
+class SweepPrices(BaseModel):
+    moq: int
+    unit_cost_before_gst: Decimal
+    final_unit_price: Decimal
+
+
+class SweepPoint(SweepPrices):
+    values: dict[str, Decimal]
+
+
+class SweepResponse(BaseModel):
+    costing_id: int
+    current: SweepPrices
+    axes: list[SweepField]
+    points: list[SweepPoint]    # every combination, last axis varying fastest
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import datetime
+
+
+class ProjectQuotationSummary(BaseModel):
+    id: int
+    created_at: datetime | None
+    total: Decimal
+    line_count: int
+
+
+class ProjectRollup(BaseModel):
+    project_code: str
+    costing_count: int
+    costings_by_status: dict[str, int]
+    min_final_price: Decimal | None
+    avg_final_price: Decimal | None
+    max_final_price: Decimal | None
+    quotation_count: int
+    latest_quotation: ProjectQuotationSummary | None
+
+
+class ProjectRollupPage(BaseModel):
+    items: list[ProjectRollup]
+    limit: int
+    has_more: bool
+    next_cursor: str | None
@@ -1,7 +1,12 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from decimal import Decimal
 from datetime import datetime
 
+# Largest quantity for a line priced from costings: fits the Integer
+# quotation_line.qty column with room for any realistic unit price in the
+# Numeric(16, 2) line_total
+QUOTATION_MAX_QTY = 1_000_000
+
 
 class QuotationLineBase(BaseModel):
     product_name: str
@@ -36,6 +41,21 @@ class QuotationUpdate(BaseModel):
     lines: list[QuotationLineCreate] | None = None
 
 
+class QuotationCostingItem(BaseModel):
+    costing_id: int
+    qty: int = Field(1, ge=1, le=QUOTATION_MAX_QTY)
+
+
+class QuotationFromCostings(QuotationBase):
+    """
+    Quotation priced from costings: the listed `items`, or every costing of
+    `project_code` (optionally only those with `status`) at `qty` each.
+    """
+    items: list[QuotationCostingItem] | None = Field(None, min_length=1, max_length=1000)
+    status: str | None = None
+    qty: int = Field(1, ge=1, le=QUOTATION_MAX_QTY)
+
+
 class QuotationResponse(QuotationBase):
     id: int
     created_at: datetime
@@ -44,3 +64,24 @@ class QuotationResponse(QuotationBase):
     lines: list[QuotationLineResponse] = []
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class QuotationSummary(BaseModel):
+    id: int
+    project_code: str
+    created_at: datetime
+    created_by_id: int | None
+    notes: str | None
+    exported_file: str | None
+    line_count: int
+    total: Decimal
+
+
+class QuotationSummaryPage(BaseModel):
+    items: list[QuotationSummary]
+    total: int | None
+    limit: int
+    has_more: bool
+    sort: str
+    next_cursor: str | None
+    count: str
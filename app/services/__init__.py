@@ -1,4 +1,4 @@
-from app.services.excel_export import generate_quotation_excel
+from app.services.excel_export import quotation_export_file
 
-__all__ = ["generate_quotation_excel"]
+__all__ = ["quotation_export_file"]
 from fastapi import FastAPI
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+In-process caches
+File: app/services/cache.py
+
+Small LRU + TTL cache with tag-based invalidation. Entries remember the
+generation of every tag they depend on; `invalidate("sales_lead")` just bumps
+that tag's generation, so all dependent entries in every cache go stale in O(1).
+
+Caches are per worker process. The TTL bounds how long another worker can
+serve a value after a write it did not see.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Iterable
+
+_generations: dict[str, int] = {}
+_generations_lock = Lock()
+
+_MISSING = object()
+
+
+def invalidate(*tags: str) -> None:
+    """Mark every cached entry that depends on any of `tags` as stale."""
+    with _generations_lock:
+        for tag in tags:
+            _generations[tag] = _generations.get(tag, 0) + 1
+
+
+def _snapshot(tags: Iterable[str]) -> tuple:
+    return tuple((tag, _generations.get(tag, 0)) for tag in tags)
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, tuple, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, tag_gens, value = entry
+            if expires_at < time.monotonic() or tag_gens != _snapshot(tag for tag, _ in tag_gens):
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, _snapshot(tags), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,223 @@
+"""
+Bulk costing operations
+File: app/services/costing_bulk.py
+
+Create, duplicate, re-status and delete many costings in one transaction
+with a fixed number of statements, however many rows are involved:
+
+- create: multi-row INSERT ... RETURNING id for the costings, one INSERT for
+  their packaging items, one for their history;
+- duplicate: INSERT ... SELECT copies the costing rows (stored prices
+  included, the inputs are identical; names get the same "_copy" /
+  " (Copy)" suffixes as a single duplicate) and their packaging rows
+  server-side;
+  new ids are allocated up front (nextval on PostgreSQL) and mapped with a
+  CASE on the source id;
+- status: one UPDATE over the selected rows;
+- delete: one DELETE of the selected ids; packaging rows and history go
+  through ON DELETE CASCADE, quotation lines keep their copy (SET NULL).
+
+Each operation touches at most BULK_MAX_ROWS costings.
+
+All functions leave committing to the caller.
+"""
+from typing import Optional
+
+from sqlalchemy import select, insert, update, delete, func, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.costing import Costing, CostingPackaging
+from app.schemas.costing import CostingBulkFilter, CostingCreate
+from app.services.costing_history import (
+    snapshot,
+    record_created_many,
+    record_bulk_change,
+    next_version,
+)
+from app.services.costing_packaging import merge_packaging_items
+from app.services.packaging_catalog import get_catalog
+from app.services.pricing import refresh_stored_prices
+
+# Rows a duplicate, status change or delete may touch in one request
+BULK_MAX_ROWS = 1000
+
+# Columns a duplicate gets from a different source than its original
+_DUPLICATE_OWN_COLUMNS = {"id", "status", "created_by_id", "created_at", "version", "project_code", "product_name"}
+
+_PROJECT_CODE_LENGTH = Costing.__table__.c.project_code.type.length
+_PRODUCT_NAME_LENGTH = Costing.__table__.c.product_name.type.length
+
+
+def duplicate_names(project_code: str, product_name: str) -> tuple[str, str]:
+    """(project_code, product_name) of a copy, cut to the column lengths."""
+    return (
+        f"{project_code}_copy"[:_PROJECT_CODE_LENGTH],
+        f"{product_name} (Copy)"[:_PRODUCT_NAME_LENGTH],
+    )
+
+
+def bulk_conditions(selection: CostingBulkFilter) -> list:
+    conditions = []
+    if selection.ids is not None:
+        conditions.append(Costing.id.in_(selection.ids))
+    if selection.project_code is not None:
+        conditions.append(Costing.project_code == selection.project_code)
+    if selection.status is not None:
+        conditions.append(Costing.status == selection.status)
+    return conditions
+
+
+def _check_limit(count: int) -> None:
+    if count > BULK_MAX_ROWS:
+        raise ValueError(f"More than {BULK_MAX_ROWS} costings match; narrow the selection")
+
+
+async def create_costings(db: AsyncSession, items: list[CostingCreate], user_id: Optional[int]) -> list[int]:
+    """Insert `items` with their packaging items; returns the new ids in order."""
+    items = [item.model_copy(update={"packaging_items": merge_packaging_items(item.packaging_items)}) for item in items]
+    packaging_ids = {p.packaging_id for item in items for p in item.packaging_items}
+    catalog = await get_catalog(db, packaging_ids)
+    unknown = sorted(packaging_ids - catalog.by_id.keys())
+    if unknown:
+        raise ValueError(f"Unknown packaging option(s): {unknown}")
+
+    rows = [
+        {**item.model_dump(exclude={"packaging_items"}), "created_by_id": user_id, "version": 1}
+        for item in items
+    ]
+    ids = list((await db.execute(
+        insert(Costing).returning(Costing.id, sort_by_parameter_order=True), rows
+    )).scalars())
+
+    links = [
+        {"costing_id": costing_id, "packaging_id": p.packaging_id, "quantity": p.quantity}
+        for costing_id, item in zip(ids, items)
+        for p in item.packaging_items
+    ]
+    if links:
+        await db.execute(insert(CostingPackaging), links)
+
+    await record_created_many(
+        db, {costing_id: snapshot(item, item.packaging_items) for costing_id, item in zip(ids, items)}, user_id
+    )
+    await refresh_stored_prices(db, Costing.id.in_(ids))
+    return ids
+
+
+async def _allocate_ids(db: AsyncSession, count: int) -> list[int]:
+    if db.get_bind().dialect.name == "postgresql":
+        sequence = func.pg_get_serial_sequence(Costing.__tablename__, "id")
+        result = await db.execute(
+            select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+        )
+        return list(result.scalars())
+    # SQLite: the write transaction already holds the database lock
+    start = (await db.execute(select(func.max(Costing.id)))).scalar() or 0
+    return list(range(start + 1, start + count + 1))
+
+
+async def duplicate_costings(
+    db: AsyncSession, selection: CostingBulkFilter, user_id: Optional[int]
+) -> tuple[list[int], list[int]]:
+    """
+    Copy the selected costings (as drafts owned by `user_id`) with their
+    packaging items. Returns (source ids, new ids), aligned.
+    """
+    sources = (await db.execute(
+        select(Costing)
+        .where(*bulk_conditions(selection))
+        .options(selectinload(Costing.costing_packaging))
+        .order_by(Costing.id)
+        .limit(BULK_MAX_ROWS + 1)
+    )).scalars().all()
+    _check_limit(len(sources))
+    if not sources:
+        return [], []
+
+    source_ids = [c.id for c in sources]
+    new_ids = await _allocate_ids(db, len(sources))
+    mapping = dict(zip(source_ids, new_ids))
+
+    copied = [c for c in Costing.__table__.c if c.name not in _DUPLICATE_OWN_COLUMNS]
+    await db.execute(
+        insert(Costing).from_select(
+            ["id", "status", "created_by_id", "version", "project_code", "product_name", *(c.name for c in copied)],
+            select(
+                case(mapping, value=Costing.id),
+                literal("draft", Costing.status.type),
+                literal(user_id, Costing.created_by_id.type),
+                literal(1, Costing.version.type),
+                # Same names as duplicate_names()
+                func.substr(Costing.project_code.concat("_copy"), 1, _PROJECT_CODE_LENGTH),
+                func.substr(Costing.product_name.concat(" (Copy)"), 1, _PRODUCT_NAME_LENGTH),
+                *copied,
+            ).where(Costing.id.in_(source_ids)),
+        )
+    )
+    await db.execute(
+        insert(CostingPackaging).from_select(
+            ["costing_id", "packaging_id", "quantity"],
+            select(
+                case(mapping, value=CostingPackaging.costing_id),
+                CostingPackaging.packaging_id,
+                CostingPackaging.quantity,
+            ).where(CostingPackaging.costing_id.in_(source_ids)),
+        )
+    )
+
+    states = {}
+    for costing in sources:
+        state = snapshot(costing, costing.costing_packaging)
+        state["status"] = "draft"
+        state["project_code"], state["product_name"] = duplicate_names(costing.project_code, costing.product_name)
+        states[mapping[costing.id]] = state
+    await record_created_many(db, states, user_id)
+    return source_ids, new_ids
+
+
+async def set_status(
+    db: AsyncSession, selection: CostingBulkFilter, new_status: str, user_id: Optional[int]
+) -> list[int]:
+    """Move the selected costings to `new_status`; returns the ids that changed."""
+    current = (await db.execute(
+        select(Costing.id, Costing.version)
+        .where(*bulk_conditions(selection), Costing.status != new_status)
+        .order_by(Costing.id)
+        .limit(BULK_MAX_ROWS + 1)
+        .with_for_update()
+    )).all()
+    _check_limit(len(current))
+    if not current:
+        return []
+
+    ids = [row.id for row in current]
+    await record_bulk_change(db, [tuple(row) for row in current], {"status": new_status}, user_id)
+    await db.execute(
+        update(Costing)
+        .where(Costing.id.in_(ids))
+        .values(status=new_status, version=next_version())
+        .execution_options(synchronize_session=False)
+    )
+    return ids
+
+
+async def delete_costings(db: AsyncSession, selection: CostingBulkFilter) -> list[int]:
+    """Delete the selected costings; returns their ids."""
+    ids = list((await db.execute(
+        select(Costing.id)
+        .where(*bulk_conditions(selection))
+        .order_by(Costing.id)
+        .limit(BULK_MAX_ROWS + 1)
+        .with_for_update()
+    )).scalars())
+    _check_limit(len(ids))
+    if not ids:
+        return []
+
+    await db.execute(
+        delete(Costing)
+        .where(Costing.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    return ids
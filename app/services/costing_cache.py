@@ -0,0 +1,91 @@
+"""
+Costing response cache
+File: app/services/costing_cache.py
+
+Serialized CostingResponse JSON, keyed by what the response depends on:
+(costing id, costing.version, costing.created_at, packaging catalog
+version). Every costing write bumps costing.version (see costing_history)
+and every packaging option write bumps the catalog version, so an entry can
+never be served for a changed costing - it just stops being looked up and
+ages out of the LRU. created_at guards against a deleted id being reused.
+
+Detail views check the key with a primary-key lookup of two columns and
+only load the costing, its packaging rows and the prices on a miss; list
+pages load packaging rows only for the costings that missed.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.models.costing import Costing
+from app.services.cache import TTLCache
+from app.services.packaging_catalog import get_catalog, catalog_for
+from app.services.pricing import costing_responses
+
+settings = get_settings()
+
+response_cache = TTLCache(
+    maxsize=settings.costing_response_cache_size,
+    ttl=settings.costing_response_cache_ttl_seconds,
+)
+
+
+def _key(costing_id: int, version: int, created_at, catalog_version: int) -> tuple:
+    return (costing_id, version, created_at, catalog_version)
+
+
+def _store(costings: Sequence[Costing], catalog) -> dict[int, bytes]:
+    bodies = {}
+    for costing, response in zip(costings, costing_responses(costings, catalog)):
+        body = response.model_dump_json().encode()
+        response_cache.set(_key(costing.id, costing.version, costing.created_at, catalog.version), body)
+        bodies[costing.id] = body
+    return bodies
+
+
+async def costing_json(db: AsyncSession, costing_id: int) -> Optional[bytes]:
+    """CostingResponse JSON for one costing; None if it does not exist."""
+    row = (await db.execute(
+        select(Costing.version, Costing.created_at).where(Costing.id == costing_id)
+    )).one_or_none()
+    if row is None:
+        return None
+    catalog = await get_catalog(db)
+    body = response_cache.get(_key(costing_id, row.version, row.created_at, catalog.version))
+    if body is not None:
+        return body
+
+    costing = (await db.execute(
+        select(Costing)
+        .where(Costing.id == costing_id)
+        .options(selectinload(Costing.costing_packaging))
+        .execution_options(populate_existing=True)
+    )).scalar_one_or_none()
+    if costing is None:
+        return None
+    return _store([costing], await catalog_for(db, [costing]))[costing_id]
+
+
+async def costing_list_json(db: AsyncSession, costings: Sequence[Costing]) -> list[bytes]:
+    """
+    CostingResponse JSON for a page of costings loaded without their
+    packaging rows, in the same order.
+    """
+    catalog = await get_catalog(db)
+    bodies = {
+        costing.id: response_cache.get(_key(costing.id, costing.version, costing.created_at, catalog.version))
+        for costing in costings
+    }
+    missed = [costing_id for costing_id, body in bodies.items() if body is None]
+    if missed:
+        loaded = (await db.execute(
+            select(Costing)
+            .where(Costing.id.in_(missed))
+            .options(selectinload(Costing.costing_packaging))
+            .execution_options(populate_existing=True)
+        )).scalars().all()
+        bodies.update(_store(loaded, await catalog_for(db, loaded)))
+    return [bodies[costing.id] for costing in costings if bodies.get(costing.id) is not None]
@@ -0,0 +1,206 @@
+"""
+Costing revision history
+File: app/services/costing_history.py
+
+Every costing write appends a CostingRevision. The edit path already has the
+before and after state in memory, so recording a revision is one INSERT of
+the changed fields - no extra reads. Every `costing_revision_checkpoint_every`
+revisions a full snapshot is stored instead, and rebuilding revision N reads
+the latest checkpoint at or before N plus the deltas after it (one query,
+at most that many rows).
+"""
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import select, insert, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.models.costing import Costing, CostingRevision
+
+settings = get_settings()
+
+REVISION_FIELDS = (
+    "project_code", "product_name", "sku_ml", "rm_per_litre", "packaging_other",
+    "packaging_cost_manual", "batch_size_kg", "gst_percent", "cc_pc", "vaince",
+    "fda", "formulation_charge", "transport", "status", "notes",
+)
+PACKAGING = "packaging"
+
+# Decimal columns -> their quantum, so "20" from a request and "20.00" from
+# the database are stored (and compared) as the same string
+_DECIMAL_FIELDS = {
+    field: Decimal(1).scaleb(-Costing.__table__.c[field].type.scale)
+    for field in REVISION_FIELDS
+    if getattr(Costing.__table__.c[field].type, "scale", None) is not None
+}
+
+
+def _json_value(field: str, value):
+    if value is None or field not in _DECIMAL_FIELDS:
+        return value
+    return str(Decimal(value).quantize(_DECIMAL_FIELDS[field]))
+
+
+def snapshot(costing, packaging_items: Iterable) -> dict[str, Any]:
+    """
+    JSON-ready state of a costing: REVISION_FIELDS plus `packaging` as a
+    sorted [[packaging_id, quantity], ...] list. Decimals are kept as strings
+    at their column's scale.
+    """
+    state = {field: _json_value(field, getattr(costing, field)) for field in REVISION_FIELDS}
+    state[PACKAGING] = sorted([item.packaging_id, item.quantity] for item in packaging_items)
+    return state
+
+
+def diff(before: dict, after: dict) -> dict:
+    """Fields of `after` that differ from `before`."""
+    return {key: value for key, value in after.items() if before.get(key) != value}
+
+
+def _is_checkpoint(revision: int) -> bool:
+    return (revision - 1) % settings.costing_revision_checkpoint_every == 0
+
+
+def _row(costing_id: int, revision: int, data: dict, full: dict, user_id: Optional[int]) -> dict:
+    checkpoint = _is_checkpoint(revision)
+    return {
+        "costing_id": costing_id,
+        "revision": revision,
+        "is_checkpoint": checkpoint,
+        "data": full if checkpoint else data,
+        "created_by_id": user_id,
+    }
+
+
+async def record_created(db: AsyncSession, costing: Costing, packaging_items: Iterable, user_id: Optional[int]) -> None:
+    """Revision 1 (a checkpoint) for a new, flushed costing. Caller commits."""
+    costing.version = 1
+    state = snapshot(costing, packaging_items)
+    await db.execute(insert(CostingRevision), [_row(costing.id, 1, state, state, user_id)])
+
+
+async def record_created_many(db: AsyncSession, states: dict[int, dict], user_id: Optional[int]) -> None:
+    """
+    Revision 1 for each new costing id -> snapshot() state, in one INSERT.
+    The costing rows must have been inserted with version=1. Caller commits.
+    """
+    if states:
+        await db.execute(
+            insert(CostingRevision),
+            [_row(costing_id, 1, state, state, user_id) for costing_id, state in states.items()],
+        )
+
+
+async def record_revision(
+    db: AsyncSession,
+    costing: Costing,
+    before: dict,
+    after: dict,
+    user_id: Optional[int],
+) -> Optional[int]:
+    """
+    Append the revision for a write that took `costing` from `before` to
+    `after` (snapshot() dicts) and bump costing.version. Returns the new
+    revision number, or None when nothing changed. Caller commits; the
+    costing row should be locked for the update.
+    """
+    changes = diff(before, after)
+    if not changes:
+        return None
+
+    rows = []
+    version = costing.version or 0
+    if version == 0:
+        # Costing predates history: keep its pre-edit state as revision 1
+        version = 1
+        rows.append(_row(costing.id, 1, before, before, user_id))
+
+    version += 1
+    rows.append(_row(costing.id, version, changes, after, user_id))
+    await db.execute(insert(CostingRevision), rows)
+    costing.version = version
+    return version
+
+
+def next_version():
+    """costing.version after one more revision, as SQL (see record_bulk_change)."""
+    return case((Costing.version == 0, 2), else_=Costing.version + 1)
+
+
+async def record_bulk_change(
+    db: AsyncSession,
+    current: Sequence[tuple[int, int]],
+    changes: dict[str, Any],
+    user_id: Optional[int],
+) -> None:
+    """
+    Revisions for one set of field `changes` applied to many costings.
+    `current` holds (costing_id, version) of rows that are locked, not yet
+    updated, and differ from `changes`. Full state is read only for the rows
+    whose new revision is a checkpoint or that predate history. Caller runs
+    the UPDATE with version=next_version() and commits.
+    """
+    changes = {field: _json_value(field, value) for field, value in changes.items()}
+    needs_state = [costing_id for costing_id, version in current if version == 0 or _is_checkpoint(version + 1)]
+    states = {}
+    if needs_state:
+        result = await db.execute(
+            select(Costing)
+            .where(Costing.id.in_(needs_state))
+            .options(selectinload(Costing.costing_packaging))
+        )
+        states = {c.id: snapshot(c, c.costing_packaging) for c in result.scalars()}
+
+    rows = []
+    for costing_id, version in current:
+        before = states.get(costing_id)
+        if version == 0:
+            version = 1
+            rows.append(_row(costing_id, 1, before, before, user_id))
+        after = {**before, **changes} if before is not None else None
+        rows.append(_row(costing_id, version + 1, changes, after, user_id))
+    if rows:
+        await db.execute(insert(CostingRevision), rows)
+
+
+async def rebuild_revision(db: AsyncSession, costing_id: int, revision: int) -> Optional[dict]:
+    """
+    State of `costing_id` at `revision`: latest checkpoint at or before it plus
+    the following deltas. Returns {"state", "steps", ...} or None if unknown.
+    """
+    checkpoint = (
+        select(func.max(CostingRevision.revision))
+        .where(
+            CostingRevision.costing_id == costing_id,
+            CostingRevision.is_checkpoint.is_(True),
+            CostingRevision.revision <= revision,
+        )
+        .scalar_subquery()
+    )
+    rows = (await db.execute(
+        select(CostingRevision)
+        .where(
+            CostingRevision.costing_id == costing_id,
+            CostingRevision.revision >= checkpoint,
+            CostingRevision.revision <= revision,
+        )
+        .order_by(CostingRevision.revision)
+    )).scalars().all()
+    if not rows or rows[-1].revision != revision:
+        return None
+
+    state = dict(rows[0].data)
+    for row in rows[1:]:
+        state.update(row.data)
+    last = rows[-1]
+    return {
+        "costing_id": costing_id,
+        "revision": revision,
+        "checkpoint": rows[0].revision,
+        "steps": len(rows) - 1,
+        "created_at": last.created_at,
+        "created_by_id": last.created_by_id,
+        "state": state,
+    }
@@ -0,0 +1,67 @@
+"""
+Costing packaging items
+File: app/services/costing_packaging.py
+
+A costing holds at most one costing_packaging row per packaging option
+(unique on costing_id, packaging_id). Edits apply only the difference
+between the stored rows and the requested list: one DELETE for removed
+options and one upsert for new and changed quantities. Unchanged rows are
+not written at all.
+"""
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.costing import CostingPackaging
+from app.schemas.costing import CostingPackagingCreate
+
+
+def merge_packaging_items(items: Iterable[CostingPackagingCreate]) -> list[CostingPackagingCreate]:
+    """
+    One item per packaging option; repeated options have their quantities
+    added up (the price is the same either way). Keeps first-seen order.
+    """
+    quantities: dict[int, int] = {}
+    for item in items:
+        quantities[item.packaging_id] = quantities.get(item.packaging_id, 0) + item.quantity
+    return [CostingPackagingCreate(packaging_id=pid, quantity=qty) for pid, qty in quantities.items()]
+
+
+async def sync_packaging_items(
+    db: AsyncSession,
+    costing_id: int,
+    existing: Sequence[CostingPackaging],
+    items: Sequence[CostingPackagingCreate],
+) -> int:
+    """
+    Make the costing's packaging rows match `items` (already merged).
+    `existing` are the currently stored rows. Returns the rows written.
+    Caller commits; the loaded costing_packaging collection is stale after.
+    """
+    stored = {cp.packaging_id: cp for cp in existing}
+    wanted = {item.packaging_id: item.quantity for item in items}
+
+    removed = [cp.id for pid, cp in stored.items() if pid not in wanted]
+    upserts = [
+        {"costing_id": costing_id, "packaging_id": pid, "quantity": quantity}
+        for pid, quantity in wanted.items()
+        if pid not in stored or stored[pid].quantity != quantity
+    ]
+
+    if removed:
+        await db.execute(
+            delete(CostingPackaging)
+            .where(CostingPackaging.id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if upserts:
+        stmt = dialect_insert(db, CostingPackaging).values(upserts)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CostingPackaging.costing_id, CostingPackaging.packaging_id],
+                set_={"quantity": stmt.excluded.quantity},
+            )
+        )
+    return len(removed) + len(upserts)
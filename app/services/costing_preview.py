@@ -0,0 +1,53 @@
+"""
+Live costing preview
+File: app/services/costing_preview.py
+
+Prices unsaved form input for the costing form as the user types. Packaging
+costs come from this worker's packaging catalog snapshot (loaded at startup
+and reloaded in the background after every change), so a preview is pure
+computation and never reads the database.
+"""
+from types import SimpleNamespace
+
+from app.schemas.costing import CostingPreviewRequest, CostingPreviewResponse, CostingResponse
+from app.services.packaging_catalog import PackagingCatalog, cached_catalog
+from app.services.pricing import INPUT_FIELDS, PRICE_FIELDS
+
+
+class CatalogNotLoaded(RuntimeError):
+    """Raised when this worker has no packaging catalog snapshot yet."""
+
+
+def preview_catalog(request: CostingPreviewRequest) -> PackagingCatalog:
+    """
+    Catalog snapshot for the request. Options it lacks (created moments ago
+    in another worker) are reported by preview_prices() and picked up by the
+    background reload cached_catalog() starts.
+    """
+    catalog = cached_catalog({item.packaging_id for item in request.packaging_items})
+    if catalog is None:
+        raise CatalogNotLoaded("Packaging catalog is loading, try again shortly")
+    return catalog
+
+
+def preview_prices(request: CostingPreviewRequest, catalog: PackagingCatalog) -> CostingPreviewResponse:
+    """
+    Every computed price field for the request, with the CostingResponse
+    properties themselves (one row: no batch setup to amortize).
+    Raises ValueError for packaging options not in the catalog.
+    """
+    unknown = sorted({item.packaging_id for item in request.packaging_items} - catalog.by_id.keys())
+    if unknown:
+        raise ValueError(f"Unknown packaging option(s): {unknown}")
+
+    costing = CostingResponse.model_construct(
+        **{field: getattr(request, field) for field in INPUT_FIELDS},
+        costing_packaging=[
+            SimpleNamespace(quantity=item.quantity, packaging=catalog.by_id[item.packaging_id])
+            for item in request.packaging_items
+        ],
+    )
+    return CostingPreviewResponse(
+        **{field: getattr(costing, field) for field in PRICE_FIELDS},
+        catalog_version=catalog.version,
+    )
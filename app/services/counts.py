@@ -0,0 +1,72 @@
+"""
+Total counts for paginated list endpoints
+File: app/services/counts.py
+
+count=exact     -> run the filtered COUNT(*) (previous behaviour)
+count=estimate  -> planner statistics for unfiltered lists, otherwise a
+                   short-lived cached exact count keyed by the filter set and
+                   invalidated when the table is written
+count=none      -> no count at all; callers derive has_more from limit+1 rows
+"""
+from typing import Literal, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+
+settings = get_settings()
+
+CountMode = Literal["exact", "estimate", "none"]
+
+count_cache = TTLCache(maxsize=1024, ttl=settings.count_cache_ttl_seconds)
+
+
+async def _planner_estimate(db: AsyncSession, table: str) -> Optional[int]:
+    """Row estimate from pg_class.reltuples (-1 or 0 until the table is analyzed)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    estimate = result.scalar()
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+
+async def count_total(
+    db: AsyncSession,
+    count_query: Select,
+    mode: CountMode,
+    table: str,
+    filters: tuple,
+) -> Optional[int]:
+    """
+    Resolve the `total` for a list page according to `mode`.
+
+    `filters` holds the filter values (None when unset) and is the cache key;
+    whether the list is filtered at all is read from count_query's WHERE
+    clause (a filter such as min_price=0 is falsy but still narrows it).
+    Returns None for count=none.
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimate":
+        key = (table, filters)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        unfiltered = count_query.whereclause is None
+        total = await _planner_estimate(db, table) if unfiltered else None
+        if total is None:
+            total = (await db.execute(count_query)).scalar()
+        count_cache.set(key, total, tags=(table,))
+        return total
+
+    return (await db.execute(count_query)).scalar()
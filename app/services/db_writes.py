@@ -0,0 +1,91 @@
+"""
+Single round-trip write helpers
+File: app/services/db_writes.py
+
+Instead of SELECT -> mutate -> COMMIT -> refresh, routes issue one
+`UPDATE ... RETURNING` / `DELETE ... RETURNING` and build the response from
+the returned row. "No row" means the id does not exist and becomes a 404.
+"""
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _not_found(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+async def update_returning(
+    db: AsyncSession,
+    model,
+    row_id: int,
+    values: dict[str, Any],
+    *,
+    detail: str,
+    previous: Iterable = (),
+) -> tuple[Any, Optional[dict]]:
+    """
+    UPDATE model SET values WHERE id = row_id RETURNING the updated object.
+
+    `previous` lists columns whose pre-update values are also needed (e.g.
+    for counter deltas). On PostgreSQL they come back from the same statement
+    via `UPDATE ... FROM (SELECT ... FOR UPDATE)`, whose FROM row holds the
+    values as they were before the update.
+
+    Returns (object, previous values or None). Caller commits.
+    """
+    previous = list(previous)
+    stmt = update(model).values(**values).execution_options(synchronize_session=False)
+
+    if previous and db.get_bind().dialect.name == "postgresql":
+        old = (
+            select(model.id, *previous)
+            .where(model.id == row_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        row = (await db.execute(
+            stmt.where(model.id == old.c.id).returning(model, *(old.c[c.key] for c in previous))
+        )).one_or_none()
+        if row is None:
+            raise _not_found(detail)
+        return row[0], {c.key: value for c, value in zip(previous, row[1:])}
+
+    before = None
+    if previous:
+        # Other dialects (SQLite in tests) return post-update values from the
+        # FROM row, so read them first; serialized writes keep this safe there.
+        old_row = (await db.execute(select(*previous).where(model.id == row_id))).one_or_none()
+        if old_row is None:
+            raise _not_found(detail)
+        before = dict(old_row._mapping)
+
+    obj = (await db.execute(stmt.where(model.id == row_id).returning(model))).scalar_one_or_none()
+    if obj is None:
+        raise _not_found(detail)
+    return obj, before
+
+
+async def delete_returning(
+    db: AsyncSession,
+    model,
+    row_id: int,
+    *,
+    detail: str,
+    returning: Iterable = (),
+):
+    """
+    DELETE FROM model WHERE id = row_id RETURNING id (+ `returning` columns).
+    Child rows go through the foreign keys' ON DELETE rules. Caller commits.
+    """
+    row = (await db.execute(
+        delete(model)
+        .where(model.id == row_id)
+        .returning(model.id, *returning)
+        .execution_options(synchronize_session=False)
+    )).one_or_none()
+    if row is None:
+        raise _not_found(detail)
+    return row
@@ -1,68 +1,163 @@
-import io
+"""
+Quotation Excel export
+File: app/services/excel_export.py
+
+The workbook is written with openpyxl's write-only (constant-memory) mode:
+lines come from a server-side cursor in fixed-size batches and are appended
+in a worker thread (rows are spooled to a temp file as they go), so a large
+export neither holds the sheet in memory nor blocks the event loop.
+
+Finished files live in the content-addressed export cache
+(app.services.export_cache) under a hash of everything the workbook shows;
+the name is recorded in quotation.exported_file, so a repeat download of an
+unchanged quotation is served straight from disk without reading its lines.
+Quotation writes (including repricing from a packaging cost change) clear
+exported_file.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from decimal import Decimal
+from typing import AsyncIterator, Optional
+
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
-from decimal import Decimal
-from app.models.quotation import Quotation
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.quotation import Quotation, QuotationLine
+from app.services.export_cache import export_cache
+
+EXPORT_BATCH_ROWS = 1000
+
+# Part of the cache key: bump when the workbook layout or styling changes
+LAYOUT_VERSION = 1
+
+HEADERS = ['Product Name', 'Unit Price (₹)', 'Quantity', 'Line Total (₹)']
+
+
+def _styled(sheet, value, **style) -> WriteOnlyCell:
+    cell = WriteOnlyCell(sheet, value=value)
+    for name, setting in style.items():
+        setattr(cell, name, setting)
+    return cell
+
+
+def _start_sheet(workbook: Workbook, project_code: str):
+    sheet = workbook.create_sheet("Quotation")
+
+    # Column widths (must be set before the first row is written)
+    sheet.column_dimensions['A'].width = 35
+    sheet.column_dimensions['B'].width = 18
+    sheet.column_dimensions['C'].width = 15
+    sheet.column_dimensions['D'].width = 18
 
-def generate_quotation_excel(quotation: Quotation) -> bytes:
-    """
-    Generate Excel file for quotation.
-    CONVERTED FROM: Django views.export_quotation_excel logic
-    """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Quotation"
-    
-    # Header styling
-    header_font = Font(bold=True, size=12, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
     # Title
-    ws.merge_cells('A1:E1')
-    ws['A1'] = f"Quotation - {quotation.project_code}"
-    ws['A1'].font = Font(bold=True, size=14)
-    ws['A1'].alignment = header_alignment
-    
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    sheet.merged_cells.add('A1:E1')
+    sheet.append([_styled(sheet, f"Quotation - {project_code}", font=Font(bold=True, size=14), alignment=header_alignment)])
+
     # Add some space
-    ws['A2'] = ""
-    
+    sheet.append([""])
+
     # Headers
-    headers = ['Product Name', 'Unit Price (₹)', 'Quantity', 'Line Total (₹)']
-    for col, header in enumerate(headers, start=1):
-        cell = ws.cell(row=3, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-    
-    # Data rows
-    row = 4
+    header_font = Font(bold=True, size=12, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    sheet.append([
+        _styled(sheet, header, font=header_font, fill=header_fill, alignment=header_alignment)
+        for header in HEADERS
+    ])
+    return sheet
+
+
+def _append_lines(sheet, batch) -> Decimal:
+    total = Decimal('0.00')
+    for product_name, unit_price, qty, line_total in batch:
+        sheet.append([product_name, float(unit_price), qty, float(line_total)])
+        total += line_total
+    return total
+
+
+def _finish_sheet(sheet, total: Decimal) -> None:
+    # Empty row, then the total row
+    sheet.append([])
+    bold = Font(bold=True)
+    sheet.append([None, None, _styled(sheet, "TOTAL:", font=bold), _styled(sheet, float(total), font=bold)])
+
+
+async def _line_batches(db: AsyncSession, quotation_id: int) -> AsyncIterator[list]:
+    result = await db.stream(
+        select(QuotationLine.product_name, QuotationLine.unit_price, QuotationLine.qty, QuotationLine.line_total)
+        .where(QuotationLine.quotation_id == quotation_id)
+        .order_by(QuotationLine.id)
+        .execution_options(yield_per=EXPORT_BATCH_ROWS)
+    )
+    async for batch in result.partitions():
+        yield batch
+
+
+async def quotation_digest(db: AsyncSession, quotation_id: int, project_code: str) -> str:
+    """Hash of everything the quotation's workbook shows."""
+    digest = hashlib.sha256(json.dumps([LAYOUT_VERSION, project_code]).encode())
+    async for batch in _line_batches(db, quotation_id):
+        digest.update("".join(
+            json.dumps([name, str(unit_price), qty, str(line_total)], ensure_ascii=False) + "\n"
+            for name, unit_price, qty, line_total in batch
+        ).encode())
+    return digest.hexdigest()
+
+
+async def write_quotation_excel(db: AsyncSession, quotation_id: int, project_code: str, path: str) -> None:
+    """
+    Write the quotation's Excel file to `path`.
+    CONVERTED FROM: Django views.export_quotation_excel logic
+    """
+    workbook = Workbook(write_only=True)
+    sheet = await asyncio.to_thread(_start_sheet, workbook, project_code)
     total = Decimal('0.00')
-    for line in quotation.lines:
-        ws.cell(row=row, column=1, value=line.product_name)
-        ws.cell(row=row, column=2, value=float(line.unit_price))
-        ws.cell(row=row, column=3, value=line.qty)
-        ws.cell(row=row, column=4, value=float(line.line_total))
-        total += line.line_total
-        row += 1
-    
-    # Add empty row
-    row += 1
-    
-    # Total row
-    ws.cell(row=row, column=3, value="TOTAL:").font = Font(bold=True)
-    ws.cell(row=row, column=4, value=float(total)).font = Font(bold=True)
-    
-    # Column widths
-    ws.column_dimensions['A'].width = 35
-    ws.column_dimensions['B'].width = 18
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 18
-    
-    # Save to bytes
-    excel_buffer = io.BytesIO()
-    wb.save(excel_buffer)
-    excel_buffer.seek(0)
-    return excel_buffer.getvalue()
+    async for batch in _line_batches(db, quotation_id):
+        total += await asyncio.to_thread(_append_lines, sheet, batch)
+    await asyncio.to_thread(_finish_sheet, sheet, total)
+    await asyncio.to_thread(workbook.save, path)
+
+
+async def quotation_export_file(
+    db: AsyncSession, quotation_id: int, project_code: str, exported_file: Optional[str]
+) -> str:
+    """
+    Path of the quotation's workbook in the export cache, generated on a
+    miss. Records the cached name in quotation.exported_file; caller commits.
+    """
+    if exported_file:
+        path = await asyncio.to_thread(export_cache.get, exported_file)
+        if path is not None:
+            return path
+
+    name = f"{await quotation_digest(db, quotation_id, project_code)}.xlsx"
+    path = await asyncio.to_thread(export_cache.get, name)
+    if path is None:
+        temp_path = await asyncio.to_thread(export_cache.temp_path, ".xlsx")
+        try:
+            await write_quotation_excel(db, quotation_id, project_code, temp_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        # Make room before adding, so the new file itself is never evicted
+        await asyncio.to_thread(export_cache.evict)
+        path = await asyncio.to_thread(export_cache.put, name, temp_path)
+
+    if name != exported_file:
+        # Only if no write cleared (or replaced) the name since it was read
+        current = (
+            Quotation.exported_file.is_(None) if exported_file is None
+            else Quotation.exported_file == exported_file
+        )
+        await db.execute(
+            update(Quotation)
+            .where(Quotation.id == quotation_id, current)
+            .values(exported_file=name)
+            .execution_options(synchronize_session=False)
+        )
+    return path
@@ -0,0 +1,95 @@
+"""
+Content-addressed file cache for generated exports
+File: app/services/export_cache.py
+
+Files are stored under a name derived from a hash of their content's
+inputs (e.g. "<sha256>.xlsx"), so identical exports share one file and a
+changed quotation simply maps to a new name. Writers produce the file in a
+temp path and `put()` moves it in atomically, so concurrent workers never
+see a partial file. Reads bump the file's mtime; `evict()` drops files not
+read within `max_age` seconds, then the least recently read ones until the
+directory fits in `max_bytes`.
+
+The directory is local to the machine; every worker on it shares the cache.
+"""
+import os
+import tempfile
+import time
+from typing import Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class ExportCache:
+    """Directory of immutable, content-addressed files bounded by size and age."""
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, os.path.basename(name))
+
+    def get(self, name: str) -> Optional[str]:
+        """Path of the cached file `name`, or None if it is not (or no longer) cached."""
+        path = self.path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def temp_path(self, suffix: str = "") -> str:
+        """New empty file in the cache directory, to be filled and then put()."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix=".tmp-", dir=self.directory)
+        os.close(fd)
+        return path
+
+    def put(self, name: str, temp_path: str) -> str:
+        """Move a finished temp_path() file in as `name`; returns its path."""
+        path = self.path(name)
+        os.replace(temp_path, path)
+        return path
+
+    def evict(self) -> int:
+        """Apply the age and size bounds; returns the number of files removed."""
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+
+        now = time.time()
+        files = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.is_file():
+                files.append((stat.st_mtime, stat.st_size, entry.path, entry.name.startswith(".tmp-")))
+
+        removed = 0
+        total = sum(size for _, size, _, _ in files)
+        # Oldest first; unfinished temp files only once they are stale
+        for mtime, size, path, is_temp in sorted(files):
+            expired = now - mtime > self.max_age
+            if not expired and (is_temp or total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+export_cache = ExportCache(
+    directory=settings.export_cache_dir or os.path.join(tempfile.gettempdir(), "quotation-exports"),
+    max_bytes=settings.export_cache_max_mb * 1024 * 1024,
+    max_age=settings.export_cache_max_age_seconds,
+)
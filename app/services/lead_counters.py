@@ -0,0 +1,138 @@
+"""
+Lead counters for /leads/stats/
+File: app/services/lead_counters.py
+
+Lead writes turn their before/after state into counter deltas and apply them
+with one UPDATE in the same transaction, so the stats read is a scan of a
+handful of rows instead of COUNT/GROUP BY over sales_lead.
+
+`reconcile_lead_counters` recomputes everything from sales_lead. It runs at
+startup, periodically from the app lifespan, on demand, and whenever a delta
+hit a counter row that did not exist yet.
+"""
+import asyncio
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import select, update, func, case, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_maker, dialect_insert
+from app.models.sales import SalesLead, SalesLeadCounter
+from app.schemas.sales import VALID_STATUSES
+
+TOTAL = "total"
+WITH_CONTACT = "with_contact"
+
+# Set when a delta could not be applied; the next stats read reconciles
+_needs_reconcile = False
+
+
+def status_key(lead_status: str) -> str:
+    return f"status:{lead_status}"
+
+
+def lead_state(lead) -> dict:
+    """The fields the counters depend on, from a model, schema or dict."""
+    get = lead.get if isinstance(lead, dict) else lambda f: getattr(lead, f, None)
+    return {"status": get("status"), "email": get("email"), "phone": get("phone")}
+
+
+def _has_contact(state: dict) -> bool:
+    return state["email"] is not None or state["phone"] is not None
+
+
+def lead_deltas(before: Optional[dict], after: Optional[dict]) -> Counter:
+    """
+    Counter deltas for a lead going from `before` to `after`
+    (lead_state() dicts; None means the lead does not exist).
+    """
+    deltas = Counter()
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        deltas[TOTAL] += sign
+        deltas[status_key(state["status"])] += sign
+        if _has_contact(state):
+            deltas[WITH_CONTACT] += sign
+    return Counter({key: d for key, d in deltas.items() if d})
+
+
+async def apply_lead_deltas(db: AsyncSession, deltas: Counter) -> None:
+    """Apply counter deltas in one UPDATE (caller commits)."""
+    global _needs_reconcile
+    if not deltas:
+        return
+    result = await db.execute(
+        update(SalesLeadCounter)
+        .where(SalesLeadCounter.key.in_(list(deltas)))
+        .values(value=SalesLeadCounter.value + case(deltas, value=SalesLeadCounter.key, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(deltas):
+        # Counter row missing (first run or unseen status) - repair on next read
+        _needs_reconcile = True
+
+
+async def read_lead_counters(db: AsyncSession) -> dict[str, int]:
+    if _needs_reconcile:
+        return await reconcile_lead_counters(db)
+    result = await db.execute(select(SalesLeadCounter.key, SalesLeadCounter.value))
+    counters = {key: value for key, value in result}
+    if not counters:
+        return await reconcile_lead_counters(db)
+    return counters
+
+
+async def reconcile_lead_counters(db: AsyncSession) -> dict[str, int]:
+    """
+    Recompute all counters from sales_lead and overwrite drifted values.
+    Commits; returns the corrected counters.
+    """
+    global _needs_reconcile
+    _needs_reconcile = False
+
+    # Lock the counter rows first: concurrent writers block on their delta
+    # UPDATE until we commit, and everything committed before is visible to
+    # the aggregate below, so no delta is lost or counted twice.
+    await db.execute(select(SalesLeadCounter.key).with_for_update())
+
+    result = await db.execute(
+        select(
+            SalesLead.status,
+            func.count(SalesLead.id),
+            func.count(case((or_(SalesLead.email.isnot(None), SalesLead.phone.isnot(None)), 1))),
+        ).group_by(SalesLead.status)
+    )
+    counters = {TOTAL: 0, WITH_CONTACT: 0}
+    counters.update({status_key(s): 0 for s in VALID_STATUSES})
+    for lead_status, total, with_contact in result:
+        counters[status_key(lead_status)] = total
+        counters[TOTAL] += total
+        counters[WITH_CONTACT] += with_contact
+
+    stmt = dialect_insert(db, SalesLeadCounter).values(
+        [{"key": key, "value": value} for key, value in counters.items()]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SalesLeadCounter.key],
+            set_={"value": stmt.excluded.value, "updated_at": func.now()},
+            where=SalesLeadCounter.value != stmt.excluded.value,
+        )
+    )
+    await db.commit()
+    return counters
+
+
+async def reconcile_periodically(interval_seconds: int) -> None:
+    """Background task started from the app lifespan."""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await reconcile_lead_counters(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Lead counter reconcile failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,219 @@
+"""
+Bulk lead import (CSV / XLSX)
+File: app/services/lead_import.py
+
+The upload is read row by row (csv module / openpyxl read-only mode) and
+handled in fixed-size chunks: parse + validate in a worker thread, drop
+duplicates, then load the valid rows with COPY on PostgreSQL (multi-row
+INSERT elsewhere). Only one chunk and a capped error report are held in
+memory, however large the file is; the upload itself is spooled to disk.
+
+Everything runs in one transaction (COPY included), so earlier chunks are
+visible to the duplicate check of later ones and a failing chunk leaves
+nothing behind.
+"""
+import asyncio
+import csv
+import io
+import zipfile
+from collections import Counter
+from itertools import islice
+from typing import IO, Iterator, Literal
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import ValidationError
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sales import SalesLead
+from app.schemas.sales import SalesLeadCreate
+from app.services.lead_counters import lead_state, lead_deltas, apply_lead_deltas
+
+DedupMode = Literal["none", "email", "company"]
+
+IMPORT_CHUNK_ROWS = 1000
+MAX_REPORTED_ERRORS = 1000
+
+LEAD_FIELDS = list(SalesLeadCreate.model_fields)
+
+# Column lengths (None for Text): SalesLeadCreate does not bound them, and
+# one over-long cell would fail the whole COPY / INSERT of its chunk
+LEAD_FIELD_LENGTHS = {field: SalesLead.__table__.c[field].type.length for field in LEAD_FIELDS}
+
+# What a malformed upload raises while being read (a truncated or non-zip
+# .xlsx included); these become ImportFormatError (400), not a 500
+UNREADABLE_FILE_ERRORS = (
+    UnicodeDecodeError, csv.Error, OSError, KeyError, zipfile.BadZipFile, InvalidFileException,
+)
+
+
+class ImportFormatError(ValueError):
+    """Raised when the uploaded file cannot be read as CSV or XLSX."""
+
+
+def _normalize_header(header) -> str:
+    return str(header or "").strip().lower().replace(" ", "_")
+
+
+def _iter_csv(fileobj: IO[bytes]) -> Iterator[dict]:
+    reader = csv.reader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    headers = [_normalize_header(h) for h in next(reader, [])]
+    for values in reader:
+        yield dict(zip(headers, values))
+
+
+def _iter_xlsx(fileobj: IO[bytes]) -> Iterator[dict]:
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def iter_upload_rows(fileobj: IO[bytes], filename: str) -> Iterator[dict]:
+    """Yield one dict per data row, keyed by normalized header."""
+    name = (filename or "").lower()
+    if name.endswith(".xlsx"):
+        return _iter_xlsx(fileobj)
+    if name.endswith(".csv") or "." not in name:
+        return _iter_csv(fileobj)
+    raise ImportFormatError("Unsupported file type. Upload a .csv or .xlsx file")
+
+
+def _clean(raw: dict) -> dict:
+    """Keep known lead fields; blank cells become None, numbers become text."""
+    data = {}
+    for field in LEAD_FIELDS:
+        value = raw.get(field)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            data[field] = value
+    return data
+
+
+def _validate_chunk(rows: list[tuple[int, dict]]) -> tuple[list[tuple[int, dict]], list[dict]]:
+    """SalesLeadCreate rules plus the column lengths; invalid rows go to the report."""
+    valid, errors = [], []
+    for row_number, raw in rows:
+        if not any(v not in (None, "") for v in raw.values()):
+            continue  # blank line
+        try:
+            lead = SalesLeadCreate.model_validate(_clean(raw))
+        except ValidationError as e:
+            errors.append({
+                "row": row_number,
+                "errors": [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()],
+            })
+            continue
+        data = lead.model_dump()
+        too_long = [
+            f"{field}: String should have at most {length} characters"
+            for field, length in LEAD_FIELD_LENGTHS.items()
+            if length is not None and data[field] is not None and len(data[field]) > length
+        ]
+        if too_long:
+            errors.append({"row": row_number, "errors": too_long})
+            continue
+        valid.append((row_number, data))
+    return valid, errors
+
+
+def _next_chunk(rows: Iterator[tuple[int, dict]]) -> tuple[int, list[tuple[int, dict]], list[dict]]:
+    chunk = list(islice(rows, IMPORT_CHUNK_ROWS))
+    return len(chunk), *_validate_chunk(chunk)
+
+
+def _dedup_key(lead: dict, dedup: DedupMode):
+    value = lead.get("email") if dedup == "email" else lead.get("company_name")
+    return value.strip().lower() if value else None
+
+
+async def _existing_keys(db: AsyncSession, keys: set, dedup: DedupMode) -> set:
+    if not keys:
+        return set()
+    column = func.lower(SalesLead.email if dedup == "email" else SalesLead.company_name)
+    result = await db.execute(select(column).where(column.in_(keys)))
+    return set(result.scalars())
+
+
+async def _load_rows(db: AsyncSession, leads: list[dict]) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # COPY straight into sales_lead on the session's own connection/transaction
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        if not raw.driver_connection.is_in_transaction():
+            # The asyncpg adapter only BEGINs on the first statement it runs
+            # itself; without one, each COPY would commit on its own
+            await connection.exec_driver_sql("SELECT 1")
+        await raw.driver_connection.copy_records_to_table(
+            SalesLead.__tablename__,
+            records=[tuple(lead[f] for f in LEAD_FIELDS) for lead in leads],
+            columns=LEAD_FIELDS,
+        )
+    else:
+        await db.execute(insert(SalesLead), leads)
+
+
+async def import_leads(
+    db: AsyncSession,
+    fileobj: IO[bytes],
+    filename: str,
+    dedup: DedupMode = "none",
+) -> dict:
+    """Import an uploaded CSV/XLSX file. Commits on success."""
+    rows = enumerate(iter_upload_rows(fileobj, filename), start=2)  # row 1 is the header
+    report = {
+        "total_rows": 0,
+        "imported": 0,
+        "skipped_duplicates": 0,
+        "failed": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+    deltas = Counter()
+
+    while True:
+        try:
+            consumed, valid, errors = await asyncio.to_thread(_next_chunk, rows)
+        except UNREADABLE_FILE_ERRORS as e:
+            raise ImportFormatError(f"Could not read file: {e}")
+        if not consumed:
+            break
+
+        report["total_rows"] += len(valid) + len(errors)
+        report["failed"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(report["errors"])
+        report["errors"].extend(errors[:room])
+        report["errors_truncated"] |= len(errors) > room
+
+        if dedup != "none":
+            existing = await _existing_keys(
+                db, {k for _, lead in valid if (k := _dedup_key(lead, dedup))}, dedup
+            )
+            kept = []
+            for row_number, lead in valid:
+                key = _dedup_key(lead, dedup)
+                if key is not None and key in existing:
+                    report["skipped_duplicates"] += 1
+                    continue
+                if key is not None:
+                    existing.add(key)  # duplicates within the file itself
+                kept.append((row_number, lead))
+            valid = kept
+
+        leads = [lead for _, lead in valid]
+        if leads:
+            await _load_rows(db, leads)
+            report["imported"] += len(leads)
+            for lead in leads:
+                deltas.update(lead_deltas(None, lead_state(lead)))
+
+    await apply_lead_deltas(db, deltas)
+    await db.commit()
+    return report
@@ -0,0 +1,74 @@
+"""
+Lead search backends
+File: app/services/lead_search.py
+
+`search` on /leads/ matches company_name, owner, email, segment and notes.
+
+- TrigramLeadSearch (PostgreSQL): the ILIKE '%term%' predicates are served by
+  the pg_trgm GIN indexes declared on SalesLead (one per column, combined
+  with a BitmapOr), and relevance is the best weighted word_similarity().
+- LikeLeadSearch (any other dialect, e.g. SQLite in tests): same predicates
+  without index support, relevance from weighted prefix/substring matches.
+"""
+from abc import ABC, abstractmethod
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sales import SalesLead
+
+# (column, weight) - a hit on company_name outranks a hit buried in notes
+SEARCH_COLUMNS = (
+    (SalesLead.company_name, 1.0),
+    (SalesLead.owner, 0.8),
+    (SalesLead.email, 0.7),
+    (SalesLead.segment, 0.5),
+    (SalesLead.notes, 0.3),
+)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class LeadSearchBackend(ABC):
+    """Builds the WHERE condition and relevance expression for a search term."""
+
+    def condition(self, term: str):
+        pattern = f"%{_escape_like(term)}%"
+        return or_(*(column.ilike(pattern, escape="\\") for column, _ in SEARCH_COLUMNS))
+
+    @abstractmethod
+    def rank(self, term: str):
+        """Relevance expression for `term` (higher is a better match)."""
+
+
+class TrigramLeadSearch(LeadSearchBackend):
+    """PostgreSQL + pg_trgm."""
+
+    def rank(self, term: str):
+        return func.greatest(*(
+            func.word_similarity(term, func.coalesce(column, "")) * weight
+            for column, weight in SEARCH_COLUMNS
+        ))
+
+
+class LikeLeadSearch(LeadSearchBackend):
+    """Portable fallback used when pg_trgm is not available."""
+
+    def rank(self, term: str):
+        escaped = _escape_like(term)
+        score = literal(0.0)
+        for column, weight in SEARCH_COLUMNS:
+            score = score + case(
+                (column.ilike(f"{escaped}%", escape="\\"), weight * 2),
+                (column.ilike(f"%{escaped}%", escape="\\"), weight),
+                else_=0.0,
+            )
+        return score
+
+
+def get_search_backend(db: AsyncSession) -> LeadSearchBackend:
+    if db.get_bind().dialect.name == "postgresql":
+        return TrigramLeadSearch()
+    return LikeLeadSearch()
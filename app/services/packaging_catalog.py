@@ -0,0 +1,234 @@
+"""
+Process-wide packaging catalog
+File: app/services/packaging_catalog.py
+
+packaging_option is small and rarely written, so each worker keeps the whole
+table in memory as an immutable, versioned snapshot. /packaging/ serves it
+directly and costing responses take `packaging` from it instead of joining.
+
+Invalidation:
+- writers call bump_catalog_version() inside their transaction (version row
+  in cache_version + pg_notify, delivered on commit) and invalidate_catalog()
+  after commit for their own worker;
+- other workers LISTEN on the channel (listen_for_invalidations) and
+  invalidate their snapshot when a notification arrives;
+- as a fallback (listener reconnecting, non-PostgreSQL) get_catalog()
+  compares the stored version at most every packaging_catalog_check_seconds.
+
+The snapshot is loaded at startup and an invalidation reloads it in the
+background (refresh_catalog) instead of dropping it, so readers that must
+not touch the database (the live preview, via cached_catalog) always have
+one; get_catalog() still checks the version of an invalidated snapshot
+before serving it.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import asyncpg
+from sqlalchemy import select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session_maker, dialect_insert
+from app.models.cache import CacheVersion
+from app.models.costing import PackagingOption
+from app.schemas.costing import CostingResponse, PackagingOptionResponse
+
+settings = get_settings()
+
+CATALOG_NAME = "packaging"
+NOTIFY_CHANNEL = "cache_version"
+
+
+@dataclass(frozen=True)
+class PackagingCatalog:
+    """Immutable snapshot of packaging_option at `version`."""
+    version: int
+    options: tuple[PackagingOptionResponse, ...]   # ordered by name
+    by_id: dict[int, PackagingOptionResponse]
+
+    def costing_response(self, costing) -> CostingResponse:
+        """
+        CostingResponse for a Costing whose `costing_packaging` rows are
+        loaded (without their `packaging` relationship).
+        """
+        data = {field: getattr(costing, field) for field in CostingResponse.model_fields}
+        data["costing_packaging"] = [
+            {
+                "id": cp.id,
+                "packaging_id": cp.packaging_id,
+                "quantity": cp.quantity,
+                "packaging": self.by_id[cp.packaging_id],
+            }
+            for cp in costing.costing_packaging
+        ]
+        return CostingResponse.model_validate(data)
+
+
+_catalog: Optional[PackagingCatalog] = None
+_checked_at = 0.0
+_invalidations = 0
+_reload_lock = asyncio.Lock()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def _stored_version(db: AsyncSession) -> int:
+    result = await db.execute(select(CacheVersion.version).where(CacheVersion.name == CATALOG_NAME))
+    return result.scalar() or 0
+
+
+async def load_catalog(db: AsyncSession) -> PackagingCatalog:
+    """Read packaging_option into a fresh snapshot and make it current."""
+    global _catalog, _checked_at
+    invalidations = _invalidations
+    # Version first: a write committing in between only causes one more reload
+    version = await _stored_version(db)
+    result = await db.execute(
+        select(PackagingOption.id, PackagingOption.name, PackagingOption.cost).order_by(PackagingOption.name)
+    )
+    options = tuple(
+        PackagingOptionResponse(id=row.id, name=row.name, cost=row.cost) for row in result
+    )
+    catalog = PackagingCatalog(version=version, options=options, by_id={o.id: o for o in options})
+    _catalog = catalog
+    # Invalidated while loading: keep the snapshot, but verify its version next time
+    _checked_at = time.monotonic() if invalidations == _invalidations else 0.0
+    return catalog
+
+
+async def get_catalog(db: AsyncSession, packaging_ids: Iterable[int] = ()) -> PackagingCatalog:
+    """
+    Current catalog snapshot. Reloads when it was invalidated, when the
+    periodic version check finds a newer version, or when one of
+    `packaging_ids` is unknown (created in another worker moments ago).
+    """
+    global _checked_at
+    catalog = _catalog
+    due = time.monotonic() - _checked_at > settings.packaging_catalog_check_seconds
+    missing = catalog is not None and any(pid not in catalog.by_id for pid in packaging_ids)
+    if catalog is not None and not due and not missing:
+        return catalog
+
+    async with _reload_lock:
+        if not missing and _catalog is not catalog and _catalog is not None:
+            return _catalog  # reloaded by another request while we waited
+        if catalog is not None and not missing:
+            _checked_at = time.monotonic()
+            if await _stored_version(db) == catalog.version:
+                return catalog
+        return await load_catalog(db)
+
+
+def cached_catalog(packaging_ids: Iterable[int] = ()) -> Optional[PackagingCatalog]:
+    """
+    This worker's snapshot without touching the database (no version
+    check); None before the first load. When there is none, or it lacks one
+    of `packaging_ids` (created moments ago in another worker), a background
+    reload is started for the next call.
+    """
+    catalog = _catalog
+    if catalog is None or any(pid not in catalog.by_id for pid in packaging_ids):
+        refresh_in_background()
+    return catalog
+
+
+async def catalog_for(db: AsyncSession, costings: Iterable) -> PackagingCatalog:
+    """Catalog that covers every packaging referenced by `costings`."""
+    return await get_catalog(
+        db, {cp.packaging_id for costing in costings for cp in costing.costing_packaging}
+    )
+
+
+def invalidate_catalog() -> None:
+    """
+    Mark this worker's snapshot stale: get_catalog() checks its version
+    before serving it again, and a background reload replaces it.
+    """
+    global _checked_at, _invalidations
+    _checked_at = 0.0
+    _invalidations += 1
+    refresh_in_background()
+
+
+async def refresh_catalog() -> None:
+    """
+    Reload the snapshot on a session of its own (startup, invalidations),
+    again if it was invalidated meanwhile. Failures are logged; get_catalog()
+    still reloads on demand.
+    """
+    try:
+        while True:
+            invalidations = _invalidations
+            async with _reload_lock, async_session_maker() as session:
+                await load_catalog(session)
+            if invalidations == _invalidations:
+                return
+    except Exception as e:
+        print(f"⚠️ Packaging catalog reload failed: {e}")
+
+
+def refresh_in_background() -> None:
+    """Start refresh_catalog() unless one is already running (it re-checks invalidations)."""
+    global _refresh_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # no event loop: get_catalog() reloads on demand
+    if _refresh_task is None or _refresh_task.done() or _refresh_task.get_loop() is not loop:
+        _refresh_task = loop.create_task(refresh_catalog())
+
+
+async def bump_catalog_version(db: AsyncSession) -> None:
+    """
+    Record a packaging_option change in the current transaction and notify
+    the other workers (PostgreSQL delivers NOTIFY on commit). Caller commits,
+    then calls invalidate_catalog().
+    """
+    stmt = dialect_insert(db, CacheVersion).values(name=CATALOG_NAME, version=1)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CacheVersion.name],
+            set_={"version": CacheVersion.version + 1, "updated_at": func.now()},
+        )
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_notify(NOTIFY_CHANNEL, CATALOG_NAME)))
+
+
+def _on_notify(connection, pid, channel, payload) -> None:
+    if payload == CATALOG_NAME:
+        invalidate_catalog()
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Background task started from the app lifespan: LISTEN for catalog
+    changes made by other workers. Uses its own connection, preferably to
+    database_url_direct - LISTEN needs a session that a transaction-mode
+    pooler (Neon's pooled endpoint) does not keep.
+    """
+    url = make_url(settings.database_url_direct or settings.database_url)
+    if not url.drivername.startswith("postgresql"):
+        return
+    dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn, ssl=True)
+            await connection.add_listener(NOTIFY_CHANNEL, _on_notify)
+            invalidate_catalog()  # changes may have been missed while disconnected
+            while True:
+                await asyncio.sleep(settings.packaging_catalog_check_seconds)
+                await connection.execute("SELECT 1")  # keepalive; raises once the link is gone
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Packaging catalog listener failed: {e}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(5)
@@ -0,0 +1,109 @@
+"""
+Packaging cost changes and their impact
+File: app/services/packaging_impact.py
+
+Changing a packaging option's cost reprices every costing that uses it. The
+affected costings come from the packaging_id index on costing_packaging
+(reverse lookup packaging -> costings); their stored prices are recomputed
+in the same transaction and compared with the values before the change.
+Optionally the quotation lines built from those costings are refreshed with
+one set-based UPDATE ... FROM costing, which also forgets their cached
+Excel exports (quotation.exported_file).
+"""
+from decimal import Decimal
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.costing import Costing, PackagingOption
+from app.models.quotation import Quotation, QuotationLine
+from app.schemas.costing import PackagingOptionResponse
+from app.services.db_writes import update_returning
+from app.services.pricing import costings_using_packaging, refresh_stored_prices
+
+
+async def _stored_prices(db: AsyncSession, affected) -> dict[int, tuple]:
+    result = await db.execute(
+        select(Costing.id, Costing.project_code, Costing.product_name, Costing.status, Costing.final_unit_price)
+        .where(affected)
+    )
+    return {row.id: row for row in result}
+
+
+async def change_packaging_cost(
+    db: AsyncSession,
+    packaging_id: int,
+    cost: Decimal,
+    refresh_quotations: bool = False,
+) -> dict:
+    """
+    Set PackagingOption.cost and reprice the costings using it.
+    Returns the impact report; caller commits (or rolls back for a dry run).
+    """
+    affected = costings_using_packaging([packaging_id])
+    before = await _stored_prices(db, affected)
+
+    packaging, previous = await update_returning(
+        db, PackagingOption, packaging_id, {"cost": cost},
+        detail=f"Packaging option with ID {packaging_id} not found",
+        previous=[PackagingOption.cost],
+    )
+    await refresh_stored_prices(db, affected)
+    after = await _stored_prices(db, affected)
+
+    changes = []
+    for costing_id, row in after.items():
+        old_price = before[costing_id].final_unit_price if costing_id in before else None
+        old_price = old_price if old_price is not None else row.final_unit_price
+        changes.append({
+            "id": costing_id,
+            "project_code": row.project_code,
+            "product_name": row.product_name,
+            "status": row.status,
+            "old_final_unit_price": old_price,
+            "new_final_unit_price": row.final_unit_price,
+            "delta": row.final_unit_price - old_price,
+        })
+    changes.sort(key=lambda c: (-abs(c["delta"]), c["id"]))
+
+    quotations = (await db.execute(
+        select(QuotationLine.quotation_id.distinct())
+        .where(QuotationLine.costing_id.in_(select(Costing.id).where(affected)))
+        .order_by(QuotationLine.quotation_id)
+    )).scalars().all()
+
+    lines_updated = None
+    if refresh_quotations:
+        result = await db.execute(
+            update(QuotationLine)
+            .where(
+                QuotationLine.costing_id == Costing.id,
+                affected,
+                QuotationLine.unit_price != Costing.final_unit_price,
+            )
+            .values(
+                unit_price=Costing.final_unit_price,
+                line_total=Costing.final_unit_price * QuotationLine.qty,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        lines_updated = result.rowcount
+        if lines_updated and quotations:
+            await db.execute(
+                update(Quotation)
+                .where(Quotation.id.in_(quotations))
+                .values(exported_file=None)
+                .execution_options(synchronize_session=False)
+            )
+
+    return {
+        # Plain schema: a dry run rolls back, which expires the ORM object
+        "packaging": PackagingOptionResponse.model_validate(packaging),
+        "old_cost": previous["cost"],
+        "new_cost": packaging.cost,
+        "affected_costings": len(changes),
+        "total_delta": sum((c["delta"] for c in changes), Decimal("0.00")),
+        "affected_quotations": list(quotations),
+        "quotation_lines_updated": lines_updated,
+        "costings": changes,
+    }
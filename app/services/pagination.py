@@ -0,0 +1,110 @@
+"""
+Keyset (cursor) pagination helpers
+File: app/services/pagination.py
+
+A cursor is an opaque url-safe token holding the sort key plus the
+(sort value, id) of the last row that was returned. The next page is then a
+range scan `WHERE (col, id) < (:value, :id)` on an index instead of an
+OFFSET that has to walk and discard every skipped row.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.dialects import sqlite
+
+
+# SQLite keeps DateTime as text and compares it as text; server_default now()
+# (CURRENT_TIMESTAMP) writes "YYYY-MM-DD HH:MM:SS", so cursor values are bound
+# in that form rather than SQLAlchemy's default one with microseconds
+_SQLITE_TIMESTAMP = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor or sort key cannot be used for the request."""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    name: str          # public name, e.g. "-created_at"
+    column: Any        # column / SQL expression to order by
+    descending: bool
+
+
+def resolve_sort(sort: str, allowed: dict[str, Any]) -> SortKey:
+    """
+    Resolve a `sort` query value ("field" or "-field") against a whitelist.
+    Only index-backed columns should be listed in `allowed`.
+    """
+    descending = sort.startswith("-")
+    field = sort[1:] if descending else sort
+    if field not in allowed:
+        options = ", ".join(sorted(allowed))
+        raise InvalidCursor(f"Invalid sort '{sort}'. Must be one of: {options} (prefix with '-' for descending)")
+    return SortKey(name=sort, column=allowed[field], descending=descending)
+
+
+def order_by_clause(sort_key: SortKey, id_column) -> list:
+    """ORDER BY for a sort key, with id as a unique tiebreaker."""
+    if sort_key.descending:
+        return [sort_key.column.desc(), id_column.desc()]
+    return [sort_key.column.asc(), id_column.asc()]
+
+
+def keyset_filter(sort_key: SortKey, id_column, value, last_id: int):
+    """Row-value comparison that continues after (value, last_id)."""
+    row = tuple_(sort_key.column, id_column)
+    # Bound through the column's type, so the value compares like the stored ones
+    value_type = sort_key.column.type
+    if isinstance(value_type, DateTime):
+        value_type = value_type.with_variant(_SQLITE_TIMESTAMP, "sqlite")
+    after = tuple_(literal(value, value_type), last_id)
+    if sort_key.descending:
+        return row < after
+    return row > after
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(sort_key: SortKey, value, last_id: int) -> str:
+    """Build the opaque cursor pointing just after (value, last_id)."""
+    payload = json.dumps(
+        {"s": sort_key.name, "v": _encode_value(value), "i": last_id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: SortKey) -> tuple[Any, int]:
+    """Return (value, last_id) from a cursor issued for the same sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_key.name:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        return _decode_value(payload["v"]), int(payload["i"])
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
@@ -0,0 +1,399 @@
+"""
+Batch pricing engine for costings
+File: app/services/pricing.py
+
+Computes the CostingResponse price fields (total_packaging_cost,
+rm_cost_per_unit, unit_cost_before_gst, gst_amount_per_unit,
+final_unit_price, moq) for a whole batch at once.
+
+Inputs are converted to exact fixed-point integers (money in paise,
+rm_per_litre in 1/10000, sku_ml in 1/1000 ml) and every quantize step is an
+integer division rounded half-to-even, which is what Decimal.quantize does
+under the default context. Results are identical to the Decimal properties
+on CostingResponse. Rows whose values are not exact at those scales, or are
+big enough to overflow int64, are priced with the CostingResponse properties
+themselves.
+
+unit_cost_before_gst, final_unit_price and moq are also stored on the costing
+row (indexed, for filtering/sorting lists); refresh_stored_prices() recomputes
+them and must run in every transaction that changes a costing, its packaging
+items or a packaging option's cost.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session_maker
+from app.models.costing import Costing, CostingPackaging, PackagingOption
+from app.schemas.costing import CostingResponse
+
+PRICE_FIELDS = (
+    "total_packaging_cost",
+    "rm_cost_per_unit",
+    "unit_cost_before_gst",
+    "gst_amount_per_unit",
+    "final_unit_price",
+    "moq",
+)
+
+OVERHEAD_FIELDS = ("cc_pc", "vaince", "fda", "formulation_charge", "transport")
+
+# field -> (decimal places kept as integer, largest allowed scaled magnitude).
+# The bounds keep every intermediate product below 2**63.
+FIELD_SCALES = {
+    "sku_ml": (3, 10**9),
+    "rm_per_litre": (4, 10**9),
+    "packaging_cost_manual": (2, 10**11),
+    "batch_size_kg": (2, 10**13),
+    "gst_percent": (2, 10**5),
+    "cc_pc": (2, 10**11),
+    "vaince": (2, 10**11),
+    "fda": (2, 10**11),
+    "formulation_charge": (2, 10**11),
+    "transport": (2, 10**11),
+}
+PACKAGING_COST_SCALE = (2, 10**11)
+MAX_QUANTITY = 10**4
+MAX_PACKAGING_TOTAL = 10**13
+
+INPUT_FIELDS = tuple(FIELD_SCALES)
+
+STORED_PRICE_FIELDS = ("unit_cost_before_gst", "final_unit_price", "moq")
+REFRESH_BATCH_ROWS = 1000
+
+
+def to_fixed(values: Iterable, places: int, limit: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert Decimals to integers scaled by 10**places.
+    Returns (ints, missing, exact): missing marks None, exact is False where
+    the value has more decimal places than `places` or exceeds `limit`.
+    """
+    values = list(values)
+    n = len(values)
+    ints = np.zeros(n, dtype=np.int64)
+    missing = np.zeros(n, dtype=bool)
+    exact = np.ones(n, dtype=bool)
+    seen = {}  # overheads, GST etc. repeat a lot across rows
+    for i, value in enumerate(values):
+        if value is None:
+            missing[i] = True
+            continue
+        scaled = seen.get(value)
+        if scaled is None:
+            d = value if isinstance(value, Decimal) else Decimal(value)
+            if d.is_finite():
+                scaled = d.scaleb(places)
+                if scaled == scaled.to_integral_value() and abs(scaled) <= limit:
+                    scaled = int(scaled)
+                else:
+                    scaled = False
+            else:
+                scaled = False
+            seen[value] = scaled
+        if scaled is False:
+            exact[i] = False
+        else:
+            ints[i] = scaled
+    return ints, missing, exact
+
+
+def div_half_even(n: np.ndarray, d: int) -> np.ndarray:
+    """Integer n / d rounded half to even (d > 0)."""
+    q, r = np.divmod(n, d)
+    twice = 2 * r
+    return q + ((twice > d) | ((twice == d) & (q % 2 == 1)))
+
+
+def _div_trunc(n: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """Integer n / d truncated toward zero, like Decimal `//` (d != 0)."""
+    return np.sign(n) * np.sign(d) * (np.abs(n) // np.abs(d))
+
+
+@dataclass
+class FixedInputs:
+    """Fixed-point inputs for N costings (see FIELD_SCALES for scales)."""
+    sku_ml: np.ndarray
+    sku_missing: np.ndarray
+    rm_per_litre: np.ndarray
+    rm_missing: np.ndarray
+    batch_size_kg: np.ndarray
+    batch_missing: np.ndarray
+    gst_percent: np.ndarray
+    packaging_total: np.ndarray   # paise: sum(cost * qty) + manual
+    overheads: np.ndarray         # paise: cc_pc + vaince + fda + formulation + transport
+
+
+@dataclass
+class PriceArrays:
+    """Engine output: money fields in paise, moq in units."""
+    total_packaging_cost: np.ndarray
+    rm_cost_per_unit: np.ndarray
+    unit_cost_before_gst: np.ndarray
+    gst_amount_per_unit: np.ndarray
+    final_unit_price: np.ndarray
+    moq: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.moq)
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Price fields of row i as Decimals (2 places) / int, like CostingResponse."""
+        return {
+            "total_packaging_cost": paise_to_decimal(self.total_packaging_cost[i]),
+            "rm_cost_per_unit": paise_to_decimal(self.rm_cost_per_unit[i]),
+            "unit_cost_before_gst": paise_to_decimal(self.unit_cost_before_gst[i]),
+            "gst_amount_per_unit": paise_to_decimal(self.gst_amount_per_unit[i]),
+            "final_unit_price": paise_to_decimal(self.final_unit_price[i]),
+            "moq": int(self.moq[i]),
+        }
+
+    def rows(self) -> list[dict[str, Any]]:
+        return [self.row(i) for i in range(len(self))]
+
+
+def paise_to_decimal(paise) -> Decimal:
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def decimal_to_paise(value: Decimal) -> int:
+    return int(Decimal(value).scaleb(2))
+
+
+def compute_fixed(inputs: FixedInputs) -> PriceArrays:
+    """The vectorized CostingResponse rules."""
+    # rm_cost_per_unit = rm_per_litre * sku_ml / 1000  (scales 10^4 * 10^3 -> paise: / 10^8)
+    rm_missing = inputs.rm_missing | inputs.sku_missing
+    rm_cost = np.where(rm_missing, 0, div_half_even(inputs.rm_per_litre * inputs.sku_ml, 10**8))
+
+    unit_cost = rm_cost + inputs.packaging_total + inputs.overheads
+
+    # gst_amount = unit_cost * gst_percent / 100  (gst scale 10^2 -> / 10^4)
+    gst_amount = div_half_even(unit_cost * inputs.gst_percent, 10**4)
+
+    # moq = batch_size_kg * 1000 // sku_ml  (scales 10^2 / 10^3 -> * 10^4)
+    no_moq = inputs.sku_missing | (inputs.sku_ml == 0) | inputs.batch_missing
+    safe_sku = np.where(no_moq, 1, inputs.sku_ml)
+    moq = np.where(no_moq, 0, _div_trunc(inputs.batch_size_kg * 10**4, safe_sku))
+
+    return PriceArrays(
+        total_packaging_cost=inputs.packaging_total,
+        rm_cost_per_unit=rm_cost,
+        unit_cost_before_gst=unit_cost,
+        gst_amount_per_unit=gst_amount,
+        final_unit_price=unit_cost + gst_amount,
+        moq=moq,
+    )
+
+
+def _get(obj, field):
+    return obj.get(field) if isinstance(obj, dict) else getattr(obj, field, None)
+
+
+@dataclass
+class FixedColumns:
+    """
+    Per-field fixed-point arrays for N costings plus their flattened packaging
+    items. Callers may adjust them (e.g. what-if overrides) before assemble().
+    """
+    values: dict[str, np.ndarray]    # field -> scaled ints (see FIELD_SCALES)
+    missing: dict[str, np.ndarray]   # field -> True where the value is None
+    item_owner: np.ndarray           # row index of each packaging item
+    item_cost: np.ndarray            # packaging cost in paise
+    item_qty: np.ndarray             # quantity (None / 0 count as 1)
+    exact: np.ndarray                # False: row must be priced with Decimals
+
+    def assemble(self) -> tuple[FixedInputs, np.ndarray]:
+        """FixedInputs for compute_fixed() and the final per-row exact mask."""
+        v, m = self.values, self.missing
+        # total_packaging_cost = sum(cost * (quantity or 1)) + manual
+        packaging_total = v["packaging_cost_manual"].copy()
+        np.add.at(packaging_total, self.item_owner, self.item_cost * self.item_qty)
+        exact = self.exact & (np.abs(packaging_total) <= MAX_PACKAGING_TOTAL)
+        return FixedInputs(
+            sku_ml=v["sku_ml"],
+            sku_missing=m["sku_ml"],
+            rm_per_litre=v["rm_per_litre"],
+            rm_missing=m["rm_per_litre"],
+            batch_size_kg=v["batch_size_kg"],
+            batch_missing=m["batch_size_kg"],
+            gst_percent=v["gst_percent"],
+            packaging_total=packaging_total,
+            overheads=sum(v[f] for f in OVERHEAD_FIELDS),
+        ), exact
+
+
+def fixed_columns(
+    rows: Sequence,
+    items: Sequence[tuple[int, Any, Any]] = (),
+) -> FixedColumns:
+    """
+    Fixed-point columns from costing-like rows (objects or dicts with the
+    CostingBase numeric fields) and flattened packaging items
+    (row index, packaging cost, quantity).
+    """
+    n = len(rows)
+    values, missing = {}, {}
+    exact = np.ones(n, dtype=bool)
+    for field, (places, limit) in FIELD_SCALES.items():
+        values[field], missing[field], field_exact = to_fixed((_get(r, field) for r in rows), places, limit)
+        exact &= field_exact
+
+    owner = np.fromiter((i for i, _, _ in items), dtype=np.int64, count=len(items))
+    costs, _, cost_exact = to_fixed((cost for _, cost, _ in items), *PACKAGING_COST_SCALE)
+    qty = np.fromiter((q or 1 for _, _, q in items), dtype=np.int64, count=len(items))
+    bad_qty = np.abs(qty) > MAX_QUANTITY
+    exact[owner[~cost_exact | bad_qty]] = False
+
+    return FixedColumns(
+        values=values,
+        missing=missing,
+        item_owner=owner,
+        item_cost=costs,
+        item_qty=np.where(bad_qty, 0, qty),
+        exact=exact,
+    )
+
+
+def build_inputs(
+    rows: Sequence,
+    items: Sequence[tuple[int, Any, Any]] = (),
+) -> tuple[FixedInputs, np.ndarray]:
+    """
+    Fixed-point inputs for compute_fixed(); see fixed_columns() for the
+    arguments. Returns (inputs, exact): exact is False for rows that must be
+    priced with Decimal arithmetic instead.
+    """
+    return fixed_columns(rows, items).assemble()
+
+
+def _decimal_prices(row, items: list[tuple[Any, Any]]) -> dict[str, Any]:
+    """Price one row with the CostingResponse Decimal properties."""
+    response = CostingResponse.model_construct(
+        **{field: _get(row, field) for field in INPUT_FIELDS},
+        costing_packaging=[
+            SimpleNamespace(quantity=qty, packaging=SimpleNamespace(cost=cost))
+            for cost, qty in items
+        ],
+    )
+    return {field: getattr(response, field) for field in PRICE_FIELDS}
+
+
+def price_rows(rows: Sequence, items: Sequence[tuple[int, Any, Any]] = ()) -> PriceArrays:
+    """Price a batch of costing-like rows; see build_inputs for the arguments."""
+    inputs, exact = build_inputs(rows, items)
+    prices = compute_fixed(inputs)
+
+    if not exact.all():
+        inexact = np.flatnonzero(~exact)
+        row_items = {int(i): [] for i in inexact}
+        for i, cost, qty in items:
+            if i in row_items:
+                row_items[i].append((cost, qty))
+        for i in row_items:
+            for field, value in _decimal_prices(rows[i], row_items[i]).items():
+                array = getattr(prices, field)
+                # Out-of-range rows may not fit int64 at all; use object arrays then
+                if field != "moq":
+                    value = decimal_to_paise(value)
+                try:
+                    array[i] = value
+                except OverflowError:
+                    array = array.astype(object)
+                    array[i] = value
+                    setattr(prices, field, array)
+    return prices
+
+
+def price_costings(costings: Sequence) -> PriceArrays:
+    """
+    Price Costing models / CostingResponse objects with their loaded
+    `costing_packaging` items (quantity, packaging.cost).
+    """
+    items = [
+        (i, cp.packaging.cost, cp.quantity)
+        for i, costing in enumerate(costings)
+        for cp in costing.costing_packaging
+    ]
+    return price_rows(costings, items)
+
+
+def costing_responses(costings: Sequence, catalog) -> list[CostingResponse]:
+    """
+    Build CostingResponse objects (packaging resolved from the packaging
+    catalog snapshot) with prices computed in one batch.
+    """
+    responses = [catalog.costing_response(c) for c in costings]
+    for response, prices in zip(responses, price_costings(responses).rows()):
+        response._prices = prices
+    return responses
+
+
+# ============================================
+# STORED PRICE COLUMNS
+# ============================================
+
+def costings_using_packaging(packaging_ids):
+    """Condition selecting the costings that reference any of `packaging_ids`."""
+    return Costing.id.in_(
+        select(CostingPackaging.costing_id).where(CostingPackaging.packaging_id.in_(packaging_ids))
+    )
+
+
+async def refresh_stored_prices(db: AsyncSession, *conditions) -> int:
+    """
+    Recompute the stored price columns of the costings matching `conditions`
+    in id-ordered batches. Returns the number of costings updated; caller commits.
+    """
+    table = Costing.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("costing_id"))
+        .values({field: bindparam(f"new_{field}") for field in STORED_PRICE_FIELDS})
+    )
+    updated, last_id = 0, 0
+    while True:
+        rows = (await db.execute(
+            select(table.c.id, *(table.c[f] for f in INPUT_FIELDS))
+            .where(table.c.id > last_id, *conditions)
+            .order_by(table.c.id)
+            .limit(REFRESH_BATCH_ROWS)
+        )).all()
+        if not rows:
+            break
+
+        position = {row.id: i for i, row in enumerate(rows)}
+        items = (await db.execute(
+            select(CostingPackaging.costing_id, PackagingOption.cost, CostingPackaging.quantity)
+            .join(PackagingOption, PackagingOption.id == CostingPackaging.packaging_id)
+            .where(CostingPackaging.costing_id.in_(list(position)))
+        )).all()
+        prices = price_rows(rows, [(position[cid], cost, qty) for cid, cost, qty in items])
+
+        await db.execute(stmt, [
+            {
+                "costing_id": row.id,
+                "new_unit_cost_before_gst": paise_to_decimal(prices.unit_cost_before_gst[i]),
+                "new_final_unit_price": paise_to_decimal(prices.final_unit_price[i]),
+                "new_moq": int(prices.moq[i]),
+            }
+            for i, row in enumerate(rows)
+        ])
+        updated += len(rows)
+        last_id = rows[-1].id
+        if len(rows) < REFRESH_BATCH_ROWS:
+            break
+    return updated
+
+
+async def backfill_stored_prices() -> None:
+    """Fill stored prices for costings that predate the columns (startup)."""
+    async with async_session_maker() as session:
+        updated = await refresh_stored_prices(session, Costing.final_unit_price.is_(None))
+        await session.commit()
+    if updated:
+        print(f"💰 Stored prices computed for {updated} costings")
@@ -0,0 +1,161 @@
+"""
+Per-project rollup of costings and quotations
+File: app/services/project_rollup.py
+
+One page of projects (project codes seen on costings or quotations, in
+code order) is summarised with three queries: the page of codes, a GROUP BY
+(project_code, status) over costing - served by idx_costing_project_status -
+and the latest quotation of each project with its line totals. Pages are
+keyset-paginated on project_code and cached per worker until a costing or
+quotation write invalidates them.
+"""
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import select, func, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.costing import Costing
+from app.models.quotation import Quotation, QuotationLine
+from app.services.cache import TTLCache
+from app.services.pagination import SortKey, encode_cursor, decode_cursor
+
+settings = get_settings()
+
+ROLLUP_SORT = SortKey(name="project_code", column=Costing.project_code, descending=False)
+
+rollup_cache = TTLCache(maxsize=256, ttl=settings.rollup_cache_ttl_seconds)
+
+
+async def _project_page(db: AsyncSession, after: Optional[str], limit: int) -> list[str]:
+    sources = [select(Costing.project_code), select(Quotation.project_code)]
+    if after is not None:
+        sources[0] = sources[0].where(Costing.project_code > after)
+        sources[1] = sources[1].where(Quotation.project_code > after)
+    codes = union(*sources).subquery("codes")
+    result = await db.execute(
+        select(codes.c.project_code).order_by(codes.c.project_code).limit(limit + 1)
+    )
+    return list(result.scalars())
+
+
+async def _costing_stats(db: AsyncSession, codes: list[str]) -> dict[str, dict]:
+    result = await db.execute(
+        select(
+            Costing.project_code,
+            Costing.status,
+            func.count().label("costings"),
+            func.count(Costing.final_unit_price).label("priced"),
+            func.sum(Costing.final_unit_price).label("price_sum"),
+            func.min(Costing.final_unit_price).label("min_price"),
+            func.max(Costing.final_unit_price).label("max_price"),
+        )
+        .where(Costing.project_code.in_(codes))
+        .group_by(Costing.project_code, Costing.status)
+    )
+    stats = {}
+    for row in result:
+        project = stats.setdefault(row.project_code, {
+            "costing_count": 0, "costings_by_status": {}, "priced": 0,
+            "price_sum": Decimal(0), "min_final_price": None, "max_final_price": None,
+        })
+        project["costing_count"] += row.costings
+        project["costings_by_status"][row.status] = row.costings
+        if row.priced:
+            project["priced"] += row.priced
+            project["price_sum"] += Decimal(row.price_sum)
+            low, high = Decimal(row.min_price), Decimal(row.max_price)
+            if project["min_final_price"] is None or low < project["min_final_price"]:
+                project["min_final_price"] = low
+            if project["max_final_price"] is None or high > project["max_final_price"]:
+                project["max_final_price"] = high
+    return stats
+
+
+async def _latest_quotations(db: AsyncSession, codes: list[str]) -> dict[str, dict]:
+    ranked = (
+        select(
+            Quotation.id,
+            Quotation.project_code,
+            Quotation.created_at,
+            func.row_number().over(
+                partition_by=Quotation.project_code,
+                order_by=(Quotation.created_at.desc(), Quotation.id.desc()),
+            ).label("position"),
+            func.count().over(partition_by=Quotation.project_code).label("quotations"),
+        )
+        .where(Quotation.project_code.in_(codes))
+        .subquery("ranked")
+    )
+    result = await db.execute(
+        select(
+            ranked.c.project_code,
+            ranked.c.id,
+            ranked.c.created_at,
+            ranked.c.quotations,
+            func.coalesce(func.sum(QuotationLine.line_total), 0).label("total"),
+            func.count(QuotationLine.id).label("line_count"),
+        )
+        .select_from(ranked)
+        .outerjoin(QuotationLine, QuotationLine.quotation_id == ranked.c.id)
+        .where(ranked.c.position == 1)
+        .group_by(ranked.c.project_code, ranked.c.id, ranked.c.created_at, ranked.c.quotations)
+    )
+    return {
+        row.project_code: {
+            "quotation_count": row.quotations,
+            "latest_quotation": {
+                "id": row.id,
+                "created_at": row.created_at,
+                "total": Decimal(row.total).quantize(Decimal("0.01")),
+                "line_count": row.line_count,
+            },
+        }
+        for row in result
+    }
+
+
+async def project_rollup_page(db: AsyncSession, cursor: Optional[str], limit: int) -> dict:
+    """
+    One page of project rollups after `cursor`. Raises InvalidCursor for a
+    malformed cursor.
+    """
+    key = (cursor, limit)
+    cached = rollup_cache.get(key)
+    if cached is not None:
+        return cached
+
+    after = decode_cursor(cursor, ROLLUP_SORT)[0] if cursor else None
+    codes = await _project_page(db, after, limit)
+    has_more = len(codes) > limit
+    codes = codes[:limit]
+
+    stats = await _costing_stats(db, codes) if codes else {}
+    quotations = await _latest_quotations(db, codes) if codes else {}
+
+    items = []
+    for code in codes:
+        costing = stats.get(code)
+        quotation = quotations.get(code, {"quotation_count": 0, "latest_quotation": None})
+        average = None
+        if costing and costing["priced"]:
+            average = (costing["price_sum"] / costing["priced"]).quantize(Decimal("0.01"))
+        items.append({
+            "project_code": code,
+            "costing_count": costing["costing_count"] if costing else 0,
+            "costings_by_status": costing["costings_by_status"] if costing else {},
+            "min_final_price": costing["min_final_price"] if costing else None,
+            "avg_final_price": average,
+            "max_final_price": costing["max_final_price"] if costing else None,
+            **quotation,
+        })
+
+    page = {
+        "items": items,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(ROLLUP_SORT, codes[-1], 0) if has_more else None,
+    }
+    rollup_cache.set(key, page, tags=("costing", "quotation"))
+    return page
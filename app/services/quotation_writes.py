@@ -0,0 +1,172 @@
+"""
+Quotation writes
+File: app/services/quotation_writes.py
+
+Quotation headers and lines are written with Core INSERT/UPDATE ...
+RETURNING (lines as one multi-row insert) and the QuotationResponse is
+built from the returned rows, so a create or update costs no ORM objects
+per line and no read-back query after the commit.
+
+Quotations generated from costings price every costing in one batch with
+the CostingResponse rules (app.services.pricing), so a quotation of any
+size takes a constant number of queries.
+"""
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.costing import Costing, CostingPackaging
+from app.models.quotation import Quotation, QuotationLine
+from app.schemas.quotation import (
+    QuotationCreate,
+    QuotationUpdate,
+    QuotationLineCreate,
+    QuotationFromCostings,
+    QuotationResponse,
+    QUOTATION_MAX_QTY,
+)
+from app.services.packaging_catalog import get_catalog
+from app.services.pricing import INPUT_FIELDS, paise_to_decimal, price_rows
+
+FROM_COSTINGS_MAX_LINES = 1000
+
+# Rows per multi-row INSERT; keeps the bind parameters (6 per line) well
+# under the drivers' 32k limit
+LINE_INSERT_BATCH = 1000
+
+# quotation_line.line_total is a Numeric(16, 2)
+LINE_TOTAL_LIMIT = Decimal(10) ** 14
+
+quotation_table = Quotation.__table__
+line_table = QuotationLine.__table__
+
+
+async def insert_lines(db: AsyncSession, quotation_id: int, lines: Sequence[QuotationLineCreate]) -> list[dict]:
+    """
+    Insert `lines` (line_total = unit_price * qty) with one multi-row
+    statement per LINE_INSERT_BATCH lines and return the stored rows in id
+    order, as a read of the quotation would.
+    """
+    rows = [
+        {**line.model_dump(), "quotation_id": quotation_id, "line_total": Decimal(line.unit_price) * line.qty}
+        for line in lines
+    ]
+    stored = []
+    for start in range(0, len(rows), LINE_INSERT_BATCH):
+        result = await db.execute(
+            insert(line_table).values(rows[start:start + LINE_INSERT_BATCH]).returning(*line_table.c)
+        )
+        stored.extend(dict(row._mapping) for row in result)
+    return sorted(stored, key=lambda line: line["id"])
+
+
+def _response(header, lines: list[dict]) -> QuotationResponse:
+    return QuotationResponse.model_validate({**header._mapping, "lines": lines})
+
+
+async def create_quotation(db: AsyncSession, data: QuotationCreate, user_id: Optional[int]) -> QuotationResponse:
+    """Insert the quotation and its lines. Caller commits."""
+    header = (await db.execute(
+        insert(quotation_table)
+        .values(**data.model_dump(exclude={"lines"}), created_by_id=user_id)
+        .returning(*quotation_table.c)
+    )).one()
+    return _response(header, await insert_lines(db, header.id, data.lines))
+
+
+async def update_quotation(db: AsyncSession, quotation_id: int, data: QuotationUpdate) -> Optional[QuotationResponse]:
+    """
+    Update header fields and, if given, replace all lines. None if the
+    quotation does not exist. Caller commits.
+    """
+    values = data.model_dump(exclude_unset=True, exclude={"lines"})
+    # The header UPDATE also locks the row, so concurrent line replacements
+    # serialize, and forgets the cached export (see excel_export)
+    header = (await db.execute(
+        update(quotation_table)
+        .where(quotation_table.c.id == quotation_id)
+        .values(**values, exported_file=None)
+        .returning(*quotation_table.c)
+    )).one_or_none()
+    if header is None:
+        return None
+
+    if data.lines is not None:
+        await db.execute(delete(line_table).where(line_table.c.quotation_id == quotation_id))
+        lines = await insert_lines(db, quotation_id, data.lines)
+    else:
+        result = await db.execute(
+            select(line_table).where(line_table.c.quotation_id == quotation_id).order_by(line_table.c.id)
+        )
+        lines = [dict(row._mapping) for row in result]
+    return _response(header, lines)
+
+
+async def create_from_costings(
+    db: AsyncSession, data: QuotationFromCostings, user_id: Optional[int]
+) -> QuotationResponse:
+    """
+    Quotation with one line per costing at its final_unit_price. Repeated
+    costing ids have their quantities added up. Raises ValueError for
+    unknown costings, a project without (or with too many) costings, or
+    a quantity or line total too large to store. Caller commits.
+    """
+    table = Costing.__table__
+    columns = [table.c.id, table.c.product_name, *(table.c[f] for f in INPUT_FIELDS)]
+
+    if data.items is not None:
+        quantities: dict[int, int] = {}
+        for item in data.items:
+            quantities[item.costing_id] = quantities.get(item.costing_id, 0) + item.qty
+        found = {
+            row.id: row
+            for row in (await db.execute(select(*columns).where(table.c.id.in_(list(quantities))))).all()
+        }
+        unknown = sorted(quantities.keys() - found.keys())
+        if unknown:
+            raise ValueError(f"Unknown costing(s): {unknown}")
+        too_many = sorted(costing_id for costing_id, qty in quantities.items() if qty > QUOTATION_MAX_QTY)
+        if too_many:
+            raise ValueError(f"Total qty above {QUOTATION_MAX_QTY} for costing(s): {too_many}")
+        rows = [found[costing_id] for costing_id in quantities]
+    else:
+        conditions = [table.c.project_code == data.project_code]
+        if data.status:
+            conditions.append(table.c.status == data.status)
+        rows = (await db.execute(
+            select(*columns).where(*conditions).order_by(table.c.id).limit(FROM_COSTINGS_MAX_LINES + 1)
+        )).all()
+        if not rows:
+            raise ValueError(f"No costings found for project {data.project_code}")
+        if len(rows) > FROM_COSTINGS_MAX_LINES:
+            raise ValueError(f"More than {FROM_COSTINGS_MAX_LINES} costings match; list the items instead")
+        quantities = {row.id: data.qty for row in rows}
+
+    position = {row.id: i for i, row in enumerate(rows)}
+    links = (await db.execute(
+        select(CostingPackaging.costing_id, CostingPackaging.packaging_id, CostingPackaging.quantity)
+        .where(CostingPackaging.costing_id.in_(list(position)))
+    )).all()
+    catalog = await get_catalog(db, {link.packaging_id for link in links})
+    prices = price_rows(rows, [
+        (position[link.costing_id], catalog.by_id[link.packaging_id].cost, link.quantity)
+        for link in links
+    ])
+
+    lines = [
+        QuotationLineCreate(
+            product_name=row.product_name,
+            unit_price=paise_to_decimal(prices.final_unit_price[i]),
+            qty=quantities[row.id],
+            costing_id=row.id,
+        )
+        for i, row in enumerate(rows)
+    ]
+    too_large = [line.costing_id for line in lines if abs(line.unit_price * line.qty) >= LINE_TOTAL_LIMIT]
+    if too_large:
+        raise ValueError(f"Line total out of range for costing(s): {too_large}")
+    return await create_quotation(
+        db, QuotationCreate(project_code=data.project_code, notes=data.notes, lines=lines), user_id
+    )
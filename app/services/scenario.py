@@ -0,0 +1,162 @@
+"""
+What-if scenario repricing
+File: app/services/scenario.py
+
+Reprices every matching costing in memory with parameter overrides applied
+(GST, transport, rm_per_litre, a packaging option's cost, ...) and reports
+old/new final_unit_price. Nothing is written.
+
+Rows are loaded as plain columns (packaging costs come from the packaging
+catalog), converted once to the fixed-point arrays of app.services.pricing,
+and the overrides are applied to those arrays with masks, so the whole
+scenario is a handful of vectorized passes however many costings match.
+"""
+import asyncio
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.costing import Costing, CostingPackaging
+from app.schemas.costing import ScenarioOverride, ScenarioRequest
+from app.services.packaging_catalog import get_catalog
+from app.services.pricing import (
+    FIELD_SCALES,
+    INPUT_FIELDS,
+    PACKAGING_COST_SCALE,
+    FixedColumns,
+    compute_fixed,
+    div_half_even,
+    fixed_columns,
+    paise_to_decimal,
+)
+
+
+def _apply(values: np.ndarray, missing, mask: np.ndarray, override: ScenarioOverride, places: int, limit: int):
+    """Apply one override to the rows in `mask`; returns (values, missing, in_range)."""
+    if override.mode == "absolute":
+        target = override.value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_EVEN)
+        scaled = int(target.scaleb(places))
+        if abs(scaled) > limit:
+            raise ValueError(f"{override.field} value {override.value} is out of range")
+        values = np.where(mask, scaled, values)
+        if missing is not None:
+            missing = missing & ~mask
+    else:
+        # value * (100 + percent) / 100, percent has 2 decimals -> / 10^4,
+        # rounded to the column's precision
+        factor = int((Decimal(100) + override.value).scaleb(2))
+        values = np.where(mask, div_half_even(values * factor, 10**4), values)
+    in_range = np.abs(values) <= limit
+    return np.where(in_range, values, 0), missing, in_range
+
+
+def _reprice(columns: FixedColumns, item_packaging: np.ndarray, project_codes: np.ndarray,
+             statuses: np.ndarray, overrides: list[ScenarioOverride]):
+    baseline, exact = columns.assemble()
+    old = compute_fixed(baseline)
+
+    for override in overrides:
+        scope = np.ones(len(project_codes), dtype=bool)
+        if override.project_code is not None:
+            scope &= project_codes == override.project_code
+        if override.status is not None:
+            scope &= statuses == override.status
+
+        if override.field == "packaging_cost":
+            hit = (item_packaging == override.packaging_id) & scope[columns.item_owner]
+            columns.item_cost, _, in_range = _apply(columns.item_cost, None, hit, override, *PACKAGING_COST_SCALE)
+            exact[columns.item_owner[~in_range]] = False
+        else:
+            columns.values[override.field], columns.missing[override.field], in_range = _apply(
+                columns.values[override.field], columns.missing[override.field],
+                scope, override, *FIELD_SCALES[override.field],
+            )
+            exact &= in_range
+
+    scenario, scenario_exact = columns.assemble()
+    new = compute_fixed(scenario)
+    return old.final_unit_price, new.final_unit_price, exact & scenario_exact
+
+
+async def run_scenario(db: AsyncSession, request: ScenarioRequest) -> dict:
+    """
+    Reprice the costings matching the request filters with its overrides.
+    Raises ValueError for an override value that cannot be represented.
+    """
+    conditions = []
+    if request.project_code:
+        conditions.append(Costing.project_code == request.project_code)
+    if request.status:
+        conditions.append(Costing.status == request.status)
+
+    table = Costing.__table__
+    rows = (await db.execute(
+        select(table.c.id, table.c.project_code, table.c.product_name, table.c.status,
+               *(table.c[f] for f in INPUT_FIELDS))
+        .where(*conditions)
+        .order_by(table.c.id)
+    )).all()
+    position = {row.id: i for i, row in enumerate(rows)}
+
+    links = (await db.execute(
+        select(CostingPackaging.costing_id, CostingPackaging.packaging_id, CostingPackaging.quantity)
+        .where(CostingPackaging.costing_id.in_(select(Costing.id).where(*conditions)))
+    )).all()
+    links = [link for link in links if link.costing_id in position]
+    catalog = await get_catalog(db, {link.packaging_id for link in links})
+    items = [
+        (position[link.costing_id], catalog.by_id[link.packaging_id].cost, link.quantity)
+        for link in links
+    ]
+
+    def compute():
+        columns = fixed_columns(rows, items)
+        item_packaging = np.fromiter((link.packaging_id for link in links), dtype=np.int64, count=len(links))
+        project_codes = np.array([row.project_code for row in rows], dtype=object)
+        statuses = np.array([row.status for row in rows], dtype=object)
+        return _reprice(columns, item_packaging, project_codes, statuses, request.overrides)
+
+    # CPU-bound: keep the event loop free
+    old, new, valid = await asyncio.to_thread(compute)
+
+    index = np.flatnonzero(valid)
+    old, new = old[index], new[index]
+    delta = new - old
+    changed = int(np.count_nonzero(delta))
+    count = len(index)
+
+    # Largest price movements first
+    items_out = []
+    for k in np.argsort(-np.abs(delta), kind="stable")[:request.top]:
+        row = rows[int(index[k])]
+        items_out.append({
+            "id": row.id,
+            "project_code": row.project_code,
+            "product_name": row.product_name,
+            "status": row.status,
+            "old_final_unit_price": paise_to_decimal(old[k]),
+            "new_final_unit_price": paise_to_decimal(new[k]),
+            "delta": paise_to_decimal(delta[k]),
+        })
+
+    def average(total) -> Decimal:
+        return (Decimal(int(total)) / count).scaleb(-2).quantize(Decimal("0.01")) if count else Decimal("0.00")
+
+    return {
+        "costings": count,
+        "changed": changed,
+        "skipped": len(rows) - count,
+        "aggregates": {
+            "old_total": paise_to_decimal(old.sum()),
+            "new_total": paise_to_decimal(new.sum()),
+            "total_delta": paise_to_decimal(delta.sum()),
+            "avg_old_price": average(old.sum()),
+            "avg_new_price": average(new.sum()),
+            "avg_delta": average(delta.sum()),
+            "min_delta": paise_to_decimal(delta.min()) if count else Decimal("0.00"),
+            "max_delta": paise_to_decimal(delta.max()) if count else Decimal("0.00"),
+        },
+        "items": items_out,
+    }
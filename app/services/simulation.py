@@ -0,0 +1,302 @@
+"""
+Monte Carlo price-risk simulation
+File: app/services/simulation.py
+
+Draws percent changes of rm_per_litre, transport and packaging option costs
+for N trials and reprices the selected costings under each draw, giving a
+distribution of final_unit_price per costing instead of a single number.
+
+A draw is shared by every costing in a trial (a market-wide move), so the
+draws are a few (N,) vectors made once from the seed. Shocked inputs are
+rounded to their column's precision and priced with the fixed-point rules of
+app.services.pricing on (trials x costings) arrays, a block of costings at
+a time to bound memory - with no shock a trial reproduces today's price
+exactly. Blocks are independent: small jobs run in a thread, large ones are
+split across the process pool (app.services.workers), with identical results.
+"""
+import asyncio
+import secrets
+from dataclasses import dataclass, fields
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.costing import Costing, CostingPackaging
+from app.schemas.costing import PriceShock, SimulationRequest
+from app.services.packaging_catalog import get_catalog
+from app.services.pricing import (
+    INPUT_FIELDS,
+    OVERHEAD_FIELDS,
+    PACKAGING_COST_SCALE,
+    FixedInputs,
+    compute_fixed,
+    div_half_even,
+    fixed_columns,
+    paise_to_decimal,
+    to_fixed,
+)
+from app.services.workers import pool_size, run_in_pool
+
+settings = get_settings()
+
+# Elements of one (trials x costings) block
+BLOCK_ELEMENTS = 1_000_000
+# Shock factors are integers in parts per million
+FACTOR_SCALE = 10**6
+# Largest intermediate product allowed (int64), and exact integer range of float64
+INT_LIMIT = 2**62
+FLOAT_EXACT = 2**52
+
+
+@dataclass
+class SimulationInputs:
+    """Fixed-point inputs of C costings (pricing scales) and the trial draws."""
+    sku_ml: np.ndarray
+    sku_missing: np.ndarray
+    rm_per_litre: np.ndarray
+    rm_missing: np.ndarray
+    batch_size_kg: np.ndarray
+    batch_missing: np.ndarray
+    gst_percent: np.ndarray
+    packaging_manual: np.ndarray     # paise
+    fixed_overheads: np.ndarray      # paise: overheads without transport
+    transport: np.ndarray            # paise
+    quantities: np.ndarray           # (options, C) float: quantity of each packaging option
+    current: np.ndarray              # today's final_unit_price, paise
+    option_cost: np.ndarray          # (options,) paise
+    option_group: np.ndarray         # (options,) column of group_factor
+    rm_factor: np.ndarray            # (trials,) ppm
+    transport_factor: np.ndarray     # (trials,) ppm
+    group_factor: np.ndarray         # (trials, groups) ppm
+    percentiles: np.ndarray
+
+    def take(self, start: int, stop: int) -> "SimulationInputs":
+        """Costings start:stop with the same draws."""
+        cut = slice(start, stop)
+        per_costing = {
+            f.name: getattr(self, f.name)[..., cut]
+            for f in fields(self)
+            if f.name not in ("option_cost", "option_group", "rm_factor", "transport_factor",
+                              "group_factor", "percentiles")
+        }
+        return SimulationInputs(
+            **per_costing,
+            option_cost=self.option_cost,
+            option_group=self.option_group,
+            rm_factor=self.rm_factor,
+            transport_factor=self.transport_factor,
+            group_factor=self.group_factor,
+            percentiles=self.percentiles,
+        )
+
+
+def _draw(rng: np.random.Generator, shock: PriceShock | None, trials: int) -> np.ndarray:
+    """Factors (1 + change/100) for one shock, in parts per million."""
+    if shock is None:
+        return np.full(trials, FACTOR_SCALE, dtype=np.int64)
+    if shock.kind == "normal":
+        change = rng.normal(shock.mean, shock.std, trials)
+    elif shock.kind == "uniform":
+        change = rng.uniform(shock.low, shock.high, trials)
+    elif shock.low == shock.high:
+        change = np.full(trials, shock.low)
+    else:
+        change = rng.triangular(shock.low, shock.mode, shock.high, trials)
+    factor = 1 + np.clip(change, -100, 1000) / 100
+    return np.rint(factor * FACTOR_SCALE).astype(np.int64)
+
+
+def simulate_block(inputs: SimulationInputs) -> tuple[np.ndarray, ...]:
+    """
+    Simulated prices of a block of costings. Returns (mean, price
+    percentiles, margin percentiles, share of trials above current), all in
+    paise; the percentile arrays are (len(percentiles), costings). Top-level
+    and free of I/O so it can run in the process pool.
+    """
+    trials = len(inputs.rm_factor)
+    columns = max(1, BLOCK_ELEMENTS // trials)
+    count = len(inputs.current)
+    mean = np.empty(count)
+    prices = np.empty((len(inputs.percentiles), count))
+    margins = np.empty((len(inputs.percentiles), count))
+    above = np.empty(count)
+
+    # Shocked option costs, rounded to paise: (trials, options). Float for the
+    # matrix product below - integers that stay exact (see FLOAT_EXACT)
+    option_cost = div_half_even(
+        inputs.option_cost * inputs.group_factor[:, inputs.option_group], FACTOR_SCALE
+    ).astype(float)
+
+    for start in range(0, count, columns):
+        cut = slice(start, start + columns)
+        rm = div_half_even(np.outer(inputs.rm_factor, inputs.rm_per_litre[cut]), FACTOR_SCALE)
+        transport = div_half_even(np.outer(inputs.transport_factor, inputs.transport[cut]), FACTOR_SCALE)
+        packaging = np.rint(option_cost @ inputs.quantities[:, cut]).astype(np.int64)
+        final = compute_fixed(FixedInputs(
+            sku_ml=inputs.sku_ml[cut],
+            sku_missing=inputs.sku_missing[cut],
+            rm_per_litre=rm,
+            rm_missing=inputs.rm_missing[cut],
+            batch_size_kg=inputs.batch_size_kg[cut],
+            batch_missing=inputs.batch_missing[cut],
+            gst_percent=inputs.gst_percent[cut],
+            packaging_total=packaging + inputs.packaging_manual[cut],
+            overheads=transport + inputs.fixed_overheads[cut],
+        )).final_unit_price
+
+        current = inputs.current[cut]
+        mean[cut] = final.mean(axis=0)
+        # "nearest": every reported percentile is an actual trial price
+        prices[:, cut] = np.percentile(final, inputs.percentiles, axis=0, method="nearest")
+        # margin = current - price, so its p-th percentile pairs with the price's (100 - p)-th
+        margins[:, cut] = current - np.percentile(final, 100 - inputs.percentiles, axis=0, method="nearest")
+        above[cut] = (final > current).mean(axis=0)
+    return mean, prices, margins, above
+
+
+async def _simulate(inputs: SimulationInputs, trials: int):
+    count = len(inputs.current)
+    if count * trials <= settings.simulation_pool_threshold:
+        return await asyncio.to_thread(simulate_block, inputs)
+
+    step = -(-count // pool_size())
+    parts = await asyncio.gather(*(
+        run_in_pool(simulate_block, inputs.take(start, start + step))
+        for start in range(0, count, step)
+    ))
+    mean, prices, margins, above = zip(*parts)
+    return (
+        np.concatenate(mean),
+        np.concatenate(prices, axis=1),
+        np.concatenate(margins, axis=1),
+        np.concatenate(above),
+    )
+
+
+async def run_simulation(db: AsyncSession, request: SimulationRequest) -> dict:
+    """
+    Simulate the costings selected by ids/project_code/status. Costings
+    whose values are out of the pricing engine's range are skipped.
+    Raises ValueError when too many costings match.
+    """
+    conditions = []
+    if request.costing_ids is not None:
+        conditions.append(Costing.id.in_(request.costing_ids))
+    if request.project_code:
+        conditions.append(Costing.project_code == request.project_code)
+    if request.status:
+        conditions.append(Costing.status == request.status)
+
+    table = Costing.__table__
+    rows = (await db.execute(
+        select(table.c.id, table.c.project_code, table.c.product_name, *(table.c[f] for f in INPUT_FIELDS))
+        .where(*conditions)
+        .order_by(table.c.id)
+        .limit(settings.simulation_max_costings + 1)
+    )).all()
+    if len(rows) > settings.simulation_max_costings:
+        raise ValueError(f"More than {settings.simulation_max_costings} costings match; narrow the selection")
+
+    seed = request.seed if request.seed is not None else secrets.randbits(63)
+    if not rows:
+        return {"seed": seed, "trials": request.trials, "costings": 0, "skipped": 0, "items": []}
+
+    position = {row.id: i for i, row in enumerate(rows)}
+    links = (await db.execute(
+        select(CostingPackaging.costing_id, CostingPackaging.packaging_id, CostingPackaging.quantity)
+        .where(CostingPackaging.costing_id.in_(list(position)))
+    )).all()
+    catalog = await get_catalog(db, {link.packaging_id for link in links})
+    items = [(position[l.costing_id], catalog.by_id[l.packaging_id].cost, l.quantity) for l in links]
+    columns = fixed_columns(rows, items)
+    baseline, exact = columns.assemble()
+    current = compute_fixed(baseline).final_unit_price
+
+    # Packaging options used by the selection, and each option's shock group:
+    # one group per packaging_id with its own shock, the rest share the last
+    options = sorted({link.packaging_id for link in links})
+    option_index = {pid: o for o, pid in enumerate(options)}
+    option_cost, _, _ = to_fixed((catalog.by_id[pid].cost for pid in options), *PACKAGING_COST_SCALE)
+    quantities = np.zeros((len(options), len(rows)))
+    np.add.at(
+        quantities,
+        (np.array([option_index[l.packaging_id] for l in links], dtype=np.int64), columns.item_owner),
+        columns.item_qty,
+    )
+    shocked = [s.packaging_id for s in request.packaging if s.packaging_id is not None]
+    group_of = {pid: g for g, pid in enumerate(shocked)}
+    option_group = np.array([group_of.get(pid, len(shocked)) for pid in options], dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    trials = request.trials
+    rm_factor = _draw(rng, request.rm_per_litre, trials)
+    transport_factor = _draw(rng, request.transport, trials)
+    group_factor = np.column_stack(
+        [_draw(rng, s, trials) for s in request.packaging if s.packaging_id is not None]
+        + [_draw(rng, next((s for s in request.packaging if s.packaging_id is None), None), trials)]
+    )
+
+    v = columns.values
+    fixed_overheads = sum(v[f] for f in OVERHEAD_FIELDS if f != "transport")
+
+    # Costings whose shocked values could overflow the integer arithmetic are skipped
+    rm_max = np.abs(v["rm_per_litre"]) * (rm_factor.max() / FACTOR_SCALE) * np.abs(v["sku_ml"])
+    option_max = option_cost * (group_factor.max(axis=0)[option_group] / FACTOR_SCALE)
+    packaging_max = option_max @ quantities + np.abs(v["packaging_cost_manual"])
+    unit_max = (
+        rm_max / 10**8 + packaging_max + np.abs(fixed_overheads)
+        + np.abs(v["transport"]) * (transport_factor.max() / FACTOR_SCALE)
+    )
+    keep = np.flatnonzero(
+        exact
+        & (rm_max <= INT_LIMIT)
+        & (packaging_max <= FLOAT_EXACT)
+        & (unit_max * np.abs(v["gst_percent"]) <= INT_LIMIT)
+    )
+
+    m = columns.missing
+    inputs = SimulationInputs(
+        sku_ml=v["sku_ml"][keep],
+        sku_missing=m["sku_ml"][keep],
+        rm_per_litre=v["rm_per_litre"][keep],
+        rm_missing=m["rm_per_litre"][keep],
+        batch_size_kg=v["batch_size_kg"][keep],
+        batch_missing=m["batch_size_kg"][keep],
+        gst_percent=v["gst_percent"][keep],
+        packaging_manual=v["packaging_cost_manual"][keep],
+        fixed_overheads=fixed_overheads[keep],
+        transport=v["transport"][keep],
+        quantities=quantities[:, keep],
+        current=current[keep],
+        option_cost=option_cost,
+        option_group=option_group,
+        rm_factor=rm_factor,
+        transport_factor=transport_factor,
+        group_factor=group_factor,
+        percentiles=np.array(request.percentiles),
+    )
+    mean, prices, margins, above = await _simulate(inputs, trials)
+
+    labels = [f"p{p:g}" for p in request.percentiles]
+    items_out = []
+    for k, i in enumerate(keep):
+        row = rows[i]
+        items_out.append({
+            "id": row.id,
+            "project_code": row.project_code,
+            "product_name": row.product_name,
+            "final_unit_price": paise_to_decimal(current[i]),
+            "mean": paise_to_decimal(np.rint(mean[k])),
+            "percentiles": {label: paise_to_decimal(prices[q, k]) for q, label in enumerate(labels)},
+            "margin_percentiles": {label: paise_to_decimal(margins[q, k]) for q, label in enumerate(labels)},
+            "prob_above_current": float(above[k]),
+        })
+    return {
+        "seed": seed,
+        "trials": trials,
+        "costings": len(keep),
+        "skipped": len(rows) - len(keep),
+        "items": items_out,
+    }
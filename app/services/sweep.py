@@ -0,0 +1,108 @@
+"""
+Price sensitivity / MOQ sweep
+File: app/services/sweep.py
+
+Prices one costing over every combination of up to three swept fields
+(batch size, SKU, overheads, ...). The costing's fixed-point columns are
+built once and the grid is expanded with NumPy indexing, so the whole grid
+is a single pass of the pricing engine (app.services.pricing) - the same
+exact CostingResponse rules, half-even rounding included.
+"""
+from math import prod
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.costing import Costing, CostingPackaging
+from app.schemas.costing import SweepRequest
+from app.services.packaging_catalog import get_catalog
+from app.services.pricing import (
+    FIELD_SCALES,
+    INPUT_FIELDS,
+    FixedColumns,
+    compute_fixed,
+    fixed_columns,
+    paise_to_decimal,
+    price_rows,
+    to_fixed,
+)
+
+
+def _prices(prices, i: int) -> dict:
+    return {
+        "moq": int(prices.moq[i]),
+        "unit_cost_before_gst": paise_to_decimal(prices.unit_cost_before_gst[i]),
+        "final_unit_price": paise_to_decimal(prices.final_unit_price[i]),
+    }
+
+
+async def run_sweep(db: AsyncSession, costing_id: int, request: SweepRequest) -> Optional[dict]:
+    """
+    Grid of moq / unit_cost_before_gst / final_unit_price for the costing;
+    None if it does not exist. Raises ValueError for a swept value that a
+    costing could not store (too many decimals or out of range).
+    """
+    table = Costing.__table__
+    row = (await db.execute(
+        select(*(table.c[f] for f in INPUT_FIELDS)).where(table.c.id == costing_id)
+    )).one_or_none()
+    if row is None:
+        return None
+    links = (await db.execute(
+        select(CostingPackaging.packaging_id, CostingPackaging.quantity)
+        .where(CostingPackaging.costing_id == costing_id)
+    )).all()
+    catalog = await get_catalog(db, {link.packaging_id for link in links})
+    items = [(0, catalog.by_id[link.packaging_id].cost, link.quantity) for link in links]
+
+    axes = [(axis.field, axis.points()) for axis in request.axes]
+    axis_ints = []
+    for field, axis_values in axes:
+        ints, _, exact = to_fixed(axis_values, *FIELD_SCALES[field])
+        if not exact.all():
+            bad = axis_values[int(np.flatnonzero(~exact)[0])]
+            raise ValueError(f"{field} value {bad} is out of range or has too many decimal places")
+        axis_ints.append(ints)
+
+    # Grid point k uses value index[a][k] of axis a (last axis fastest)
+    shape = tuple(len(axis_values) for _, axis_values in axes)
+    size = prod(shape)
+    index = np.indices(shape).reshape(len(shape), size)
+
+    base = fixed_columns([row], items)
+    values = {field: np.repeat(base.values[field], size) for field in INPUT_FIELDS}
+    missing = {field: np.repeat(base.missing[field], size) for field in INPUT_FIELDS}
+    for a, (field, _) in enumerate(axes):
+        values[field] = axis_ints[a][index[a]]
+        missing[field] = np.zeros(size, dtype=bool)
+
+    item_count = len(items)
+    inputs, exact = FixedColumns(
+        values=values,
+        missing=missing,
+        item_owner=np.repeat(np.arange(size), item_count),
+        item_cost=np.tile(base.item_cost, size),
+        item_qty=np.tile(base.item_qty, size),
+        exact=np.repeat(base.exact, size),
+    ).assemble()
+    prices = compute_fixed(inputs)
+    current = price_rows([row], items)
+
+    points = []
+    for k in range(size):
+        point_values = {field: axis_values[index[a][k]] for a, (field, axis_values) in enumerate(axes)}
+        if exact[k]:
+            point = _prices(prices, k)
+        else:
+            # Out of the engine's range (e.g. a huge batch size): price with Decimals
+            point = _prices(price_rows([{**row._mapping, **point_values}], items), 0)
+        points.append({**point, "values": point_values})
+
+    return {
+        "costing_id": costing_id,
+        "current": _prices(current, 0),
+        "axes": [field for field, _ in axes],
+        "points": points,
+    }
@@ -0,0 +1,46 @@
+"""
+Process pool for CPU-bound work
+File: app/services/workers.py
+
+Large NumPy jobs hold the GIL long enough to stall other requests even from
+a thread, so they run in a small process pool shared by the worker. The
+pool is created on first use with the "spawn" start method (forking a
+process that runs an event loop and database connections is not safe) and
+shut down from the app lifespan.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.cpu_pool_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+async def run_in_pool(fn: Callable, *args: Any) -> Any:
+    """Run fn(*args) in the process pool; fn and args must be picklable."""
+    return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+
+
+def pool_size() -> int:
+    return settings.cpu_pool_workers
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,84 @@
+"""
+Test fixtures: the app on the SQLite fallback (sqlite+aiosqlite), one
+database file per session, emptied before every test.
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="valos-tests-")
+_db_path = os.path.join(_tmp, "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ["DATABASE_URL_DIRECT"] = ""
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["DEBUG"] = "false"
+os.environ["EXPORT_CACHE_DIR"] = os.path.join(_tmp, "exports")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, async_session_maker, create_db_and_tables, engine
+from app.dependencies import CachedUser, get_current_user
+from app.main import app
+from app.services.costing_cache import response_cache
+from app.services.counts import count_cache
+from app.services import packaging_catalog
+from app.services.project_rollup import rollup_cache
+
+
+async def _reset_database():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await create_db_and_tables()
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fresh_database():
+    """Empty tables and in-process caches (ids are reused across tests)."""
+    asyncio.run(_reset_database())
+    for cache in (count_cache, response_cache, rollup_cache):
+        cache.clear()
+    # Per-worker catalog state; each TestClient runs its own event loop
+    packaging_catalog._catalog = None
+    packaging_catalog._refresh_task = None
+    packaging_catalog._reload_lock = asyncio.Lock()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def user() -> CachedUser:
+    """The authenticated user; tests may flip is_superuser."""
+    return CachedUser({"sub": "tester", "user_id": None})
+
+
+@pytest.fixture
+def client(user):
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        # localhost: TrustedHostMiddleware is on when DEBUG is false
+        with TestClient(app, base_url="http://localhost") as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def raw_sql():
+    """Plain sqlite3 connection (autocommit) for states the API cannot produce."""
+    connection = sqlite3.connect(_db_path, isolation_level=None)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+async def db():
+    """A session for service-level tests (use with @pytest.mark.anyio)."""
+    async with async_session_maker() as session:
+        yield session
+    await engine.dispose()
@@ -0,0 +1,125 @@
+from decimal import Decimal
+
+import pytest
+
+
+@pytest.fixture
+def bottle(client):
+    return client.post("/api/packaging/", json={"name": "Bottle", "cost": "3.50"}).json()["id"]
+
+
+def _costing(project_code="P1", product_name="Soap", **fields):
+    return {"project_code": project_code, "product_name": product_name, "sku_ml": "100", "rm_per_litre": "120", **fields}
+
+
+def _create(client, items):
+    response = client.post("/api/costings/bulk/", json={"items": items})
+    assert response.status_code == 201, response.text
+    return response.json()["ids"]
+
+
+def _get(client, costing_id):
+    return client.get(f"/api/costing/{costing_id}/")
+
+
+def test_bulk_create_matches_single_costing_prices(client, bottle):
+    ids = _create(client, [
+        _costing(packaging_items=[{"packaging_id": bottle, "quantity": 2}]),
+        _costing(product_name="Shampoo", sku_ml="250", packaging_items=[]),
+    ])
+    assert len(ids) == 2 and ids == sorted(ids)
+
+    first = _get(client, ids[0]).json()
+    assert [(cp["packaging_id"], cp["quantity"]) for cp in first["costing_packaging"]] == [(bottle, 2)]
+    assert Decimal(first["total_packaging_cost"]) == Decimal("7.00")
+    assert Decimal(first["rm_cost_per_unit"]) == Decimal("12.00")
+    assert _get(client, ids[1]).json()["product_name"] == "Shampoo"
+
+
+def test_bulk_create_rejects_unknown_packaging_atomically(client, bottle):
+    response = client.post("/api/costings/bulk/", json={"items": [
+        _costing(packaging_items=[{"packaging_id": bottle}]),
+        _costing(packaging_items=[{"packaging_id": 999}]),
+    ]})
+    assert response.status_code == 400
+    assert client.get("/api/costings/").json()["total"] == 0
+
+
+def test_bulk_duplicate_copies_costings_and_packaging(client, bottle):
+    ids = _create(client, [
+        _costing(status="final", packaging_items=[{"packaging_id": bottle, "quantity": 3}]),
+        _costing(project_code="P2"),
+    ])
+
+    response = client.post("/api/costings/bulk/duplicate/", json={"project_code": "P1"})
+    assert response.status_code == 201, response.text
+    result = response.json()
+    assert result["source_ids"] == [ids[0]] and result["count"] == 1
+
+    source, copy = _get(client, ids[0]).json(), _get(client, result["ids"][0]).json()
+    assert (copy["project_code"], copy["product_name"], copy["status"]) == ("P1_copy", "Soap (Copy)", "draft")
+    assert [(cp["packaging_id"], cp["quantity"]) for cp in copy["costing_packaging"]] == [(bottle, 3)]
+    assert copy["final_unit_price"] == source["final_unit_price"]
+
+
+def test_bulk_duplicate_names_match_single_duplicate(client):
+    [costing_id] = _create(client, [_costing(project_code="X" * 50, product_name="Y" * 255)])
+
+    bulk = client.post("/api/costings/bulk/duplicate/", json={"ids": [costing_id]}).json()["ids"][0]
+    single = client.post(f"/api/costing/{costing_id}/duplicate/").json()["id"]
+    bulk_copy, single_copy = _get(client, bulk).json(), _get(client, single).json()
+    assert (bulk_copy["project_code"], bulk_copy["product_name"]) == (single_copy["project_code"], single_copy["product_name"])
+
+
+def test_bulk_status_updates_only_changed_rows(client):
+    ids = _create(client, [_costing(), _costing(status="final"), _costing(project_code="P2")])
+
+    response = client.patch("/api/costings/bulk/status/", json={"project_code": "P1", "new_status": "final"})
+    assert response.status_code == 200, response.text
+    assert response.json()["ids"] == [ids[0]]
+    assert [_get(client, i).json()["status"] for i in ids] == ["final", "final", "draft"]
+
+
+def test_bulk_delete_by_filter(client, bottle):
+    ids = _create(client, [
+        _costing(packaging_items=[{"packaging_id": bottle}]),
+        _costing(status="final"),
+        _costing(project_code="P2"),
+    ])
+
+    response = client.post("/api/costings/bulk/delete/", json={"project_code": "P1", "status": "draft"})
+    assert response.status_code == 200, response.text
+    assert response.json()["ids"] == [ids[0]]
+    assert _get(client, ids[0]).status_code == 404
+    assert _get(client, ids[1]).status_code == 200
+
+
+def test_bulk_selection_needs_criteria(client):
+    assert client.post("/api/costings/bulk/delete/", json={}).status_code == 422
+
+
+def test_bulk_duplicate_refuses_more_than_the_limit(client, monkeypatch):
+    monkeypatch.setattr("app.services.costing_bulk.BULK_MAX_ROWS", 2)
+    _create(client, [_costing() for _ in range(3)])
+
+    response = client.post("/api/costings/bulk/duplicate/", json={"project_code": "P1"})
+    assert response.status_code == 400
+    assert client.get("/api/costings/").json()["total"] == 3
+
+
+def test_bulk_delete_refuses_more_than_the_limit(client, monkeypatch):
+    monkeypatch.setattr("app.services.costing_bulk.BULK_MAX_ROWS", 2)
+    _create(client, [_costing() for _ in range(3)])
+
+    response = client.post("/api/costings/bulk/delete/", json={"status": "draft"})
+    assert response.status_code == 400
+    assert client.get("/api/costings/").json()["total"] == 3
+
+
+@pytest.mark.parametrize("new_status", ["shipped", "", "Final"])
+def test_bulk_status_rejects_unknown_status(client, new_status):
+    [costing_id] = _create(client, [_costing()])
+
+    response = client.patch("/api/costings/bulk/status/", json={"ids": [costing_id], "new_status": new_status})
+    assert response.status_code == 422
+    assert _get(client, costing_id).json()["status"] == "draft"
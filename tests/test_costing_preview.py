@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.services import packaging_catalog
+
+
+@contextmanager
+def catalog_queries():
+    """Statements reading the packaging catalog (the lifespan's lead counter job runs alongside)."""
+    queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "packaging_option" in statement or "cache_version" in statement:
+            queries.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def _preview(client, packaging_id, cost_form=None):
+    form = {"sku_ml": "100", "rm_per_litre": "100", "packaging_items": [{"packaging_id": packaging_id, "quantity": 2}]}
+    return client.post("/api/costing/preview/", json={**form, **(cost_form or {})})
+
+
+def _eventually(check, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not reached")
+        time.sleep(0.01)
+
+
+def test_preview_never_queries_the_database(client):
+    bottle = client.post("/api/packaging/", json={"name": "Bottle", "cost": "3.33"}).json()["id"]
+    _eventually(lambda: _preview(client, bottle).status_code == 200)
+
+    with catalog_queries() as queries:
+        response = _preview(client, bottle)
+    assert response.status_code == 200, response.text
+    assert response.json()["total_packaging_cost"] == "6.66"
+    assert queries == []
+
+
+def test_catalog_is_warm_after_startup(client):
+    with catalog_queries() as queries:
+        response = client.post("/api/costing/preview/", json={"sku_ml": "100", "rm_per_litre": "100"})
+    assert response.status_code == 200, response.text
+    assert response.json()["rm_cost_per_unit"] == "10.00"
+    assert queries == []
+
+
+def test_unknown_packaging_is_a_400(client):
+    response = _preview(client, 999)
+    assert response.status_code == 400
+    assert "Unknown packaging option" in response.json()["detail"]
+
+
+def test_cost_change_is_reloaded_in_the_background(client):
+    bottle = client.post("/api/packaging/", json={"name": "Bottle", "cost": "3.33"}).json()["id"]
+    _eventually(lambda: _preview(client, bottle).status_code == 200)
+
+    assert client.patch(f"/api/packaging/{bottle}/", json={"cost": "5.00"}).status_code == 200
+    _eventually(lambda: _preview(client, bottle).json()["total_packaging_cost"] == "10.00")
+
+
+def test_missing_snapshot_is_a_503_and_reloads(client):
+    bottle = client.post("/api/packaging/", json={"name": "Bottle", "cost": "3.33"}).json()["id"]
+    packaging_catalog._catalog = None
+
+    assert _preview(client, bottle).status_code == 503
+    _eventually(lambda: _preview(client, bottle).status_code == 200)
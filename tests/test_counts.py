@@ -0,0 +1,51 @@
+import pytest
+
+
+@pytest.fixture
+def planner_estimate(monkeypatch):
+    """Pretend the planner has statistics (as on PostgreSQL): always 999 rows."""
+    async def estimate(db, table):
+        return 999
+    monkeypatch.setattr("app.services.counts._planner_estimate", estimate)
+
+
+@pytest.fixture
+def costings(client):
+    items = [
+        {"project_code": "P1", "product_name": "Soap", "sku_ml": "100", "rm_per_litre": "120", "batch_size_kg": "0"},
+        {"project_code": "P1", "product_name": "Gel", "sku_ml": "100", "rm_per_litre": "120"},
+    ]
+    return client.post("/api/costings/bulk/", json={"items": items}).json()["ids"]
+
+
+def _total(client, url, **params):
+    response = client.get(url, params={"count": "estimate", **params})
+    assert response.status_code == 200, response.text
+    return response.json()["total"]
+
+
+def test_unfiltered_estimate_uses_planner(client, costings, planner_estimate):
+    assert _total(client, "/api/costings/") == 999
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"min_moq": 1}, 1),
+    ({"max_moq": 0}, 1),
+    ({"min_price": 0}, 2),
+    ({"project_code": "P1"}, 2),
+])
+def test_filtered_estimate_counts_the_filter(client, costings, planner_estimate, params, expected):
+    assert _total(client, "/api/costings/", **params) == expected
+
+
+def test_falsy_lead_filter_is_still_counted(client, planner_estimate):
+    for company in ("Acme", "Zen"):
+        client.post("/api/leads/", json={"company_name": company, "owner": "Bob"})
+    assert _total(client, "/api/leads/", search="zen") == 1
+    assert _total(client, "/api/leads/") == 999
+
+
+def test_estimate_is_cached_until_a_write(client, costings):
+    assert _total(client, "/api/costings/", project_code="P1") == 2
+    client.post("/api/costings/bulk/", json={"items": [{"project_code": "P1", "product_name": "Oil"}]})
+    assert _total(client, "/api/costings/", project_code="P1") == 3
@@ -0,0 +1,40 @@
+
+def _stats(client):
+    response = client.get("/api/leads/stats/")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_counters_follow_lead_writes(client):
+    first = client.post("/api/leads/", json={"company_name": "Acme", "owner": "Bob", "email": "a@acme.example"}).json()["id"]
+    second = client.post("/api/leads/", json={"company_name": "Zen", "owner": "Ann", "status": "won"}).json()["id"]
+
+    stats = _stats(client)
+    assert (stats["total"], stats["with_contact"]) == (2, 1)
+    assert stats["by_status"]["new"] == 1 and stats["by_status"]["won"] == 1
+
+    client.patch(f"/api/leads/{first}/status/", json={"status": "lost"})
+    client.patch(f"/api/leads/{second}/", json={"phone": "12345"})
+    stats = _stats(client)
+    assert stats["with_contact"] == 2
+    assert (stats["by_status"]["new"], stats["by_status"]["lost"]) == (0, 1)
+
+    assert client.delete(f"/api/leads/{second}/").status_code == 204
+    stats = _stats(client)
+    assert (stats["total"], stats["by_status"]["won"]) == (1, 0)
+
+
+def test_reconcile_is_admin_only(client):
+    assert client.post("/api/leads/stats/reconcile/").status_code == 403
+
+
+def test_reconcile_repairs_drift(client, user, raw_sql):
+    client.post("/api/leads/", json={"company_name": "Acme", "owner": "Bob"})
+    raw_sql.execute("UPDATE sales_lead_counter SET value = 42 WHERE key = 'total'")
+    assert _stats(client)["total"] == 42
+
+    user.is_superuser = True
+    response = client.post("/api/leads/stats/reconcile/")
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert _stats(client)["total"] == 1
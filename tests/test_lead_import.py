@@ -0,0 +1,160 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.sales import SalesLead
+from app.services import lead_import
+from app.services.lead_import import ImportFormatError, import_leads
+
+
+def _csv(rows, header="company_name,owner,email,status"):
+    return "\n".join([header, *rows]).encode()
+
+
+def _upload(client, content: bytes, filename="leads.csv", **params):
+    return client.post("/api/leads/import/", params=params, files={"file": (filename, content)})
+
+
+def test_import_reports_invalid_rows(client):
+    response = _upload(client, _csv([
+        "Acme,Bob,a@acme.example,new",
+        "Zen,Ann,,bogus",
+        ",,,",
+        "Orbit,Cy, ,won",
+    ]))
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["total_rows"], report["imported"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 3
+    assert client.get("/api/leads/stats/").json()["total"] == 2
+
+
+def test_import_dedup_on_email(client):
+    client.post("/api/leads/", json={"company_name": "Old", "owner": "Bob", "email": "dup@example.com"})
+    report = _upload(client, _csv([
+        "Acme,Bob,DUP@example.com,new",
+        "Zen,Ann,zen@example.com,new",
+        "Zen again,Ann,zen@example.com,new",
+    ]), dedup="email").json()
+    assert (report["imported"], report["skipped_duplicates"]) == (1, 2)
+
+
+def test_unreadable_xlsx_is_a_400(client):
+    assert _upload(client, b"not a zip", filename="leads.xlsx").status_code == 400
+
+
+@pytest.fixture
+def two_row_chunks(monkeypatch):
+    monkeypatch.setattr(lead_import, "IMPORT_CHUNK_ROWS", 2)
+
+
+async def _lead_count(db):
+    return (await db.execute(select(func.count(SalesLead.id)))).scalar()
+
+
+@pytest.mark.anyio
+async def test_failing_second_chunk_rolls_back_the_first(db, two_row_chunks, monkeypatch):
+    load_rows = lead_import._load_rows
+    calls = []
+
+    async def failing_second_load(session, leads):
+        calls.append(len(leads))
+        if len(calls) == 2:
+            raise ImportFormatError("COPY failed")
+        await load_rows(session, leads)
+
+    monkeypatch.setattr(lead_import, "_load_rows", failing_second_load)
+    content = _csv([f"Co {i},Bob,co{i}@example.com,new" for i in range(4)])
+
+    with pytest.raises(ImportFormatError):
+        await import_leads(db, io.BytesIO(content), "leads.csv")
+    await db.rollback()
+
+    assert calls == [2, 2]
+    assert await _lead_count(db) == 0
+
+
+@pytest.mark.anyio
+async def test_unreadable_second_chunk_rolls_back_the_first(db, two_row_chunks, monkeypatch):
+    load_rows = lead_import._load_rows
+    loaded = []
+
+    async def counting_load(session, leads):
+        loaded.append(len(leads))
+        await load_rows(session, leads)
+
+    monkeypatch.setattr(lead_import, "_load_rows", counting_load)
+    # Invalid UTF-8 well past the first rows: decoding fails on a later read
+    padding = "x" * 10_000
+    content = _csv(["Co 1,Bob,,new", "Co 2,Bob,,new", f"Co 3,{padding},,new"]) + b"\nCo 4,\xff\xfe,,new\n"
+
+    with pytest.raises(ImportFormatError):
+        await import_leads(db, io.BytesIO(content), "leads.csv")
+    await db.rollback()
+
+    assert loaded == [2]
+    assert await _lead_count(db) == 0
+
+
+class _FakeDriverConnection:
+    """asyncpg connection stand-in: a transaction exists once a statement ran."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def is_in_transaction(self):
+        return "SELECT 1" in self.log
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.log.append(("COPY", self.is_in_transaction()))
+
+
+class _FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    async def exec_driver_sql(self, statement):
+        self.log.append(statement)
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=_FakeDriverConnection(self.log))
+
+
+@pytest.mark.anyio
+async def test_postgres_copy_runs_inside_the_session_transaction():
+    log = []
+    connection = _FakeConnection(log)
+
+    async def get_connection():
+        return connection
+
+    session = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        connection=get_connection,
+    )
+    lead = dict.fromkeys(lead_import.LEAD_FIELDS)
+    await lead_import._load_rows(session, [lead])
+    await lead_import._load_rows(session, [lead])
+
+    assert log == ["SELECT 1", ("COPY", True), ("COPY", True)]
+
+
+def test_over_long_cells_are_reported_not_fatal(client):
+    response = _upload(client, _csv([
+        f"{'A' * 256},Bob,,",
+        "Acme,Bob,,",
+        f"Orbit,Cy,{'9' * 51},{'1' * 21}",
+        "Zen,Ann,,",
+    ], header="company_name,owner,phone,founding_year"))
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (2, 2)
+    assert report["errors"] == [
+        {"row": 2, "errors": ["company_name: String should have at most 255 characters"]},
+        {"row": 4, "errors": [
+            "phone: String should have at most 50 characters",
+            "founding_year: String should have at most 20 characters",
+        ]},
+    ]
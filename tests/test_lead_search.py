@@ -0,0 +1,74 @@
+import pytest
+
+from app.services.lead_search import LikeLeadSearch, get_search_backend
+
+
+def _create(client, **fields):
+    lead = {"company_name": "Acme", "owner": "Bob", **fields}
+    response = client.post("/api/leads/", json=lead)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+@pytest.mark.anyio
+async def test_sqlite_uses_like_backend(db):
+    assert isinstance(get_search_backend(db), LikeLeadSearch)
+
+
+def test_search_matches_every_search_column(client):
+    by_company = _create(client, company_name="Orchid Foods")
+    by_owner = _create(client, owner="Orchid Team")
+    by_email = _create(client, email="sales@orchid.example")
+    by_segment = _create(client, segment="orchids")
+    by_notes = _create(client, notes="met at the orchid fair")
+    _create(client, company_name="Unrelated", notes="nothing here")
+
+    response = client.get("/api/leads/", params={"search": "ORCHID"})
+    assert response.status_code == 200
+    ids = {lead["id"] for lead in response.json()["items"]}
+    assert ids == {by_company, by_owner, by_email, by_segment, by_notes}
+
+
+def test_search_treats_like_wildcards_literally(client):
+    literal = _create(client, company_name="100% Natural")
+    _create(client, company_name="1000 Naturals")
+
+    ids = [lead["id"] for lead in client.get("/api/leads/", params={"search": "100%"}).json()["items"]]
+    assert ids == [literal]
+
+
+def test_search_combines_with_status_filter(client):
+    won = _create(client, company_name="Lotus Labs", status="won")
+    _create(client, company_name="Lotus Works", status="new")
+
+    response = client.get("/api/leads/", params={"search": "lotus", "status": "won"})
+    assert [lead["id"] for lead in response.json()["items"]] == [won]
+
+
+def test_relevance_ranks_prefix_and_weighted_columns_first(client):
+    in_notes = _create(client, company_name="Alpha", notes="supplier of jasmine oil")
+    inside_company = _create(client, company_name="Pure Jasmine Co")
+    prefix_company = _create(client, company_name="Jasmine Exports")
+
+    response = client.get("/api/leads/", params={"search": "jasmine", "sort": "-relevance"})
+    assert response.status_code == 200
+    assert [lead["id"] for lead in response.json()["items"]] == [prefix_company, inside_company, in_notes]
+
+
+def test_relevance_sort_needs_search(client):
+    response = client.get("/api/leads/", params={"sort": "-relevance"})
+    assert response.status_code == 400
+
+
+def test_relevance_pages_with_cursor(client):
+    ids = {_create(client, company_name=f"Rose {i}", notes="rose" if i % 2 else None) for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"search": "rose", "sort": "-relevance", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/leads/", params=params).json()
+        seen += [lead["id"] for lead in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids)
@@ -0,0 +1,96 @@
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models.sales import SalesLead
+from app.services.pagination import InvalidCursor, decode_cursor, encode_cursor, resolve_sort
+
+SORTS = {"created_at": SalesLead.created_at, "id": SalesLead.id}
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2026, 10, 18, 7, 33, 27),
+    datetime(2026, 10, 18, 7, 33, 27, 123456, tzinfo=timezone.utc),
+    Decimal("12.50"),
+    "Acme",
+    42,
+])
+def test_cursor_round_trip(value):
+    sort_key = resolve_sort("-created_at", SORTS)
+    assert decode_cursor(encode_cursor(sort_key, value, 7), sort_key) == (value, 7)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor(resolve_sort("-created_at", SORTS), datetime(2026, 1, 1), 1)
+    with pytest.raises(InvalidCursor, match="different sort"):
+        decode_cursor(cursor, resolve_sort("created_at", SORTS))
+
+
+@pytest.mark.parametrize("cursor", ["xx", "", "eyJmb28iOjF9"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor, match="Malformed"):
+        decode_cursor(cursor, resolve_sort("id", SORTS))
+
+
+def test_unknown_sort_is_rejected():
+    with pytest.raises(InvalidCursor, match="Invalid sort"):
+        resolve_sort("-email", SORTS)
+
+
+def _walk(client, url, **params):
+    seen, cursor = [], None
+    for _ in range(50):
+        page = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200, page.text
+        body = page.json()
+        seen += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen
+    pytest.fail("cursor never ran out")
+
+
+@pytest.fixture
+def leads(client):
+    """Seven leads over two distinct created_at seconds (ties included)."""
+    ids = []
+    for i in range(7):
+        if i == 3:
+            time.sleep(1.1)
+        lead = {"company_name": f"Co {i % 3}", "owner": "Bob", "status": "won" if i % 2 else "new"}
+        ids.append(client.post("/api/leads/", json=lead).json()["id"])
+    return ids
+
+
+@pytest.mark.parametrize("sort", ["-created_at", "created_at"])
+def test_created_at_cursor_visits_every_lead_once(client, leads, sort):
+    seen = _walk(client, "/api/leads/", sort=sort, limit=2)
+    assert seen == (sorted(leads, reverse=True) if sort.startswith("-") else sorted(leads))
+
+
+def test_cursor_keeps_filters_and_tiebreaks_on_id(client, leads):
+    seen = _walk(client, "/api/leads/", sort="company_name", status="won", limit=1)
+    won = client.get("/api/leads/", params={"status": "won", "limit": 100}).json()["items"]
+    assert seen == [lead["id"] for lead in sorted(won, key=lambda lead: (lead["company_name"], lead["id"]))]
+
+
+def test_skip_still_works(client, leads):
+    page = client.get("/api/leads/", params={"sort": "id", "skip": 5, "limit": 1}).json()
+    assert [lead["id"] for lead in page["items"]] == [sorted(leads)[5]]
+    assert page["has_more"] is True
+
+
+def test_bad_cursor_is_a_400(client):
+    assert client.get("/api/leads/", params={"cursor": "xx"}).status_code == 400
+
+
+def test_quotation_summary_pages_by_created_at(client):
+    ids = []
+    for i in range(5):
+        if i == 2:
+            time.sleep(1.1)
+        response = client.post("/api/quotations/", json={"project_code": f"P{i}", "lines": []})
+        ids.append(response.json()["id"])
+    assert _walk(client, "/api/quotations/summary/", sort="-created_at", limit=2) == sorted(ids, reverse=True)
@@ -0,0 +1,74 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.services.pricing import INPUT_FIELDS, PRICE_FIELDS, _decimal_prices, price_rows
+
+
+def _amount(rng: random.Random, places: int, digits: int):
+    if rng.random() < 0.1:
+        return None
+    return Decimal(rng.randrange(10 ** digits)).scaleb(-places)
+
+
+def _random_batch(seed: int, n: int = 300):
+    rng = random.Random(seed)
+    rows, items = [], []
+    for i in range(n):
+        rows.append({
+            "sku_ml": _amount(rng, 3, 7),
+            "rm_per_litre": _amount(rng, 4, 8),
+            "packaging_cost_manual": _amount(rng, 2, 5),
+            "batch_size_kg": _amount(rng, 2, 7),
+            "gst_percent": _amount(rng, 2, 4),
+            "cc_pc": _amount(rng, 2, 4),
+            "vaince": _amount(rng, 2, 4),
+            "fda": _amount(rng, 2, 4),
+            "formulation_charge": _amount(rng, 2, 4),
+            "transport": _amount(rng, 2, 4),
+        })
+        for _ in range(rng.randrange(4)):
+            items.append((i, _amount(rng, 2, 5) or Decimal("0.00"), rng.choice([None, 0, 1, 2, 7])))
+    return rows, items
+
+
+def _expected(rows, items):
+    per_row = {i: [] for i in range(len(rows))}
+    for i, cost, qty in items:
+        per_row[i].append((cost, qty))
+    return [_decimal_prices(row, per_row[i]) for i, row in enumerate(rows)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_decimal_properties(seed):
+    rows, items = _random_batch(seed)
+    assert price_rows(rows, items).rows() == _expected(rows, items)
+
+
+def test_half_way_values_round_half_even():
+    # 0.125 -> 0.12 and 0.375 -> 0.38 under ROUND_HALF_EVEN
+    rows = [
+        {**dict.fromkeys(INPUT_FIELDS), "sku_ml": Decimal("1"), "rm_per_litre": Decimal("125")},
+        {**dict.fromkeys(INPUT_FIELDS), "sku_ml": Decimal("1"), "rm_per_litre": Decimal("375")},
+        {**dict.fromkeys(INPUT_FIELDS), "cc_pc": Decimal("0.50"), "gst_percent": Decimal("1")},
+    ]
+    prices = price_rows(rows).rows()
+    assert [p["rm_cost_per_unit"] for p in prices[:2]] == [Decimal("0.12"), Decimal("0.38")]
+    assert prices == _expected(rows, [])
+
+
+def test_rows_off_the_fixed_point_grid_fall_back_to_decimals():
+    rows = [
+        {**dict.fromkeys(INPUT_FIELDS), "sku_ml": Decimal("333.3333"), "rm_per_litre": Decimal("1.23456"),
+         "batch_size_kg": Decimal("10")},
+        {**dict.fromkeys(INPUT_FIELDS), "cc_pc": Decimal("123456789012.34"), "gst_percent": Decimal("18")},
+    ]
+    items = [(0, Decimal("1.005"), 3), (1, Decimal("5.00"), 10**6)]
+    prices = price_rows(rows, items)
+    assert prices.rows() == _expected(rows, items)
+    assert all(set(row) == set(PRICE_FIELDS) for row in prices.rows())
+
+
+def test_empty_batch():
+    assert price_rows([]).rows() == []